@@ -0,0 +1,93 @@
+# asset_cache.py
+import os
+
+from metrics import METRICS
+
+
+class ImageCache:
+    """
+    @file asset_cache.py
+    @brief Shared cache of decoded and resized images for the Planning Poker GUI.
+
+    @details
+    The ImageCache class opens, decodes and resizes each image file once and keeps the resulting
+    `ImageTk.PhotoImage`, so the card buttons of every voting round and window reuse the same images.
+    Entries are keyed by absolute path, size and file modification time: replacing a card file on disk
+    makes the next lookup load the new version, and the stale entry for that path and size is dropped.
+
+    PIL is imported with the first image, so starting the application does not pay for it. `preload` warms the cache
+    from the Tk event loop, one image per idle callback, so images can be decoded after the window is shown without
+    blocking it.
+
+    @note
+    Images are loaded lazily on first use. Use the shared `image_cache` instance rather than creating new ones,
+    since Tk keeps a PhotoImage alive only as long as a Python reference to it exists.
+
+    @see
+    For additional information on how to use this class, refer to the documentation of its methods.
+    """
+    def __init__(self):
+        self._images = {}
+        self._keys = {}
+
+    def get(self, path, size):
+        """
+        @brief Return the PhotoImage for an image file scaled to a given size.
+
+        @param path Path of the image file.
+        @param size Target size as a `(width, height)` tuple.
+
+        @return ImageTk.PhotoImage: The cached image, loaded on first use.
+        """
+        path = os.path.abspath(path)
+        size = tuple(size)
+        key = (path, size, os.path.getmtime(path))
+
+        photo = self._images.get(key)
+        if photo is None:
+            from PIL import Image, ImageTk
+
+            with METRICS.time("planning_poker_image_load_seconds"):
+                with Image.open(path) as img:
+                    photo = ImageTk.PhotoImage(img.resize(size))
+
+            stale_key = self._keys.get((path, size))
+            if stale_key is not None:
+                self._images.pop(stale_key, None)
+            self._keys[(path, size)] = key
+            self._images[key] = photo
+        return photo
+
+    def preload(self, widget, paths, size, callback=None):
+        """
+        @brief Load images in the background of the Tk event loop, one per idle callback.
+
+        @param widget A Tk widget whose event loop runs the loads.
+        @param paths Paths of the image files.
+        @param size Target size as a `(width, height)` tuple.
+        @param callback Optional function called without arguments once every image is loaded.
+
+        @return void
+        """
+        pending = list(paths)
+
+        def load_next():
+            if pending:
+                self.get(pending.pop(0), size)
+                widget.after_idle(load_next)
+            elif callback is not None:
+                callback()
+
+        widget.after_idle(load_next)
+
+    def clear(self):
+        """
+        @brief Drop every cached image.
+
+        @return void
+        """
+        self._images.clear()
+        self._keys.clear()
+
+
+image_cache = ImageCache()
@@ -1,5 +1,8 @@
 # average_rule.py
-class AverageRule:
+from stats_kernel import StatsRule
+
+
+class AverageRule(StatsRule):
     """
     @file average_rule.py
     @brief Class implementing the Average Rule for Planning Poker.
@@ -7,6 +10,8 @@ class AverageRule:
     @details
     The AverageRule class defines the validation logic for Planning Poker votes based on the average rule.
     Each feature is validated separately, ensuring that the average vote falls within the range [1, 20].
+    The average comes from the running sum and count of the shared statistics kernel. Votes that are not numbers
+    (coffee or "?" cards) do not count towards the average.
 
     @note
     Create an instance of this class and pass it to the PlanningPokerGUI to use the average rule for vote validation.
@@ -14,31 +19,19 @@ class AverageRule:
     @see
     For additional information on how to use this class, refer to the documentation of its methods.
     """
-    def __init__(self):
-        self.observers = []
-
-    def add_observer(self, observer):
-        self.observers.append(observer)
-
-    def remove_observer(self, observer):
-        self.observers.remove(observer)
-
-    def notify_observers(self, result):
-        for observer in self.observers:
-            observer.update(result)
-
-    def validate_votes(self, votes):
-        for feature in set(feature for _, feature in votes.keys()):
-            feature_votes = {player: vote for (player, f), vote in votes.items() if f == feature}
-            total_votes = sum(feature_votes.values())
-            average_vote = total_votes / len(feature_votes)
-            if not (1 <= average_vote <= 20):
-                result = False
-                self.notify_observers(result)
-                return result
-        result = True
-        self.notify_observers(result)
-        return result
+    LOW = 1
+    HIGH = 20
+
+    def classify(self, stats):
+        if not stats.numeric_count:
+            return "pending"
+        return "converged" if self.LOW <= stats.mean <= self.HIGH else "diverged"
+
+    def average(self, feature):
+        """
+        @brief Return the running average of a feature, or None if it has no numeric votes.
+        """
+        return self.estimate(feature)
 
 # view.py
 class AverageRuleView:
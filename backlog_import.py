@@ -0,0 +1,331 @@
+# backlog_import.py
+"""
+@file backlog_import.py
+@brief Streaming import of backlogs from JSON, JSON Lines and CSV files.
+
+@details
+Backlogs exported from a tracker can hold thousands of items in multi-megabyte files. The parsers below read
+those files incrementally, one chunk or one line at a time, and yield feature titles as soon as they are parsed,
+so memory does not grow with the raw file and a caller can show progress while the import runs.
+
+- JSON: a top-level array, decoded element by element.
+- JSON Lines (`.jsonl`, `.ndjson`): one item per line.
+- CSV: one item per row; the title is read from a "title", "name", "summary" or "feature" column,
+  or from the first column when the header has none of them.
+
+Items may be plain strings or objects; the title of an object is read from the same keys as CSV columns.
+
+The BacklogImporter class runs the parsing on a background thread and hands deduplicated titles over through a
+bounded queue, which the Tkinter main loop drains a few milliseconds at a time.
+"""
+import csv
+import io
+import json
+import os
+import queue
+import threading
+import time
+
+TITLE_KEYS = ("title", "name", "summary", "feature")
+CHUNK_SIZE = 64 * 1024
+
+
+class _CountingReader(io.RawIOBase):
+    # Binary reader counting the bytes consumed, to report progress through a text wrapper
+    def __init__(self, raw):
+        self._raw = raw
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = self._raw.readinto(buffer)
+        self.bytes_read += count or 0
+        return count
+
+    def close(self):
+        self._raw.close()
+        super().close()
+
+
+def feature_title(item):
+    """
+    @brief Return the title of a backlog item.
+
+    @param item A string, or a dictionary holding one of the `TITLE_KEYS`.
+
+    @return str: The stripped title, or an empty string when the item has none.
+    """
+    if isinstance(item, dict):
+        for key in TITLE_KEYS:
+            if item.get(key):
+                return str(item[key]).strip()
+        return ""
+    if item is None:
+        return ""
+    return str(item).strip()
+
+
+def iter_json_array(text_file, chunk_size=CHUNK_SIZE):
+    """
+    @brief Iterate over the elements of a top-level JSON array without loading the whole document.
+
+    @param text_file A text file object.
+    @param chunk_size Number of characters read at a time.
+
+    @return generator: The decoded elements.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    state = "start"
+
+    while True:
+        # Skip whitespace, reading more input when the buffer is exhausted
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n":
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            chunk = text_file.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+
+        if position >= len(buffer):
+            raise ValueError("Invalid JSON format: unexpected end of file.")
+        char = buffer[position]
+
+        if state == "start":
+            if char != "[":
+                raise ValueError("Invalid JSON format: the backlog must be a JSON array.")
+            position += 1
+            state = "first"
+        elif state == "separator":
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError("Invalid JSON format: expected ',' or ']' between features.")
+            position += 1
+            state = "value"
+        elif state == "first" and char == "]":
+            return
+        else:
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.decoder.JSONDecodeError:
+                item, end = None, None
+            # An element ending exactly at the buffer end may be a truncated number or literal
+            if end is None or (end == len(buffer) and not eof):
+                if eof:
+                    raise ValueError("Invalid JSON format: truncated feature.")
+                chunk = text_file.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+            yield item
+            position = end
+            state = "separator"
+
+
+def iter_json_lines(text_file):
+    """
+    @brief Iterate over the items of a JSON Lines file.
+
+    @param text_file A text file object.
+
+    @return generator: The decoded items; blank lines are skipped.
+    """
+    for line_number, line in enumerate(text_file, start=1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.decoder.JSONDecodeError:
+                raise ValueError(f"Invalid JSON on line {line_number}.")
+
+
+def iter_csv(text_file):
+    """
+    @brief Iterate over the titles of a CSV file with a header row.
+
+    @param text_file A text file object opened with `newline=""`.
+
+    @return generator: The title of each row.
+    """
+    reader = csv.reader(text_file)
+    header = next(reader, None)
+    if header is None:
+        return
+    lowered = [column.strip().lower() for column in header]
+    column = next((lowered.index(key) for key in TITLE_KEYS if key in lowered), 0)
+    for row in reader:
+        if len(row) > column:
+            yield row[column]
+
+
+def iter_backlog(text_file, file_format):
+    """
+    @brief Iterate over the items of a backlog file.
+
+    @param text_file A text file object.
+    @param file_format "json", "jsonl" or "csv".
+
+    @return generator: The backlog items.
+    """
+    if file_format == "jsonl":
+        return iter_json_lines(text_file)
+    if file_format == "csv":
+        return iter_csv(text_file)
+    return iter_json_array(text_file)
+
+
+def backlog_format(file_path):
+    """
+    @brief Guess the format of a backlog file from its extension.
+
+    @param file_path Path of the backlog file.
+
+    @return str: "jsonl", "csv" or "json".
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if extension == ".csv":
+        return "csv"
+    return "json"
+
+
+def import_backlog(file_path):
+    """
+    @brief Read the deduplicated feature titles of a backlog file, in file order.
+
+    @param file_path Path of the backlog file.
+
+    @return list: The feature titles.
+    """
+    features = []
+    seen = set()
+    with open(file_path, "r", encoding="utf-8", newline="") as text_file:
+        for item in iter_backlog(text_file, backlog_format(file_path)):
+            title = feature_title(item)
+            if title and title not in seen:
+                seen.add(title)
+                features.append(title)
+    return features
+
+
+class BacklogImporter:
+    """
+    @brief Import a backlog file on a background thread.
+
+    @details
+    The worker thread parses the file and puts batches of new, deduplicated titles in a bounded queue.
+    The Tkinter side calls `poll` from an `after()` callback: it drains batches for at most a few milliseconds,
+    so the main loop is never held for longer than a frame, and reads `progress` to update a progress bar.
+
+    @par Attributes:
+    - file_path: Path of the imported file.
+    - features: Titles received so far by `poll`, in file order.
+    - duplicates: Number of duplicate titles skipped.
+    - progress: Fraction of the file read, between 0 and 1.
+    - done: True once the worker finished and every batch was drained.
+    - error: Error message if the import failed, None otherwise.
+    """
+    BATCH_SIZE = 500
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.features = []
+        self.duplicates = 0
+        self.progress = 0.0
+        self.done = False
+        self.error = None
+        self._queue = queue.Queue(maxsize=64)
+        self._size = os.path.getsize(file_path) or 1
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="backlog-import", daemon=True)
+
+    def start(self):
+        """
+        @brief Start parsing on the background thread.
+
+        @return void
+        """
+        self._thread.start()
+
+    def cancel(self):
+        """
+        @brief Ask the background thread to stop at the next batch.
+
+        @return void
+        """
+        self._cancelled.set()
+
+    def _put(self, message):
+        # Block while the queue is full, but give up promptly on cancel
+        while not self._cancelled.is_set():
+            try:
+                self._queue.put(message, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _run(self):
+        seen = set()
+        batch = []
+        duplicates = 0
+        try:
+            with open(self.file_path, "rb", buffering=0) as raw:
+                counter = _CountingReader(raw)
+                text_file = io.TextIOWrapper(io.BufferedReader(counter, CHUNK_SIZE), encoding="utf-8", newline="")
+                for item in iter_backlog(text_file, backlog_format(self.file_path)):
+                    if self._cancelled.is_set():
+                        return
+                    title = feature_title(item)
+                    if not title:
+                        continue
+                    if title in seen:
+                        duplicates += 1
+                        continue
+                    seen.add(title)
+                    batch.append(title)
+                    if len(batch) >= self.BATCH_SIZE:
+                        self._put(("batch", batch, duplicates, counter.bytes_read))
+                        batch = []
+            self._put(("batch", batch, duplicates, self._size))
+            self._put(("done", None, duplicates, self._size))
+        except (OSError, UnicodeDecodeError, ValueError) as error:
+            self._put(("error", str(error), duplicates, 0))
+
+    def poll(self, time_budget=0.008):
+        """
+        @brief Drain the batches received from the worker, for at most `time_budget` seconds.
+
+        @param time_budget Maximum time spent in this call, in seconds.
+
+        @return list: The titles received during this call.
+        """
+        received = []
+        deadline = time.perf_counter() + time_budget
+        while time.perf_counter() < deadline:
+            try:
+                kind, payload, duplicates, bytes_read = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self.duplicates = duplicates
+            if kind == "batch":
+                received.extend(payload)
+                self.progress = min(1.0, bytes_read / self._size)
+            elif kind == "done":
+                self.progress = 1.0
+                self.done = True
+                break
+            else:
+                self.error = payload
+                self.done = True
+                break
+        self.features.extend(received)
+        return received
@@ -0,0 +1,240 @@
+# bench_rules.py
+"""
+@file bench_rules.py
+@brief Repeatable benchmark suite for the Planning Poker voting rules.
+
+@details
+Random sessions are generated for a range of sizes (players x features), then each rule entry point is timed:
+`AverageRule.validate_votes`, `StrictRule.validate_votes`, `StrictRule._check_unanimous` (once per feature)
+and `PlanningPokerSession.is_unanimous_for_all_features`, plus the vectorized `batch_validate` path
+when NumPy is installed. Each measurement reports the best wall time over
+several repetitions, the throughput in votes per second and the peak memory allocated while the rule runs.
+
+Results are written as JSON. Passing a previous result file with `--compare` reports every measurement that
+became slower than the given tolerance, and the process exits with status 1 so the check can run in CI.
+
+Sizes whose vote count exceeds `--max-votes` are listed in the results as skipped rather than run,
+since the largest sessions (10,000 players x 100,000 features) need far more memory than a workstation has.
+
+@code
+python bench_rules.py --output bench_results.json
+python bench_rules.py --sizes 15x200,100x10000 --compare bench_results.json
+@endcode
+"""
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from average_rule import AverageRule
+from strict_rule import StrictRule
+from session import PlanningPokerSession
+from vote_store import VoteStore
+from vectorized import HAVE_NUMPY, batch_validate
+from deck import DEFAULT_DECK
+
+DEFAULT_SIZES = "5x10,15x200,50x1000,100x10000,1000x10000,1000x100000,10000x100000"
+# Card codes of the numeric cards, as stored by a session
+CARD_CODES = [code for code, value in enumerate(DEFAULT_DECK.values) if value is not None]
+
+
+def parse_sizes(sizes_arg):
+    """
+    @brief Parse a comma-separated list of `PLAYERSxFEATURES` sizes.
+
+    @param sizes_arg The `--sizes` argument.
+
+    @return list: `(players, features)` tuples.
+    """
+    sizes = []
+    for size in sizes_arg.split(','):
+        players, features = size.lower().split('x')
+        sizes.append((int(players), int(features)))
+    return sizes
+
+
+def generate_session(num_players, num_features, seed):
+    """
+    @brief Generate a session with random votes.
+
+    Every feature but the last one is unanimous, so the unanimity checks have to scan the whole session.
+
+    @param num_players Number of players.
+    @param num_features Number of features.
+    @param seed Seed of the random generator.
+
+    @return PlanningPokerSession: A session holding one vote per player and feature.
+    """
+    rng = random.Random(seed)
+    session = PlanningPokerSession()
+    session.set_players([f"player{i}" for i in range(num_players)])
+    session.load_features([f"feature{i}" for i in range(num_features)])
+    session.set_rule("StrictRule")
+
+    votes = VoteStore(session.players, session.features)
+    for index, feature in enumerate(session.features):
+        if index < num_features - 1:
+            value = rng.choice(CARD_CODES)
+            for player in session.players:
+                votes.set_vote(player, feature, value)
+        else:
+            for player in session.players:
+                votes.set_vote(player, feature, rng.choice(CARD_CODES))
+    session.votes = votes
+    return session
+
+
+def benchmark_cases(session):
+    """
+    @brief Return the rule entry points to time on a session.
+
+    @param session The generated session.
+
+    @return list: `(name, callable)` pairs.
+    """
+    votes = session.votes
+    feature_votes = [votes.feature_votes(feature) for feature in session.features]
+
+    def check_unanimous():
+        for votes_of_feature in feature_votes:
+            StrictRule._check_unanimous(votes_of_feature)
+
+    cases = [
+        ("AverageRule.validate_votes", lambda: AverageRule().validate_votes(votes)),
+        ("StrictRule.validate_votes", lambda: StrictRule().validate_votes(votes)),
+        ("StrictRule._check_unanimous", check_unanimous),
+        ("is_unanimous_for_all_features", session.is_unanimous_for_all_features),
+    ]
+    if HAVE_NUMPY:
+        cases += [
+            ("batch_validate[AverageRule]", lambda: batch_validate(AverageRule(), votes)),
+            ("batch_validate[StrictRule]", lambda: batch_validate(StrictRule(), votes)),
+        ]
+    return cases
+
+
+def measure(function, repeat):
+    """
+    @brief Time a callable and measure the peak memory it allocates.
+
+    Timing and memory are measured in separate runs because tracemalloc slows allocations down.
+
+    @param function The callable to measure.
+    @param repeat Number of timed runs; the best one is kept.
+
+    @return tuple: `(best_seconds, peak_bytes)`.
+    """
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak
+
+
+def run_benchmarks(sizes, repeat, max_votes, seed):
+    """
+    @brief Run every benchmark case for every size.
+
+    @param sizes List of `(players, features)` tuples.
+    @param repeat Number of timed runs per measurement.
+    @param max_votes Sizes with more votes than this are skipped.
+    @param seed Seed of the session generator.
+
+    @return list: One result dictionary per size and case.
+    """
+    results = []
+    for num_players, num_features in sizes:
+        num_votes = num_players * num_features
+        size = f"{num_players}x{num_features}"
+        if num_votes > max_votes:
+            results.append({"size": size, "votes": num_votes, "skipped": True})
+            print(f"{size:>14}  skipped ({num_votes} votes > --max-votes)", file=sys.stderr)
+            continue
+
+        session = generate_session(num_players, num_features, seed)
+        for name, function in benchmark_cases(session):
+            seconds, peak = measure(function, repeat)
+            results.append({
+                "size": size,
+                "case": name,
+                "votes": num_votes,
+                "seconds": seconds,
+                "votes_per_second": num_votes / seconds if seconds else None,
+                "peak_memory_bytes": peak,
+            })
+            print(f"{size:>14}  {name:<32} {seconds:10.6f} s  {num_votes / seconds:14.0f} votes/s  {peak / 1024:10.1f} KiB", file=sys.stderr)
+        del session
+    return results
+
+
+def compare_results(results, baseline, tolerance):
+    """
+    @brief Compare results with a previous run.
+
+    @param results The new results.
+    @param baseline The results of the previous run, as loaded from its JSON file.
+    @param tolerance Allowed relative slowdown, e.g. 0.2 for 20 %.
+
+    @return list: Descriptions of the measurements that regressed.
+    """
+    previous = {(entry["size"], entry.get("case")): entry for entry in baseline["results"] if not entry.get("skipped")}
+    regressions = []
+    for entry in results:
+        old = previous.get((entry["size"], entry.get("case")))
+        if entry.get("skipped") or old is None:
+            continue
+        if entry["seconds"] > old["seconds"] * (1 + tolerance):
+            regressions.append(f"{entry['case']} at {entry['size']}: {old['seconds']:.6f} s -> {entry['seconds']:.6f} s")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Planning Poker voting rules.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated PLAYERSxFEATURES sizes.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per measurement; the best is kept.")
+    parser.add_argument("--max-votes", type=int, default=2_000_000, help="Skip sizes with more votes than this.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the session generator.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="Previous JSON results to check for slowdowns.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown when comparing.")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(parse_sizes(args.sizes), args.repeat, args.max_votes, args.seed)
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare, "r") as file:
+            regressions = compare_results(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"Slower: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+# deck.py
+import collections
+
+Card = collections.namedtuple("Card", "code label value image")
+
+
+class Deck:
+    """
+    @file deck.py
+    @brief Planning Poker deck mapping each card to a small integer code.
+
+    @details
+    The Deck class defines the cards a player can play: each card has a code (its position in the deck), the label
+    shown and written to files, a numeric value, and the image of its button on the voting screen. The coffee card
+    and the "?" card have no numeric value.
+
+    Votes are parsed once, when they are entered, with `encode`: a card label, a number equal to a card value
+    ("13", "13.0") or a known alias ("cafe", "☕") gives the card code, and anything else raises ValueError.
+    The session then stores and aggregates codes, and labels only come back when votes are written to files or shown.
+
+    @note
+    Numeric cards are listed in increasing value, so walking the codes in order walks the values in order.
+
+    @code
+    code = DEFAULT_DECK.encode("13")
+    DEFAULT_DECK.value(code)   # 13.0
+    DEFAULT_DECK.label(code)   # "13"
+    @endcode
+    """
+    def __init__(self, cards, aliases=None):
+        """
+        @brief Constructor for the Deck class.
+
+        @param cards Sequence of `(label, value, image)` triples, numeric cards in increasing value, where `value`
+        is None for cards without a numeric value.
+        @param aliases Optional mapping of extra accepted spellings to card labels.
+        """
+        self.cards = tuple(Card(code, label, value, image) for code, (label, value, image) in enumerate(cards))
+        self.labels = tuple(card.label for card in self.cards)
+        self.values = tuple(None if card.value is None else float(card.value) for card in self.cards)
+        self._codes = {card.label.lower(): card.code for card in self.cards}
+        for alias, label in (aliases or {}).items():
+            self._codes[alias.lower()] = self._codes[label.lower()]
+        self._value_codes = {value: code for code, value in enumerate(self.values) if value is not None}
+
+    def __len__(self):
+        return len(self.cards)
+
+    def code_of(self, label):
+        """
+        @brief Return the code of the card with this label.
+        """
+        return self._codes[label.lower()]
+
+    def encode(self, vote):
+        """
+        @brief Validate a vote and return its card code.
+
+        @param vote A card code (int), a card label, a card value or an alias.
+
+        @return int: The card code.
+        """
+        if isinstance(vote, int) and not isinstance(vote, bool):
+            if 0 <= vote < len(self.cards):
+                return vote
+            raise ValueError(f"Invalid card code: {vote}")
+        text = str(vote).strip()
+        code = self._codes.get(text.lower())
+        if code is not None:
+            return code
+        try:
+            code = self._value_codes.get(float(text))
+        except ValueError:
+            code = None
+        if code is None:
+            raise ValueError(f"Invalid vote: {text}. Play one of the cards: {', '.join(self.labels)}.")
+        return code
+
+    def label(self, code):
+        """
+        @brief Return the label of a card code.
+        """
+        return self.labels[code]
+
+    def value(self, code):
+        """
+        @brief Return the numeric value of a card code, or None for coffee and "?".
+        """
+        return self.values[code]
+
+
+DEFAULT_DECK = Deck([
+    ("0", 0, "cartes_0.png"),
+    ("1", 1, "cartes_1.png"),
+    ("2", 2, "cartes_2.png"),
+    ("3", 3, "cartes_3.png"),
+    ("5", 5, "cartes_5.png"),
+    ("8", 8, "cartes_8.png"),
+    ("13", 13, "cartes_13.png"),
+    ("20", 20, "cartes_20.png"),
+    ("40", 40, "cartes_40.png"),
+    ("100", 100, "cartes_100.png"),
+    ("coffee", None, "cartes_cafe.png"),
+    ("?", None, "cartes_interro.png"),
+], aliases={"cafe": "coffee", "café": "coffee", "☕": "coffee"})
+COFFEE = DEFAULT_DECK.code_of("coffee")
+UNKNOWN = DEFAULT_DECK.code_of("?")
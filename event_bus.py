@@ -0,0 +1,265 @@
+# event_bus.py
+"""
+@file event_bus.py
+@brief Typed publish/subscribe events shared by the session, the rules and the user interface.
+
+@details
+The session and the rules publish typed events (named tuples) to an EventBus as votes arrive and rounds close.
+Subscribers are registered per event type and run in one of three ways:
+- synchronously, inside `publish`, for cheap bookkeeping;
+- on the bus dispatch thread (`threaded=True`), for slow work that must stay off the main thread;
+- through a TkBatcher, which queues the events and hands them to the callback in one batch from an `after_idle`
+  callback, so a burst of votes costs at most one redraw per pass of the Tk event loop. Events with the same
+  coalescing key replace each other in the batch.
+
+@note
+Tk is not thread-safe: events reaching a TkBatcher must be published from the Tk thread. Work triggered from other
+threads should use threaded subscribers.
+
+@code
+bus = EventBus()
+bus.subscribe(VoteCast, TkBatcher(root, redraw, key=lambda event: event.feature))
+bus.subscribe(RoundClosed, archive_round, threaded=True)
+@endcode
+"""
+import collections
+import queue
+import threading
+import traceback
+
+VoteCast = collections.namedtuple("VoteCast", "player feature vote previous status")
+FeatureConverged = collections.namedtuple("FeatureConverged", "feature")
+FeatureDiverged = collections.namedtuple("FeatureDiverged", "feature")
+SessionStarted = collections.namedtuple("SessionStarted", "players features")
+RoundClosed = collections.namedtuple("RoundClosed", "revote_features finished")
+VerdictReached = collections.namedtuple("VerdictReached", "result")
+
+
+class EventBus:
+    """
+    @brief Dispatch typed events to their subscribers.
+
+    @details
+    Subscriber lists are replaced rather than modified, so `publish` reads them without a lock and can be called
+    from any thread. A subscription to `None` receives every event.
+    """
+    def __init__(self):
+        """
+        @brief Constructor for the EventBus class.
+        """
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+
+    def subscribe(self, event_type, callback, threaded=False):
+        """
+        @brief Register a callback for one event type.
+
+        @param event_type The event class, or None for every event.
+        @param callback Called with the event.
+        @param threaded If True, the callback runs on the bus dispatch thread instead of inside `publish`.
+
+        @return tuple: The subscription, to pass to `unsubscribe`.
+        """
+        subscription = (event_type, callback, threaded)
+        with self._lock:
+            if threaded and self._thread is None:
+                self._queue = queue.Queue()
+                self._thread = threading.Thread(target=self._dispatch, name="event-bus", daemon=True)
+                self._thread.start()
+            self._subscribers[event_type] = self._subscribers.get(event_type, ()) + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        @brief Remove a subscription.
+
+        @param subscription The value returned by `subscribe`.
+
+        @return void
+        """
+        with self._lock:
+            remaining = tuple(entry for entry in self._subscribers.get(subscription[0], ()) if entry is not subscription)
+            if remaining:
+                self._subscribers[subscription[0]] = remaining
+            else:
+                self._subscribers.pop(subscription[0], None)
+
+    def has_subscribers(self, event_type):
+        """
+        @brief Check if publishing an event of this type would reach anyone.
+        """
+        return event_type in self._subscribers or None in self._subscribers
+
+    def publish(self, event):
+        """
+        @brief Deliver an event to the subscribers of its type and to the subscribers of every event.
+
+        @param event The event.
+
+        @return void
+        """
+        for subscribers in (self._subscribers.get(type(event), ()), self._subscribers.get(None, ())):
+            for _, callback, threaded in subscribers:
+                if threaded:
+                    self._queue.put((callback, event))
+                else:
+                    _call(callback, event)
+
+    def close(self):
+        """
+        @brief Stop the dispatch thread after the events already queued.
+
+        @return void
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def _dispatch(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            _call(*item)
+
+
+def _call(callback, event):
+    # A failing subscriber must not break the publisher, which may be in the middle of recording a vote
+    try:
+        callback(event)
+    except Exception:
+        traceback.print_exc()
+
+
+class TkBatcher:
+    """
+    @brief Subscriber queueing events and handing them to a Tk callback once per pass of the event loop.
+
+    @par Attributes:
+    - widget: Any Tk widget, used to schedule the `after_idle` callback.
+    - callback: Called with the list of queued events.
+    - key: Optional function giving the coalescing key of an event; a later event replaces an earlier one with
+      the same key. Without it, every event is kept.
+    """
+    def __init__(self, widget, callback, key=None):
+        """
+        @brief Constructor for the TkBatcher class.
+
+        @param widget Any Tk widget.
+        @param callback Called with the list of queued events.
+        @param key Optional function giving the coalescing key of an event.
+        """
+        self.widget = widget
+        self.callback = callback
+        self.key = key
+        self._events = {}
+        self._scheduled = False
+
+    def __call__(self, event):
+        if self.key is None:
+            self._events[len(self._events)] = event
+        else:
+            key = self.key(event)
+            # Move the key to the end so the batch keeps the order of the latest events
+            self._events.pop(key, None)
+            self._events[key] = event
+        if not self._scheduled:
+            self._scheduled = True
+            self.widget.after_idle(self.flush)
+
+    def flush(self):
+        """
+        @brief Hand the queued events to the callback now.
+
+        @return void
+        """
+        events = list(self._events.values())
+        self._events = {}
+        self._scheduled = False
+        if events:
+            self.callback(events)
+
+
+class Publisher:
+    """
+    @brief Mixin giving a rule an optional event bus and the observer interface.
+
+    @details
+    Rules publish FeatureConverged and FeatureDiverged when the status of a feature changes, and VerdictReached
+    from `notify_observers`. Observers registered with `add_observer` are bus subscribers to VerdictReached whose
+    `update(result)` method is called, so they can be batched or threaded like any other subscriber.
+
+    @par Attributes:
+    - bus: The EventBus events are published to, or None to publish nothing.
+    - observers: The registered observers.
+    """
+    def __init__(self, bus=None):
+        """
+        @brief Constructor for the Publisher mixin.
+
+        @param bus The EventBus to publish to, or None.
+        """
+        self.bus = bus
+        self.observers = []
+        self._observer_subscriptions = []
+
+    def publish(self, event):
+        """
+        @brief Publish an event if a bus is attached.
+
+        @return void
+        """
+        if self.bus is not None:
+            self.bus.publish(event)
+
+    def publish_status_change(self, feature, before, after):
+        """
+        @brief Publish FeatureConverged or FeatureDiverged when the status of a feature changed.
+
+        @param feature The feature.
+        @param before Status before the vote.
+        @param after Status after the vote.
+
+        @return void
+        """
+        if self.bus is None or before == after:
+            return
+        if after == "converged":
+            self.bus.publish(FeatureConverged(feature))
+        elif after == "diverged":
+            self.bus.publish(FeatureDiverged(feature))
+
+    def add_observer(self, observer):
+        """
+        @brief Call `observer.update(result)` with every verdict, creating a bus if none is attached.
+
+        @return void
+        """
+        if self.bus is None:
+            self.bus = EventBus()
+        self.observers.append(observer)
+        self._observer_subscriptions.append(self.bus.subscribe(VerdictReached, lambda event: observer.update(event.result)))
+
+    def remove_observer(self, observer):
+        """
+        @brief Stop sending verdicts to an observer.
+
+        @return void
+        """
+        index = self.observers.index(observer)
+        self.bus.unsubscribe(self._observer_subscriptions.pop(index))
+        del self.observers[index]
+
+    def notify_observers(self, result):
+        """
+        @brief Publish a verdict.
+
+        @param result The verdict.
+
+        @return void
+        """
+        self.publish(VerdictReached(result))
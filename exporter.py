@@ -0,0 +1,268 @@
+# exporter.py
+"""
+@file exporter.py
+@brief Streaming export of the estimation results of a session, as CSV, JSON Lines or columnar chunks.
+
+@details
+`estimation_rows` yields one row per feature, in backlog order: the status and estimate given by the rule, the
+number of rounds the feature was voted on, and the statistics of its last votes (mean, median, minimum, maximum,
+spread, standard deviation and the number of votes per card). Rows are computed one feature at a time from a
+FeatureStats built over that feature's votes, so exporting never holds more than one row, or one chunk of rows for
+the columnar formats, whatever the size of the backlog.
+
+Formats:
+- csv: one line per feature, with one `votes_<card>` column per card of the deck;
+- jsonl: one JSON object per feature, the histogram as a `{card: votes}` object of the cards played;
+- columns: JSON Lines of chunks of CHUNK_ROWS rows, each holding one array per column, as read by
+  `pandas.DataFrame(chunk["columns"])`;
+- parquet: one row group per chunk; needs pyarrow, which is optional.
+
+Files are written to a temporary file renamed over the target once complete (see persistence.atomic_path).
+
+@code
+export_session(session, "results.csv")
+python exporter.py progress.json results.parquet
+@endcode
+"""
+import argparse
+import csv
+import json
+import math
+import sys
+
+from deck import DEFAULT_DECK
+from persistence import atomic_path
+from stats_kernel import FeatureStats
+
+# Rows per chunk of the columnar formats
+CHUNK_ROWS = 4096
+FORMATS = ("csv", "jsonl", "columns", "parquet")
+# Columns of every row, before the per-card vote counts
+COLUMNS = ("feature", "status", "rounds", "votes", "numeric_votes", "estimate", "mean", "median", "minimum",
+           "maximum", "spread", "stddev")
+_EXTENSIONS = ((".columns.jsonl", "columns"), (".csv", "csv"), (".jsonl", "jsonl"), (".ndjson", "jsonl"),
+               (".parquet", "parquet"))
+
+
+def format_of(file_path):
+    """
+    @brief Return the export format matching the extension of a file, or None.
+    """
+    lower = file_path.lower()
+    for extension, export_format in _EXTENSIONS:
+        if lower.endswith(extension):
+            return export_format
+    return None
+
+
+def stats_summary(stats):
+    """
+    @brief Return the statistics of the numeric votes of a feature.
+
+    @param stats The FeatureStats of the feature.
+
+    @return dict: `mean`, `median`, `minimum`, `maximum`, `spread` (maximum - minimum) and `stddev` (population
+    standard deviation), each None without numeric votes.
+    """
+    values = stats.deck.values
+    mean = stats.mean
+    minimum = stats.minimum
+    maximum = stats.maximum
+    stddev = None
+    if stats.numeric_count:
+        squares = sum(count * (values[code] - mean) ** 2
+                      for code, count in enumerate(stats.histogram) if count and values[code] is not None)
+        stddev = math.sqrt(squares / stats.numeric_count)
+    return {
+        "mean": mean,
+        "median": stats.median,
+        "minimum": minimum,
+        "maximum": maximum,
+        "spread": None if minimum is None else maximum - minimum,
+        "stddev": stddev,
+    }
+
+
+def estimation_rows(session):
+    """
+    @brief Yield the estimation results of every feature of a session, one at a time.
+
+    @param session The PlanningPokerSession to export.
+
+    @return generator: One dictionary per feature, with the COLUMNS keys and `histogram`, the list of the number
+    of votes per card code of the session's deck.
+    """
+    deck = session.deck
+    votes = session.votes
+    rules = session.rules
+    feature_rounds = session.feature_rounds
+    for feature in session.features:
+        stats = FeatureStats(deck)
+        for code in votes.iter_feature_votes(feature):
+            stats.add(code)
+
+        row = {
+            "feature": feature,
+            "status": rules.feature_status(feature) if rules is not None else ("voted" if stats.count else "pending"),
+            "rounds": feature_rounds.get(feature, 0),
+            "votes": stats.count,
+            "numeric_votes": stats.numeric_count,
+            "estimate": rules.estimate_stats(stats) if rules is not None and stats.count else stats.mean,
+        }
+        row.update(stats_summary(stats))
+        row["histogram"] = stats.histogram
+        yield row
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _card_columns(deck):
+    return [f"votes_{label}" for label in deck.labels]
+
+
+def _write_csv(rows, file, deck):
+    writer = csv.writer(file)
+    writer.writerow(COLUMNS + tuple(_card_columns(deck)))
+    for row in rows:
+        writer.writerow([("" if row[column] is None else row[column]) for column in COLUMNS] + row["histogram"])
+
+
+def _write_jsonl(rows, file, deck):
+    labels = deck.labels
+    for row in rows:
+        record = {column: row[column] for column in COLUMNS}
+        record["histogram"] = {labels[code]: count for code, count in enumerate(row["histogram"]) if count}
+        file.write(json.dumps(record))
+        file.write("\n")
+
+
+def _chunk_columns(chunk, card_columns):
+    columns = {column: [row[column] for row in chunk] for column in COLUMNS}
+    for code, name in enumerate(card_columns):
+        columns[name] = [row["histogram"][code] for row in chunk]
+    return columns
+
+
+def _write_columns(rows, file, deck, chunk_rows):
+    card_columns = _card_columns(deck)
+    for chunk in _chunks(rows, chunk_rows):
+        file.write(json.dumps({"rows": len(chunk), "columns": _chunk_columns(chunk, card_columns)}))
+        file.write("\n")
+
+
+def _write_parquet(rows, file_path, deck, chunk_rows):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet export needs pyarrow; install it or export as csv, jsonl or columns.") from None
+
+    card_columns = _card_columns(deck)
+    fields = [("feature", pa.string()), ("status", pa.string()), ("rounds", pa.int32()), ("votes", pa.int32()),
+              ("numeric_votes", pa.int32())]
+    fields += [(column, pa.float64()) for column in COLUMNS[len(fields):]]
+    fields += [(column, pa.int32()) for column in card_columns]
+    schema = pa.schema(fields)
+    with pq.ParquetWriter(file_path, schema) as writer:
+        for chunk in _chunks(rows, chunk_rows):
+            columns = _chunk_columns(chunk, card_columns)
+            columns["feature"] = [str(feature) for feature in columns["feature"]]
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+
+
+def export_rows(rows, file_path, export_format=None, deck=DEFAULT_DECK, chunk_rows=CHUNK_ROWS):
+    """
+    @brief Stream estimation rows to a file.
+
+    @param rows Iterable of rows as yielded by `estimation_rows`.
+    @param file_path Path of the file to write.
+    @param export_format One of FORMATS; guessed from the extension of `file_path` by default.
+    @param deck The Deck the histograms are indexed by.
+    @param chunk_rows Rows per chunk of the columnar formats.
+
+    @return void
+    """
+    if export_format is None:
+        export_format = format_of(file_path)
+        if export_format is None:
+            raise ValueError(f"Unknown export format for {file_path}. Use one of: {', '.join(FORMATS)}.")
+    if export_format not in FORMATS:
+        raise ValueError(f"Unknown export format: {export_format}. Use one of: {', '.join(FORMATS)}.")
+
+    with atomic_path(file_path, "." + export_format) as temp_path:
+        if export_format == "parquet":
+            _write_parquet(rows, temp_path, deck, chunk_rows)
+            return
+        with open(temp_path, "w", encoding="utf-8", newline="") as file:
+            if export_format == "csv":
+                _write_csv(rows, file, deck)
+            elif export_format == "jsonl":
+                _write_jsonl(rows, file, deck)
+            else:
+                _write_columns(rows, file, deck, chunk_rows)
+
+
+def export_session(session, file_path, export_format=None, chunk_rows=CHUNK_ROWS):
+    """
+    @brief Stream the estimation results of every feature of a session to a file.
+
+    @param session The PlanningPokerSession to export.
+    @param file_path Path of the file to write.
+    @param export_format One of FORMATS; guessed from the extension of `file_path` by default.
+    @param chunk_rows Rows per chunk of the columnar formats.
+
+    @return void
+    """
+    export_rows(estimation_rows(session), file_path, export_format, session.deck, chunk_rows)
+
+
+def export_progress(progress_data, file_path, export_format=None, chunk_rows=CHUNK_ROWS):
+    """
+    @brief Export the estimation results of a session from its progress data.
+
+    The session is rebuilt from the data, so the export can run on another thread than the one playing the session.
+
+    @param progress_data Progress data, as returned by `PlanningPokerSession.to_dict`.
+    @param file_path Path of the file to write.
+    @param export_format One of FORMATS; guessed from the extension of `file_path` by default.
+    @param chunk_rows Rows per chunk of the columnar formats.
+
+    @return void
+    """
+    from session import PlanningPokerSession
+
+    session = PlanningPokerSession()
+    session.load_dict(progress_data)
+    export_session(session, file_path, export_format, chunk_rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the estimation results of a saved session.")
+    parser.add_argument("progress", help="Progress file written by the GUI or planning_poker_cli.py --save.")
+    parser.add_argument("output", help="File to write.")
+    parser.add_argument("--format", choices=FORMATS, help="Export format; guessed from the extension by default.")
+    args = parser.parse_args(argv)
+
+    from session import PlanningPokerSession
+
+    session = PlanningPokerSession()
+    try:
+        session.load(args.progress)
+        export_session(session, args.output, args.format)
+    except (OSError, ValueError, KeyError) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,402 @@
+# history.py
+"""
+@file history.py
+@brief SQLite archive of every Planning Poker session, round, vote and final estimate.
+
+@details
+EstimationHistory stores finished work in a local SQLite database, so estimates outlive the session that produced
+them. Feature and player names are stored once and referenced by id. Every round is written with batched inserts
+in a single transaction: the round, its votes, the estimates of the features that converged in it, and the deviation
+of every vote from the estimate its feature finally got.
+
+The tables are indexed for the usual questions, which read only index ranges:
+- estimates by feature and date, by date, and by rule and date;
+- sessions by start date and by rule.
+The deviations of the votes of each player are also summed per session when their features converge, so
+per-player statistics read one row per player and session instead of every vote.
+
+A SessionRecorder, created by `EstimationHistory.attach(session)`, follows the events of a PlanningPokerSession:
+votes are buffered as they are cast and flushed when the round closes.
+
+@code
+history = EstimationHistory("planning_poker_history.db")
+history.attach(session)
+history.estimates("login", since=time.time() - 365 * 86400)
+history.player_deviation()
+@endcode
+
+Command line queries print JSON:
+@code
+python history.py --db planning_poker_history.db --feature login --days 365
+python history.py --db planning_poker_history.db --deviation
+@endcode
+"""
+import argparse
+import json
+import sqlite3
+import sys
+import time
+
+from event_bus import VoteCast, SessionStarted, RoundClosed
+
+HISTORY_PATH = "planning_poker_history.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS features (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS players (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    rule TEXT,
+    started_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    number INTEGER NOT NULL,
+    closed_at REAL NOT NULL,
+    votes INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS votes (
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    round_id INTEGER NOT NULL REFERENCES rounds(id),
+    feature_id INTEGER NOT NULL REFERENCES features(id),
+    player_id INTEGER NOT NULL REFERENCES players(id),
+    card TEXT NOT NULL,
+    value REAL,
+    deviation REAL
+);
+CREATE TABLE IF NOT EXISTS estimates (
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    feature_id INTEGER NOT NULL REFERENCES features(id),
+    round_id INTEGER NOT NULL REFERENCES rounds(id),
+    rule TEXT,
+    estimate REAL,
+    decided_at REAL NOT NULL,
+    PRIMARY KEY (session_id, feature_id)
+);
+CREATE TABLE IF NOT EXISTS player_deviations (
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    player_id INTEGER NOT NULL REFERENCES players(id),
+    votes INTEGER NOT NULL,
+    total REAL NOT NULL,
+    total_absolute REAL NOT NULL,
+    PRIMARY KEY (session_id, player_id)
+);
+CREATE INDEX IF NOT EXISTS sessions_started ON sessions(started_at);
+CREATE INDEX IF NOT EXISTS sessions_rule ON sessions(rule, started_at);
+CREATE INDEX IF NOT EXISTS rounds_session ON rounds(session_id);
+CREATE INDEX IF NOT EXISTS votes_feature ON votes(session_id, feature_id);
+CREATE INDEX IF NOT EXISTS votes_player ON votes(player_id);
+CREATE INDEX IF NOT EXISTS estimates_feature ON estimates(feature_id, decided_at);
+CREATE INDEX IF NOT EXISTS estimates_date ON estimates(decided_at);
+CREATE INDEX IF NOT EXISTS estimates_rule ON estimates(rule, decided_at);
+"""
+
+# SQLite limits the number of parameters of one statement
+_MAX_PARAMETERS = 500
+
+
+class EstimationHistory:
+    """
+    @brief SQLite archive of sessions, rounds, votes and estimates, with indexed queries.
+
+    @details
+    Dates are Unix timestamps. Name lookups are cached, so recording a round only inserts the names never seen
+    before. The database uses write-ahead logging, so queries from another process do not block recording.
+
+    @par Attributes:
+    - path: Path of the database file, or ":memory:".
+    """
+    def __init__(self, path=HISTORY_PATH):
+        """
+        @brief Open the archive, creating the database and its indexes if needed.
+
+        @param path Path of the database file, or ":memory:".
+        """
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        self._ids = {"features": {}, "players": {}}
+
+    def close(self):
+        """
+        @brief Close the database.
+
+        @return void
+        """
+        self._connection.close()
+
+    def attach(self, session):
+        """
+        @brief Record the rounds of a session as they close.
+
+        @param session The PlanningPokerSession to follow.
+
+        @return SessionRecorder: The recorder, whose `detach` stops the recording.
+        """
+        return SessionRecorder(self, session)
+
+    def begin_session(self, rule, started_at=None):
+        """
+        @brief Create the record of a new session.
+
+        @param rule Class name of the voting rule, or None.
+        @param started_at Start date; now by default.
+
+        @return int: The id of the session.
+        """
+        with self._connection:
+            cursor = self._connection.execute("INSERT INTO sessions (rule, started_at) VALUES (?, ?)",
+                                              (rule, time.time() if started_at is None else started_at))
+        return cursor.lastrowid
+
+    def record_round(self, session_id, number, votes, estimates, finished=False, closed_at=None):
+        """
+        @brief Record a closed round in a single transaction.
+
+        @param session_id Id returned by `begin_session`.
+        @param number Number of the round in the session, from 1.
+        @param votes List of `(player, feature, card label, numeric value or None)` tuples.
+        @param estimates List of `(feature, estimate or None)` tuples for the features that converged in this round.
+        @param finished True if this round ends the session.
+        @param closed_at Closing date; now by default.
+
+        @return int: The id of the round.
+        """
+        closed_at = time.time() if closed_at is None else closed_at
+        try:
+            return self._record_round(session_id, number, votes, estimates, finished, closed_at)
+        except BaseException:
+            # Names inserted by the rolled back transaction are not in the database
+            self._ids = {"features": {}, "players": {}}
+            raise
+
+    def _record_round(self, session_id, number, votes, estimates, finished, closed_at):
+        with self._connection as connection:
+            feature_ids = self._lookup_ids("features", [feature for _, feature, _, _ in votes] +
+                                           [feature for feature, _ in estimates])
+            player_ids = self._lookup_ids("players", [player for player, _, _, _ in votes])
+            cursor = connection.execute(
+                "INSERT INTO rounds (session_id, number, closed_at, votes) VALUES (?, ?, ?, ?)",
+                (session_id, number, closed_at, len(votes)))
+            round_id = cursor.lastrowid
+            connection.executemany(
+                "INSERT INTO votes (session_id, round_id, feature_id, player_id, card, value) VALUES (?, ?, ?, ?, ?, ?)",
+                [(session_id, round_id, feature_ids[feature], player_ids[player], card, value)
+                 for player, feature, card, value in votes])
+            rule = connection.execute("SELECT rule FROM sessions WHERE id = ?", (session_id,)).fetchone()[0]
+            connection.executemany(
+                "INSERT OR REPLACE INTO estimates (session_id, feature_id, round_id, rule, estimate, decided_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(session_id, feature_ids[feature], round_id, rule, estimate, closed_at)
+                 for feature, estimate in estimates])
+            # Votes of every round of a feature are compared with the estimate it converged to
+            settled = [(estimate, session_id, feature_ids[feature]) for feature, estimate in estimates
+                       if estimate is not None]
+            connection.executemany(
+                "UPDATE votes SET deviation = value - ? WHERE session_id = ? AND feature_id = ? AND value IS NOT NULL",
+                settled)
+            for start in range(0, len(settled), _MAX_PARAMETERS):
+                chunk = [feature_id for _, _, feature_id in settled[start:start + _MAX_PARAMETERS]]
+                connection.execute(
+                    "INSERT INTO player_deviations (session_id, player_id, votes, total, total_absolute) "
+                    "SELECT session_id, player_id, COUNT(*), SUM(deviation), SUM(ABS(deviation)) FROM votes "
+                    f"WHERE session_id = ? AND feature_id IN ({', '.join('?' * len(chunk))}) AND deviation IS NOT NULL "
+                    "GROUP BY player_id "
+                    "ON CONFLICT (session_id, player_id) DO UPDATE SET votes = votes + excluded.votes, "
+                    "total = total + excluded.total, total_absolute = total_absolute + excluded.total_absolute",
+                    [session_id] + chunk)
+            if finished:
+                connection.execute("UPDATE sessions SET finished_at = ? WHERE id = ?", (closed_at, session_id))
+        return round_id
+
+    def _lookup_ids(self, table, names):
+        # Return the ids of the names, inserting the names never seen before
+        cache = self._ids[table]
+        missing = list(dict.fromkeys(name for name in names if name not in cache))
+        if missing:
+            self._connection.executemany(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)",
+                                         [(name,) for name in missing])
+            for start in range(0, len(missing), _MAX_PARAMETERS):
+                chunk = missing[start:start + _MAX_PARAMETERS]
+                placeholders = ", ".join("?" * len(chunk))
+                cache.update((name, row_id) for row_id, name in self._connection.execute(
+                    f"SELECT id, name FROM {table} WHERE name IN ({placeholders})", chunk))
+        return cache
+
+    def estimates(self, pattern=None, since=None, until=None, rule=None, limit=None):
+        """
+        @brief Return the final estimates of the features, newest first.
+
+        @param pattern Optional text the feature name must contain, case-insensitively.
+        @param since Optional earliest decision date.
+        @param until Optional latest decision date.
+        @param rule Optional class name of the voting rule.
+        @param limit Optional maximum number of estimates.
+
+        @return list: Dictionaries with "feature", "estimate", "rule", "decided_at" and "session".
+        """
+        conditions, parameters = [], []
+        if pattern:
+            escaped = pattern.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append("e.feature_id IN (SELECT id FROM features WHERE name LIKE ? ESCAPE '\\')")
+            parameters.append(f"%{escaped}%")
+        if since is not None:
+            conditions.append("e.decided_at >= ?")
+            parameters.append(since)
+        if until is not None:
+            conditions.append("e.decided_at <= ?")
+            parameters.append(until)
+        if rule is not None:
+            conditions.append("e.rule = ?")
+            parameters.append(rule)
+        query = ("SELECT f.name, e.estimate, e.rule, e.decided_at, e.session_id "
+                 "FROM estimates e JOIN features f ON f.id = e.feature_id")
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY e.decided_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+        return [{"feature": feature, "estimate": estimate, "rule": rule_name, "decided_at": decided_at,
+                 "session": session_id}
+                for feature, estimate, rule_name, decided_at, session_id in self._connection.execute(query, parameters)]
+
+    def player_deviation(self, since=None, rule=None):
+        """
+        @brief Return how far each player's votes were from the estimates their features converged to.
+
+        Only numeric votes on features with a numeric estimate count.
+
+        @param since Optional earliest session start date.
+        @param rule Optional class name of the voting rule.
+
+        @return dict: Mapping of player to a dictionary with the number of "votes", the mean signed deviation
+        ("bias", positive when the player overestimates) and the "mean_absolute_deviation".
+        """
+        conditions, parameters = [], []
+        if since is not None:
+            conditions.append("started_at >= ?")
+            parameters.append(since)
+        if rule is not None:
+            conditions.append("rule = ?")
+            parameters.append(rule)
+        query = "SELECT player_id, SUM(votes), SUM(total) / SUM(votes), SUM(total_absolute) / SUM(votes) FROM player_deviations"
+        if conditions:
+            query += " WHERE session_id IN (SELECT id FROM sessions WHERE " + " AND ".join(conditions) + ")"
+        query += " GROUP BY player_id"
+        names = dict(self._connection.execute("SELECT id, name FROM players"))
+        return {names[player_id]: {"votes": votes, "bias": bias, "mean_absolute_deviation": absolute}
+                for player_id, votes, bias, absolute in self._connection.execute(query, parameters)}
+
+
+class SessionRecorder:
+    """
+    @brief Archive the rounds of a PlanningPokerSession from its events.
+
+    @details
+    VoteCast events are buffered per player and feature, so a vote changed during the round is recorded once.
+    On RoundClosed the buffered votes and the estimates of the features that converged are written in one
+    transaction. A SessionStarted event opens a new session record.
+
+    The subscriptions are synchronous: the estimates are read from the session while the round is being closed.
+    """
+    def __init__(self, history, session):
+        """
+        @brief Constructor for the SessionRecorder class.
+
+        @param history The EstimationHistory to write to.
+        @param session The PlanningPokerSession to follow.
+        """
+        self.history = history
+        self.session = session
+        self._subscriptions = [
+            session.bus.subscribe(SessionStarted, self._on_started),
+            session.bus.subscribe(VoteCast, self._on_vote),
+            session.bus.subscribe(RoundClosed, self._on_round_closed),
+        ]
+        self.resume()
+
+    def resume(self):
+        """
+        @brief Start recording a session restored from a file or a journal, in the middle of a round.
+
+        The votes of the current round already in the session are buffered, and the session gets a new record
+        when its round closes.
+
+        @return void
+        """
+        round_features = set(self.session.round_features)
+        self.session_id = None
+        self.round_number = 0
+        self._round_votes = {key: code for key, code in self.session.votes.items() if key[1] in round_features}
+
+    def detach(self):
+        """
+        @brief Stop recording.
+
+        @return void
+        """
+        for subscription in self._subscriptions:
+            self.session.bus.unsubscribe(subscription)
+        self._subscriptions = []
+
+    def _begin(self):
+        rules = self.session.rules
+        self.session_id = self.history.begin_session(None if rules is None else rules.__class__.__name__)
+
+    def _on_started(self, event):
+        self._begin()
+        self.round_number = 0
+        self._round_votes = {}
+
+    def _on_vote(self, event):
+        self._round_votes[(event.player, event.feature)] = event.vote
+
+    def _on_round_closed(self, event):
+        if self.session_id is None:
+            self._begin()
+        self.round_number += 1
+        session = self.session
+        deck = session.deck
+        votes = [(player, feature, deck.label(code), deck.value(code))
+                 for (player, feature), code in self._round_votes.items()]
+        revote_features = set(event.revote_features)
+        voted_features = dict.fromkeys(feature for _, feature in self._round_votes)
+        estimates = [(feature, session.feature_estimate(feature))
+                     for feature in voted_features if feature not in revote_features]
+        self._round_votes = {}
+        self.history.record_round(self.session_id, self.round_number, votes, estimates, finished=event.finished)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the Planning Poker estimation history.")
+    parser.add_argument("--db", default=HISTORY_PATH, help="History database.")
+    parser.add_argument("--feature", help="Only the features whose name contains this text.")
+    parser.add_argument("--days", type=float, help="Only the last DAYS days.")
+    parser.add_argument("--rule", help="Only the sessions of this rule class, e.g. MedianRule.")
+    parser.add_argument("--limit", type=int, help="Maximum number of estimates.")
+    parser.add_argument("--deviation", action="store_true", help="Print the per-player deviation from consensus.")
+    args = parser.parse_args(argv)
+
+    since = None if args.days is None else time.time() - args.days * 86400
+    try:
+        history = EstimationHistory(args.db)
+    except sqlite3.Error as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 2
+    if args.deviation:
+        result = history.player_deviation(since=since, rule=args.rule)
+    else:
+        result = history.estimates(args.feature, since=since, rule=args.rule, limit=args.limit)
+    history.close()
+    json.dump(result, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+# journal.py
+import json
+import os
+
+from session import PlanningPokerSession
+
+
+class SessionJournal:
+    """
+    @file journal.py
+    @brief Append-only on-disk journal of a Planning Poker session, with periodic snapshots.
+
+    @details
+    Every state change of an attached PlanningPokerSession (players, features, rule change, start, vote and round
+    evaluation) is appended to the journal file as one JSON line with a sequence number, as soon as it happens.
+    Appending is O(1) per vote, and the file is flushed after every line so a crash of the application loses nothing.
+
+    From time to time the journal is compacted: the whole session is written to a snapshot file next to the journal
+    (through a temporary file and an atomic rename) and the journal is truncated. Snapshots are spaced by at least as
+    many events as the session holds votes, which keeps their amortized cost per vote constant.
+
+    Resuming loads the snapshot and replays only the journal tail written after it; events already covered by the
+    snapshot are recognized by their sequence number, so a crash between the snapshot and the truncation is harmless.
+    The cursor is then put back on the first turn of the current round that has no vote.
+
+    @note
+    With `fsync=True` each line is also forced to disk, which survives an operating system crash at the cost of
+    one disk sync per vote.
+
+    @code
+    journal = SessionJournal.create("session.journal", session)
+    ...
+    session, journal = SessionJournal.resume("session.journal")
+    @endcode
+    """
+    def __init__(self, path, snapshot_every=1000, fsync=False, seq=0):
+        """
+        @brief Constructor for the SessionJournal class. Use `create` or `resume` instead.
+
+        @param path Path of the journal file; the snapshot is written to `path + ".snapshot"`.
+        @param snapshot_every Minimum number of events between two snapshots.
+        @param fsync If True, force every appended line to disk.
+        @param seq Sequence number of the last event already written.
+        """
+        self.path = path
+        self.snapshot_path = path + ".snapshot"
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self.seq = seq
+        self._events_since_snapshot = 0
+        self._file = open(path, "a", encoding="utf-8")
+
+    @classmethod
+    def create(cls, path, session, **kwargs):
+        """
+        @brief Start a new journal for a session, replacing any previous journal at `path`.
+
+        @param path Path of the journal file.
+        @param session The session to record.
+
+        @return SessionJournal: The journal, attached to the session.
+        """
+        open(path, "w").close()
+        journal = cls(path, **kwargs)
+        journal.snapshot(session)
+        session.journal = journal
+        return journal
+
+    @classmethod
+    def exists(cls, path):
+        """
+        @brief Check if a journal or its snapshot exists at `path`.
+        """
+        return os.path.exists(path + ".snapshot") or os.path.exists(path)
+
+    @classmethod
+    def resume(cls, path, **kwargs):
+        """
+        @brief Rebuild a session from its snapshot and journal tail.
+
+        @param path Path of the journal file.
+
+        @return tuple: `(session, journal)`, with the journal attached to the session.
+        """
+        session = PlanningPokerSession()
+        seq = 0
+        snapshot_path = path + ".snapshot"
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, "r", encoding="utf-8") as file:
+                snapshot = json.load(file)
+            seq = snapshot["seq"]
+            session.load_dict(snapshot["session"])
+
+        replayed = 0
+        if os.path.exists(path):
+            valid_end = 0
+            with open(path, "rb") as file:
+                for line in file:
+                    try:
+                        event = json.loads(line)
+                    except (json.decoder.JSONDecodeError, UnicodeDecodeError):
+                        # A torn last line from a crash mid-write
+                        break
+                    valid_end += len(line)
+                    if event["seq"] <= seq:
+                        continue
+                    replay_event(session, event)
+                    seq = event["seq"]
+                    replayed += 1
+            # Drop the torn line so new events do not get appended to it
+            if os.path.getsize(path) > valid_end:
+                os.truncate(path, valid_end)
+        session.resume_cursor()
+
+        journal = cls(path, seq=seq, **kwargs)
+        journal._events_since_snapshot = replayed
+        session.journal = journal
+        return session, journal
+
+    def record(self, session, event):
+        """
+        @brief Append an event of the session, and compact the journal when it is due.
+
+        @param session The session the event belongs to.
+        @param event JSON-compatible dictionary with a "type" key.
+
+        @return void
+        """
+        self.seq += 1
+        event["seq"] = self.seq
+        self._file.write(json.dumps(event) + "\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+        self._events_since_snapshot += 1
+        if self._events_since_snapshot >= max(self.snapshot_every, len(session.votes)):
+            self.snapshot(session)
+
+    def snapshot(self, session):
+        """
+        @brief Write the whole session to the snapshot file and truncate the journal.
+
+        @param session The session to snapshot.
+
+        @return void
+        """
+        temp_path = self.snapshot_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"seq": self.seq, "session": session.to_dict()}, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.snapshot_path)
+
+        self._file.close()
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._events_since_snapshot = 0
+
+    def close(self):
+        """
+        @brief Close the journal file.
+
+        @return void
+        """
+        self._file.close()
+
+
+def replay_event(session, event):
+    """
+    @brief Apply a journal event to a session that has no journal attached.
+
+    @param session The session to update.
+    @param event The journal event.
+
+    @return void
+    """
+    kind = event["type"]
+    if kind == "players":
+        session.set_players(event["players"])
+    elif kind == "features":
+        session.load_features(event["features"])
+    elif kind == "rule":
+        session.set_rule(event["rules"])
+    elif kind == "start":
+        session.start()
+    elif kind == "vote":
+        session.record_vote(event["player"], event["feature"], event["vote"])
+    elif kind == "evaluate":
+        session.evaluate()
+    else:
+        raise ValueError(f"Unknown journal event: {kind}")
@@ -0,0 +1,18 @@
+# majority_rule.py
+from mode_rule import ModeRule
+
+
+class MajorityRule(ModeRule):
+    """
+    @file majority_rule.py
+    @brief Class implementing the Absolute Majority Rule for Planning Poker.
+
+    @details
+    The MajorityRule class accepts a feature when one card gathers more than half of the votes, and takes that
+    card as the estimate of the feature.
+
+    @see
+    For additional information on how to use this class, refer to the documentation of its methods.
+    """
+    THRESHOLD = 1 / 2
+    STRICT = True
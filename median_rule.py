@@ -0,0 +1,28 @@
+# median_rule.py
+from stats_kernel import StatsRule
+
+
+class MedianRule(StatsRule):
+    """
+    @file median_rule.py
+    @brief Class implementing the Median Rule for Planning Poker.
+
+    @details
+    The MedianRule class validates each feature on the median of its numeric votes, which must fall within the
+    range [1, 20] like the average of the AverageRule, but is not dragged by a single extreme card.
+    The median is the estimate of the feature. Coffee and "?" cards are ignored.
+
+    @see
+    For additional information on how to use this class, refer to the documentation of its methods.
+    """
+    LOW = 1
+    HIGH = 20
+
+    def classify(self, stats):
+        median = stats.median
+        if median is None:
+            return "pending"
+        return "converged" if self.LOW <= median <= self.HIGH else "diverged"
+
+    def estimate_stats(self, stats):
+        return stats.median
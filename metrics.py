@@ -0,0 +1,348 @@
+# metrics.py
+"""
+@file metrics.py
+@brief Low-overhead timing histograms of the hot paths, exported in the Prometheus text format.
+
+@details
+The shared `METRICS` registry holds one Histogram per metric name and label set. A histogram counts durations in
+fixed exponential buckets (10 µs to about 84 s, doubling), so recording is a binary search and three additions,
+whatever the number of observations, and memory does not grow with the session.
+
+Code is timed with the `timed` decorator or the `time` context manager:
+@code
+@METRICS.timed("planning_poker_session_seconds", operation="evaluate")
+def evaluate(self): ...
+
+with METRICS.time("planning_poker_rule_validate_seconds", rule=type(rule).__name__):
+    rule.validate_votes(votes)
+@endcode
+
+The histograms are exported with `to_prometheus`, written to a file with `write_prometheus`, or served at
+`/metrics` by `serve_http`. SessionProfiler captures a cProfile of everything the main thread runs between
+`start` and `stop`, and dumps it for pstats.
+"""
+import bisect
+import functools
+import io
+import threading
+import time
+
+# Upper bounds of the buckets, in seconds
+BUCKETS = tuple(0.00001 * 2 ** exponent for exponent in range(24))
+
+
+class Histogram:
+    """
+    @brief Distribution of durations over the fixed exponential BUCKETS.
+
+    @par Attributes:
+    - name: Metric name.
+    - labels: Tuple of `(label, value)` pairs, sorted by label.
+    - count: Number of observations.
+    - total: Sum of the observations, in seconds.
+    - counts: Number of observations per bucket, the last one counting those above every bound.
+    """
+    __slots__ = ("name", "labels", "count", "total", "counts", "_lock")
+
+    def __init__(self, name, labels=()):
+        self.name = name
+        self.labels = labels
+        self.count = 0
+        self.total = 0.0
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        """
+        @brief Record one duration.
+
+        @param seconds The duration, in seconds.
+
+        @return void
+        """
+        index = bisect.bisect_left(BUCKETS, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += seconds
+
+    def quantile(self, fraction):
+        """
+        @brief Return the upper bound of the bucket holding a quantile, or None without observations.
+
+        @param fraction The quantile, between 0 and 1.
+
+        @return float: The bound, in seconds; infinity when the quantile is above every bound.
+        """
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and seen:
+                return BUCKETS[index] if index < len(BUCKETS) else float("inf")
+        return float("inf")
+
+
+class _Timing:
+    # Context manager recording the time spent in its block
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class MetricsRegistry:
+    """
+    @brief Registry of the timing histograms, keyed by metric name and labels.
+    """
+    def __init__(self):
+        """
+        @brief Constructor for the MetricsRegistry class.
+        """
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name, **labels):
+        """
+        @brief Return the histogram of a metric name and label set, creating it on first use.
+
+        @param name Metric name, in the Prometheus naming style.
+        @param labels Label values, converted to strings.
+
+        @return Histogram: The histogram.
+        """
+        key = (name, tuple(sorted((label, str(value)) for label, value in labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram(*key)
+        return histogram
+
+    def observe(self, name, seconds, **labels):
+        """
+        @brief Record one duration.
+
+        @return void
+        """
+        self.histogram(name, **labels).observe(seconds)
+
+    def time(self, name, **labels):
+        """
+        @brief Return a context manager recording the time spent in its block.
+        """
+        return _Timing(self.histogram(name, **labels))
+
+    def timed(self, name, **labels):
+        """
+        @brief Return a decorator recording the time spent in every call of a function, exceptions included.
+        """
+        histogram = self.histogram(name, **labels)
+
+        def decorate(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    histogram.observe(time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def reset(self):
+        """
+        @brief Drop every histogram.
+
+        @return void
+        """
+        with self._lock:
+            self._histograms = {}
+
+    def summary(self):
+        """
+        @brief Return the histograms as JSON-compatible data.
+
+        @return dict: Mapping of `name{labels}` to the count, the mean and the p50, p95 and p99 bucket bounds,
+        in seconds, for the histograms with at least one observation.
+        """
+        summary = {}
+        for histogram in list(self._histograms.values()):
+            if histogram.count:
+                summary[histogram.name + _format_labels(histogram.labels)] = {
+                    "count": histogram.count,
+                    "mean": histogram.total / histogram.count,
+                    "p50": histogram.quantile(0.5),
+                    "p95": histogram.quantile(0.95),
+                    "p99": histogram.quantile(0.99),
+                }
+        return summary
+
+    def to_prometheus(self):
+        """
+        @brief Return every histogram in the Prometheus text exposition format.
+
+        @return str: The exposition text.
+        """
+        families = {}
+        for histogram in list(self._histograms.values()):
+            families.setdefault(histogram.name, []).append(histogram)
+
+        lines = []
+        for name in sorted(families):
+            lines.append(f"# TYPE {name} histogram")
+            for histogram in sorted(families[name], key=lambda histogram: histogram.labels):
+                with histogram._lock:
+                    counts, count, total = list(histogram.counts), histogram.count, histogram.total
+                cumulative = 0
+                for bound, bucket_count in zip(BUCKETS, counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(histogram.labels + (("le", f"{bound:.6g}"),))
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(histogram.labels + (('le', '+Inf'),))} {count}")
+                labels = _format_labels(histogram.labels)
+                lines.append(f"{name}_sum{labels} {total!r}")
+                lines.append(f"{name}_count{labels} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, file_path):
+        """
+        @brief Write every histogram to a file in the Prometheus text format, atomically.
+
+        The file can be collected by the textfile collector of the Prometheus node exporter.
+
+        @param file_path Path of the file to write.
+
+        @return void
+        """
+        from persistence import write_text_atomic
+
+        write_text_atomic(file_path, self.to_prometheus())
+
+    def serve_http(self, host="127.0.0.1", port=9464):
+        """
+        @brief Serve the histograms at `http://host:port/metrics` from a background thread.
+
+        @param host Interface to listen on.
+        @param port Port to listen on; 0 picks a free port.
+
+        @return http.server.ThreadingHTTPServer: The server; call `shutdown` to stop it.
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Scrapes are not worth a line on stderr each
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{label}="{value}"' for (label, _), value in zip(labels, escaped)) + "}"
+
+
+class SessionProfiler:
+    """
+    @brief Toggle capturing a cProfile of the calls made on the main thread.
+
+    @code
+    profiler = SessionProfiler()
+    profiler.start()
+    ...
+    print(profiler.stop("session.pstats"))
+    @endcode
+    """
+    def __init__(self):
+        """
+        @brief Constructor for the SessionProfiler class.
+        """
+        self._profile = None
+        self._last = None
+
+    @property
+    def active(self):
+        """
+        @brief True while a profile is being captured.
+        """
+        return self._profile is not None
+
+    def start(self):
+        """
+        @brief Start capturing.
+
+        @return void
+        """
+        if self._profile is not None:
+            raise ValueError("The profiler is already running.")
+        import cProfile
+
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def stop(self, file_path=None, limit=20):
+        """
+        @brief Stop capturing, optionally dump the profile for pstats, and return the most expensive calls.
+
+        @param file_path Optional path of the pstats dump.
+        @param limit Number of functions in the returned report.
+
+        @return str: The functions with the highest cumulative time, as printed by pstats.
+        """
+        if self._profile is None:
+            raise ValueError("The profiler is not running.")
+        import pstats
+
+        profile, self._profile = self._profile, None
+        profile.disable()
+        self._last = profile
+        if file_path:
+            profile.dump_stats(file_path)
+        report = io.StringIO()
+        pstats.Stats(profile, stream=report).sort_stats("cumulative").print_stats(limit)
+        return report.getvalue()
+
+    def dump(self, file_path):
+        """
+        @brief Dump the last stopped profile for pstats.
+
+        @param file_path Path of the dump.
+
+        @return void
+        """
+        if self._last is None:
+            raise ValueError("No profile was captured.")
+        self._last.dump_stats(file_path)
+
+
+METRICS = MetricsRegistry()
@@ -0,0 +1,30 @@
+# mode_rule.py
+from stats_kernel import StatsRule
+
+
+class ModeRule(StatsRule):
+    """
+    @file mode_rule.py
+    @brief Class implementing the Mode Rule with a threshold for Planning Poker.
+
+    @details
+    The ModeRule class accepts a feature when its most played card gathers at least `THRESHOLD` of the votes
+    (two thirds by default). That card is the estimate of the feature. Subclasses change the threshold, or make it
+    strict with `STRICT`.
+
+    @see
+    For additional information on how to use this class, refer to the documentation of its methods.
+    """
+    THRESHOLD = 2 / 3
+    STRICT = False
+
+    def classify(self, stats):
+        _, votes = stats.mode()
+        share = votes / stats.count
+        if self.STRICT:
+            return "converged" if share > self.THRESHOLD else "diverged"
+        return "converged" if share >= self.THRESHOLD else "diverged"
+
+    def estimate_stats(self, stats):
+        code, _ = stats.mode()
+        return self.deck.value(code)
@@ -0,0 +1,242 @@
+# net_client.py
+"""
+@file net_client.py
+@brief Reference command-line client for net_server.py, with a load-testing mode.
+
+@details
+In interactive mode the client joins as one player and asks for a vote on each feature of every round.
+With `--simulate N`, N simulated voters connect concurrently from one event loop and vote on every feature as soon as
+a round starts, which is used to load-test the server on localhost. With `--ballot`, each voter sends all the votes of
+a round in a single ballot message. Each simulated voter picks the same value as
+the others with probability `--agreement` in the first round, and a random card otherwise, including cards outside
+the range accepted by the Average rule, so some features need a re-vote. As teams agree more after each discussion,
+the probability of a random card halves every round, so that even hundreds of voters converge.
+At the end a JSON report gives the number of rounds, the total time, the vote throughput and ack latency percentiles.
+
+Against room_server.py, `--room` names the room to join. With `--simulate N --rooms K`, K rooms of N voters each
+are simulated at once, each room being created from `--features` and `--rule` by its voters.
+
+@code
+python net_client.py --player Alice
+python net_client.py --simulate 300 --agreement 0.95 --seed 1
+python net_client.py --simulate 10 --rooms 40 --features backlog.json --rule Average
+@endcode
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import zlib
+
+from backlog_import import import_backlog
+from net_server import STREAM_LIMIT
+
+# Cards the voters of a feature agree on
+AGREED_VALUES = ["1", "2", "3", "5", "8", "13", "20"]
+# Cards drawn by disagreeing voters
+CARD_VALUES = ["0"] + AGREED_VALUES + ["40", "100"]
+
+
+class VoterClient:
+    """
+    @brief One player connected to the voting server.
+
+    @par Attributes:
+    - player: The player name.
+    - choose_vote: Coroutine function `(feature, round_number)` returning the vote to cast.
+    - latencies: Seconds between sending each vote or ballot and receiving its acknowledgement.
+    - votes_cast: Number of votes sent.
+    - rounds: Number of rounds the player voted in.
+    - estimations: Final estimations received from the server.
+    - join_fields: Extra fields of the join message, such as the room.
+    - ballot: If True, the votes of a round are sent together in one ballot message.
+    """
+    def __init__(self, player, choose_vote, join_fields=None, ballot=False):
+        self.player = player
+        self.choose_vote = choose_vote
+        self.join_fields = join_fields or {}
+        self.ballot = ballot
+        self.latencies = []
+        self.votes_cast = 0
+        self.rounds = 0
+        self.estimations = None
+        self._sent = {}
+
+    async def run(self, host, port):
+        """
+        @brief Join the session and vote until it is finished.
+
+        @param host Server address.
+        @param port Server port.
+
+        @return void
+        """
+        reader, writer = await asyncio.open_connection(host, port, limit=STREAM_LIMIT)
+        try:
+            join = dict(self.join_fields, type="join", player=self.player)
+            writer.write((json.dumps(join) + "\n").encode("utf-8"))
+            await writer.drain()
+            while True:
+                line = await reader.readline()
+                if not line:
+                    raise ConnectionError("The server closed the connection.")
+                message = json.loads(line)
+                kind = message["type"]
+                if kind == "round":
+                    self.rounds += 1
+                    await self.vote_round(writer, message)
+                elif kind == "ack":
+                    sent = self._sent.pop(message.get("feature"), None)
+                    if sent is not None:
+                        self.latencies.append(time.perf_counter() - sent)
+                elif kind == "error":
+                    raise RuntimeError(f"{self.player}: {message['message']}")
+                elif kind == "finished":
+                    self.estimations = message["estimations"]
+                    return
+        finally:
+            writer.close()
+
+    async def vote_round(self, writer, message):
+        """
+        @brief Cast a vote on every feature of a round.
+
+        @param writer The stream writer of the connection.
+        @param message The round message.
+
+        @return void
+        """
+        if self.ballot:
+            votes = {feature: await self.choose_vote(feature, message["round"]) for feature in message["features"]}
+            # Ballot acknowledgements carry no feature
+            self._sent[None] = time.perf_counter()
+            writer.write((json.dumps({"type": "ballot", "votes": votes}) + "\n").encode("utf-8"))
+            self.votes_cast += len(votes)
+        else:
+            for feature in message["features"]:
+                vote = await self.choose_vote(feature, message["round"])
+                self._sent[feature] = time.perf_counter()
+                writer.write((json.dumps({"type": "vote", "feature": feature, "vote": vote}) + "\n").encode("utf-8"))
+                self.votes_cast += 1
+        await writer.drain()
+
+
+def percentile(values, fraction):
+    """
+    @brief Return the value at a given fraction of the sorted values, or None if there are none.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def simulate(host, port, count, prefix, agreement, seed, room=None, rooms=None, create=None, ballot=False):
+    """
+    @brief Run simulated voters concurrently and report throughput and latency.
+
+    @param host Server address.
+    @param port Server port.
+    @param count Number of simulated voters, per room when `rooms` is given.
+    @param prefix Prefix of the simulated player names.
+    @param agreement Probability that a voter picks the shared value of a feature in the first round.
+    @param seed Seed of the random generators.
+    @param room Room to join, or None for a single-room server.
+    @param rooms Number of rooms to simulate, named `room` followed by their number, or None.
+    @param create Configuration of the rooms, sent with the join messages so the first voter creates the room.
+    @param ballot If True, every voter sends the votes of a round in one ballot message.
+
+    @return dict: The report.
+    """
+    def make_strategy(index):
+        rng = random.Random(f"{seed}-{index}")
+
+        async def choose_vote(feature, round_number):
+            if rng.random() < 1 - (1 - agreement) * 0.5 ** (round_number - 1):
+                return AGREED_VALUES[zlib.crc32(f"{seed}-{feature}".encode("utf-8")) % len(AGREED_VALUES)]
+            return rng.choice(CARD_VALUES)
+        return choose_vote
+
+    if rooms:
+        room_names = [f"{room or 'room'}{number}" for number in range(rooms)]
+    else:
+        room_names = [room]
+    clients = []
+    for room_name in room_names:
+        join_fields = {}
+        if room_name is not None:
+            join_fields["room"] = room_name
+            if create is not None:
+                join_fields["create"] = dict(create, expect=count)
+        clients += [VoterClient(f"{prefix}{index}", make_strategy(index), join_fields, ballot) for index in range(count)]
+    start = time.perf_counter()
+    await asyncio.gather(*(client.run(host, port) for client in clients))
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for client in clients for latency in client.latencies]
+    votes = sum(client.votes_cast for client in clients)
+    return {
+        "rooms": len(room_names),
+        "voters": len(clients),
+        "rounds": max(client.rounds for client in clients),
+        "votes": votes,
+        "seconds": elapsed,
+        "votes_per_second": votes / elapsed if elapsed else None,
+        "ack_latency_p50": percentile(latencies, 0.50),
+        "ack_latency_p95": percentile(latencies, 0.95),
+        "ack_latency_p99": percentile(latencies, 0.99),
+    }
+
+
+async def interactive(host, port, player, room=None):
+    """
+    @brief Join as one player and read the votes from standard input.
+
+    @return dict: The final estimations.
+    """
+    async def choose_vote(feature, round_number):
+        return (await asyncio.to_thread(input, f"[round {round_number}] Vote for {feature}: ")).strip()
+
+    client = VoterClient(player, choose_vote, {"room": room} if room is not None else None)
+    await client.run(host, port)
+    return client.estimations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vote on a Planning Poker server.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--player", help="Join as this player and vote interactively.")
+    group.add_argument("--simulate", type=int, metavar="N", help="Run N simulated voters.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--prefix", default="voter", help="Name prefix of simulated voters.")
+    parser.add_argument("--agreement", type=float, default=0.9, help="Probability that a simulated voter agrees in the first round.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--room", help="Room to join on a multi-room server; with --rooms, prefix of the room names.")
+    parser.add_argument("--rooms", type=int, help="Number of rooms of simulated voters on a multi-room server.")
+    parser.add_argument("--features", help="Backlog file of the rooms created by simulated voters.")
+    parser.add_argument("--rule", default="Average", help="Rule of the rooms created by simulated voters.")
+    parser.add_argument("--ballot", action="store_true", help="Send the votes of each round in one ballot message.")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.simulate:
+            create = None
+            if args.features:
+                create = {"features": import_backlog(args.features), "rule": args.rule}
+            result = asyncio.run(simulate(args.host, args.port, args.simulate, args.prefix, args.agreement, args.seed,
+                                          args.room, args.rooms, create, args.ballot))
+        else:
+            result = asyncio.run(interactive(args.host, args.port, args.player, args.room))
+    except (OSError, ValueError, ConnectionError, RuntimeError) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 2
+    json.dump(result, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
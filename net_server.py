@@ -0,0 +1,256 @@
+# net_server.py
+"""
+@file net_server.py
+@brief Asyncio server letting every player vote from their own client at the same time.
+
+@details
+The server wraps a headless PlanningPokerSession in a VotingRoom. Clients connect over TCP and exchange newline-delimited JSON
+messages. Every player votes on every feature of the current round concurrently, in any order; votes go straight
+to `PlanningPokerSession.record_vote`, so the same rule classes keep their running state, and the round is
+evaluated as soon as its last vote arrives. The next round (only the features that did not converge) or the final
+estimations are then broadcast to every client.
+
+Client messages:
+- `{"type": "join", "player": name}`: must be the first message.
+- `{"type": "vote", "feature": feature, "vote": value}`
+- `{"type": "ballot", "votes": {feature: value, ...}}`: votes on several features at once.
+
+Server messages:
+- `{"type": "welcome", "player": name, "rule": rule}`
+- `{"type": "round", "round": number, "features": [...]}`: a round starts.
+- `{"type": "ack", "feature": feature, "status": status}`: a vote was recorded.
+- `{"type": "ack", "statuses": {feature: status, ...}}`: a ballot was recorded.
+- `{"type": "finished", "estimations": {...}}`: the session is over.
+- `{"type": "error", "message": message}`
+
+@code
+python net_server.py --expect 12 --features backlog.json --rule Average --port 8765
+@endcode
+"""
+import argparse
+import asyncio
+import json
+import sqlite3
+import sys
+
+from session import PlanningPokerSession, RULES
+from backlog_import import import_backlog
+from voting_room import VotingRoom
+from history import EstimationHistory
+from metrics import METRICS
+
+# Longest message line accepted, such as a round of thousands of features or a ballot voting on all of them
+STREAM_LIMIT = 1 << 24
+
+
+def encode(message):
+    """
+    @brief Encode a protocol message as one JSON line.
+    """
+    return (json.dumps(message) + "\n").encode("utf-8")
+
+
+class VotingServer:
+    """
+    @brief Planning Poker session served to concurrent network clients.
+
+    @details
+    The protocol itself is implemented by a VotingRoom; this class only moves its messages over the client streams.
+    Everything runs on one asyncio event loop, so the session is only ever touched from one thread.
+
+    @par Attributes:
+    - room: The VotingRoom of the served session.
+    - finished: asyncio.Event set when the session is finished.
+    """
+    def __init__(self, session, expected_players=None):
+        """
+        @brief Constructor for the VotingServer class.
+
+        @param session A PlanningPokerSession with features and a rule, and players unless `expected_players` is given.
+        @param expected_players Number of players registering on join, or None to use the session's players.
+        """
+        self.room = VotingRoom(session, expected_players, on_round_closed=self.report_round)
+        self.finished = asyncio.Event()
+        self._handlers = set()
+
+    @property
+    def session(self):
+        """
+        @brief The served PlanningPokerSession.
+        """
+        return self.room.session
+
+    async def handle_client(self, reader, writer):
+        """
+        @brief Serve one client connection until it disconnects.
+
+        @param reader The stream reader of the connection.
+        @param writer The stream writer of the connection.
+
+        @return void
+        """
+        player = None
+        self._handlers.add(asyncio.current_task())
+        try:
+            player = await self._handshake(reader, writer)
+            if player is None:
+                return
+            while not reader.at_eof():
+                line = await reader.readline()
+                if not line:
+                    break
+                await self.handle_message(player, writer, line)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError:
+            # readline raises ValueError for a line longer than STREAM_LIMIT
+            writer.write(encode({"type": "error", "message": "Message too long."}))
+        finally:
+            if player is not None:
+                self.room.leave(player, writer)
+            writer.close()
+            self._handlers.discard(asyncio.current_task())
+
+    async def shutdown(self):
+        """
+        @brief Disconnect every client and wait for their handlers to return.
+
+        @return void
+        """
+        for writer in list(self.room.clients.values()):
+            writer.close()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+
+    async def _handshake(self, reader, writer):
+        line = await reader.readline()
+        try:
+            message = json.loads(line)
+            if message.get("type") != "join":
+                raise ValueError("Expected a join message.")
+            player = str(message["player"]).strip()
+            outbox = self.room.join(writer, player)
+        except (KeyError, TypeError, AttributeError):
+            await self.send(writer, {"type": "error", "message": "Expected a join message."})
+            return None
+        except ValueError as error:
+            await self.send(writer, {"type": "error", "message": str(error)})
+            return None
+        await self.deliver(outbox)
+        return player
+
+    async def handle_message(self, player, writer, line):
+        """
+        @brief Handle one message of a joined player.
+
+        @param player The player who sent the message.
+        @param writer The stream writer of the player.
+        @param line The raw message line.
+
+        @return void
+        """
+        try:
+            outbox = self.room.handle(player, json.loads(line))
+        except ValueError as error:
+            await self.send(writer, {"type": "error", "message": str(error)})
+            return
+        await self.deliver(outbox)
+        if self.room.finished:
+            self.finished.set()
+
+    def report_round(self, round_number, elapsed, revote_features):
+        """
+        @brief Log the evaluation of a round.
+
+        @return void
+        """
+        print(f"Round {round_number} closed in {elapsed:.3f} s, {len(revote_features)} features to re-vote", file=sys.stderr)
+
+    async def send(self, writer, message):
+        """
+        @brief Send a message to one client.
+
+        @return void
+        """
+        writer.write(encode(message))
+        await writer.drain()
+
+    async def deliver(self, outbox):
+        """
+        @brief Send the messages of a room outbox, draining the clients concurrently.
+
+        @param outbox List of `(writers, message)` pairs.
+
+        @return void
+        """
+        writers = set()
+        for targets, message in outbox:
+            data = encode(message)
+            for writer in targets:
+                writer.write(data)
+            writers.update(targets)
+        await asyncio.gather(*(writer.drain() for writer in writers), return_exceptions=True)
+
+
+async def serve(server, host, port):
+    """
+    @brief Accept clients until the session is finished.
+
+    @param server The VotingServer.
+    @param host Address to listen on.
+    @param port Port to listen on.
+
+    @return void
+    """
+    listener = await asyncio.start_server(server.handle_client, host, port, limit=STREAM_LIMIT)
+    print(f"Listening on {host}:{port}", file=sys.stderr)
+    async with listener:
+        await server.finished.wait()
+        await server.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a Planning Poker session to networked clients.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--players", help="Comma-separated names of the players allowed to join.")
+    group.add_argument("--expect", type=int, help="Number of players registering as they join.")
+    parser.add_argument("--features", required=True, help="Backlog file: JSON array, JSON Lines or CSV.")
+    parser.add_argument("--rule", required=True, choices=RULES.choices())
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--estimations", help="Write the difficulty estimations to this JSON file at the end.")
+    parser.add_argument("--history", help="Archive the rounds and estimates in this SQLite history database.")
+    parser.add_argument("--metrics-port", type=int,
+                        help="Serve the timing histograms at http://HOST:PORT/metrics.")
+    args = parser.parse_args(argv)
+
+    session = PlanningPokerSession()
+    history = None
+    try:
+        session.load_features(import_backlog(args.features))
+        session.set_rule(args.rule)
+        if args.history:
+            history = EstimationHistory(args.history)
+            history.attach(session)
+        if args.players:
+            session.set_players(args.players.split(','))
+            session.start()
+        if args.metrics_port is not None:
+            METRICS.serve_http(args.host, args.metrics_port)
+    except (OSError, ValueError, sqlite3.Error) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 2
+
+    async def run():
+        server = VotingServer(session, args.expect)
+        await serve(server, args.host, args.port)
+
+    asyncio.run(run())
+    if history is not None:
+        history.close()
+    if args.estimations:
+        session.save_difficulty_estimations(args.estimations)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
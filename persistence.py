@@ -0,0 +1,246 @@
+# persistence.py
+import contextlib
+import json
+import os
+import queue
+import stat
+import sys
+import tempfile
+import threading
+import traceback
+
+from metrics import METRICS
+
+# Read once at import: os.umask can only be read by setting it, which is not safe once threads run
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def write_json_atomic(file_path, data):
+    """
+    @brief Write JSON data to a file atomically.
+
+    The data is written to a temporary file in the same directory, forced to disk and renamed over the target,
+    so readers and crashes only ever see the previous or the new complete file.
+
+    @param file_path Path of the file to write.
+    @param data JSON-compatible data.
+
+    @return void
+    """
+    _write_atomic(file_path, lambda file: json.dump(data, file), ".json")
+
+
+def write_text_atomic(file_path, text):
+    """
+    @brief Write text to a file atomically, like `write_json_atomic`.
+
+    @param file_path Path of the file to write.
+    @param text The text.
+
+    @return void
+    """
+    _write_atomic(file_path, lambda file: file.write(text), ".txt")
+
+
+@contextlib.contextmanager
+def atomic_path(file_path, suffix=""):
+    """
+    @brief Context manager giving a temporary path renamed over a file when the block succeeds.
+
+    Writers that open the file themselves, like streaming exporters, write to the temporary path; the target is
+    only replaced once the block completes, and the temporary file is removed if it fails. The new file keeps the
+    permissions of the file it replaces, or gets the default permissions of a new file.
+
+    @code
+    with atomic_path("results.parquet", ".parquet") as temp_path:
+        write_parquet(temp_path)
+    @endcode
+
+    @param file_path Path of the file to write.
+    @param suffix Suffix of the temporary file.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=suffix)
+    os.close(descriptor)
+    try:
+        yield temp_path
+        try:
+            mode = stat.S_IMODE(os.stat(file_path).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        # mkstemp creates the file readable by its owner only
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _write_atomic(file_path, write, suffix):
+    with atomic_path(file_path, suffix) as temp_path:
+        with open(temp_path, "w", encoding="utf-8") as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+
+
+class PersistenceWorker:
+    """
+    @file persistence.py
+    @brief Background thread serializing and writing Planning Poker files.
+
+    @details
+    The PersistenceWorker class moves JSON serialization and disk writes off the Tkinter main thread.
+    Jobs go through a bounded queue and are coalesced per file: saving a file that already has a pending save only
+    replaces the data to write, so bursts of autosaves cost one write. Files are written atomically through a
+    temporary file and a rename.
+
+    Results are not reported from the worker thread, since Tkinter is not thread-safe. The GUI calls `poll_results`
+    from an `after()` callback and runs the completion callbacks on the main thread.
+
+    @note
+    Callbacks receive `(result, error)`: `error` is None on success, otherwise the exception message.
+    For loads, `result` is the decoded JSON data, and for reads the value returned by the reader.
+
+    @see
+    For additional information on how to use this class, refer to the documentation of its methods.
+    """
+    def __init__(self, max_pending=16):
+        """
+        @brief Constructor for the PersistenceWorker class.
+
+        @param max_pending Maximum number of distinct files waiting to be processed.
+        """
+        self._jobs = queue.Queue(maxsize=max_pending)
+        self._results = queue.Queue()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="persistence", daemon=True)
+        self._thread.start()
+
+    def submit_save(self, file_path, data, callback=None):
+        """
+        @brief Schedule writing JSON data to a file.
+
+        @param file_path Path of the file to write.
+        @param data JSON-compatible data. It must not be modified afterwards.
+        @param callback Called on the main thread by `poll_results` once the file is written or failed.
+
+        @return bool: False if the queue is full and the save was dropped.
+        """
+        return self._submit(("save", file_path), data, callback)
+
+    def submit_write(self, file_path, write, callback=None):
+        """
+        @brief Schedule a writer producing a file itself, such as an export.
+
+        @param file_path Path of the file to write.
+        @param write Function called as `write(file_path)` on the worker thread. It must not touch Tkinter or state
+        the main thread changes.
+        @param callback Called on the main thread by `poll_results` once the file is written or failed.
+
+        @return bool: False if the queue is full and the write was dropped.
+        """
+        return self._submit(("write", file_path), write, callback)
+
+    def submit_load(self, file_path, callback):
+        """
+        @brief Schedule reading and decoding a JSON file.
+
+        @param file_path Path of the file to read.
+        @param callback Called on the main thread by `poll_results` with the decoded data.
+
+        @return bool: False if the queue is full and the load was dropped.
+        """
+        return self._submit(("load", file_path), None, callback)
+
+    def submit_read(self, file_path, read, callback):
+        """
+        @brief Schedule a reader computing a result from a file, such as an index of the estimation history.
+
+        @param file_path Path of the file to read.
+        @param read Function called as `read(file_path)` on the worker thread. It must not touch Tkinter or state
+        the main thread changes.
+        @param callback Called on the main thread by `poll_results` with the value returned by `read`.
+
+        @return bool: False if the queue is full and the read was dropped.
+        """
+        return self._submit(("read", file_path), read, callback)
+
+    def _submit(self, key, data, callback):
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                # Coalesce with the job still waiting in the queue
+                pending["data"] = data
+                pending["callbacks"].append(callback)
+                return True
+            try:
+                self._jobs.put_nowait(key)
+            except queue.Full:
+                return False
+            self._pending[key] = {"data": data, "callbacks": [callback]}
+            return True
+
+    def _run(self):
+        while True:
+            key = self._jobs.get()
+            if key is None:
+                return
+            with self._lock:
+                job = self._pending.pop(key)
+
+            kind, file_path = key
+            result, error = None, None
+            try:
+                with METRICS.time("planning_poker_file_seconds", operation=kind):
+                    if kind == "save":
+                        write_json_atomic(file_path, job["data"])
+                    elif kind == "write":
+                        job["data"](file_path)
+                    elif kind == "read":
+                        result = job["data"](file_path)
+                    else:
+                        with open(file_path, "r", encoding="utf-8") as file:
+                            result = json.load(file)
+            except (OSError, TypeError, ValueError) as exception:
+                error = str(exception)
+            except Exception as exception:
+                # Keep serving the next jobs, or every later save would be lost
+                traceback.print_exc(file=sys.stderr)
+                error = f"Unexpected error: {exception!r}"
+
+            for callback in job["callbacks"]:
+                if callback is not None:
+                    self._results.put((callback, result, error))
+
+    def poll_results(self):
+        """
+        @brief Run the callbacks of the finished jobs. Call this from the main thread.
+
+        @return int: The number of callbacks run.
+        """
+        count = 0
+        while True:
+            try:
+                callback, result, error = self._results.get_nowait()
+            except queue.Empty:
+                return count
+            callback(result, error)
+            count += 1
+
+    def stop(self, timeout=5.0):
+        """
+        @brief Finish the pending jobs and stop the worker thread.
+
+        @param timeout Maximum time to wait for the pending jobs, in seconds.
+
+        @return void
+        """
+        try:
+            self._jobs.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
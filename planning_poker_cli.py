@@ -0,0 +1,160 @@
+# planning_poker_cli.py
+"""
+@file planning_poker_cli.py
+@brief Command-line entry point running Planning Poker sessions from files, without a display.
+
+@details
+The players, the backlog and the votes are read from files and fed to a headless PlanningPokerSession.
+Votes are cast in file order: whenever a round is complete it is evaluated, and the next votes of the file
+go to the re-vote round of the features that did not converge. A summary of the session is printed as JSON.
+
+Votes files are either CSV with a `player,feature,vote` header, or JSON Lines with one
+`{"player": ..., "feature": ..., "vote": ...}` object per line.
+
+@code
+python planning_poker_cli.py --players "Alice,Bob" --features backlog.json --rule Average --votes votes.csv --estimations out.json
+@endcode
+
+With `--history`, every closed round and the estimates of the features that converged are also archived in a
+SQLite database (see history.py). `--export` streams per-feature results as CSV, JSON Lines, columnar chunks or
+Parquet (see exporter.py). `--metrics` writes the timing histograms of the run in the Prometheus text
+format (see metrics.py).
+"""
+import argparse
+import csv
+import json
+import sqlite3
+import sys
+
+from session import PlanningPokerSession, RULES
+from backlog_import import import_backlog
+from history import EstimationHistory
+from metrics import METRICS
+from exporter import FORMATS, export_session
+
+
+def read_players(players_arg):
+    """
+    @brief Read player names from a comma-separated list or from a file with one name per line.
+
+    @param players_arg The `--players` argument.
+
+    @return list: The player names.
+    """
+    try:
+        with open(players_arg, "r") as file:
+            return [line.strip() for line in file if line.strip()]
+    except OSError:
+        return [name.strip() for name in players_arg.split(',')]
+
+
+def read_votes(votes_path):
+    """
+    @brief Iterate over the `(player, feature, vote)` rows of a CSV or JSON Lines votes file.
+
+    @param votes_path Path of the votes file.
+
+    @return generator: The votes, in file order.
+    """
+    with open(votes_path, "r", newline="") as file:
+        if votes_path.endswith((".jsonl", ".ndjson")):
+            for line in file:
+                if line.strip():
+                    row = json.loads(line)
+                    yield row["player"], row["feature"], str(row["vote"])
+        else:
+            for row in csv.DictReader(file):
+                yield row["player"], row["feature"], row["vote"]
+
+
+def run_session(session, votes):
+    """
+    @brief Cast the given votes, evaluating each round as soon as it is complete.
+
+    @param session A started PlanningPokerSession.
+    @param votes Iterable of `(player, feature, vote)` tuples.
+
+    @return list: The features sent back to re-vote after each evaluated round.
+    """
+    rounds = []
+    # A resumed session may already hold every vote of its round
+    if not session.finished and session.is_round_complete():
+        rounds.append(session.evaluate())
+    for player, feature, vote in votes:
+        if session.finished:
+            break
+        session.record_vote(player, feature, vote)
+        if session.is_round_complete():
+            rounds.append(session.evaluate())
+    return rounds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a Planning Poker session from files.")
+    parser.add_argument("--players", help="Comma-separated player names, or a file with one name per line.")
+    parser.add_argument("--features", help="Backlog file: JSON array, JSON Lines or CSV.")
+    parser.add_argument("--rule", choices=RULES.choices(),
+                        help="Voting rule.")
+    parser.add_argument("--load", help="Progress file to resume instead of starting a new session.")
+    parser.add_argument("--votes", required=True, help="CSV or JSON Lines file of votes.")
+    parser.add_argument("--save", help="Write the progress to this JSON file.")
+    parser.add_argument("--estimations", help="Write the difficulty estimations to this JSON file.")
+    parser.add_argument("--history", help="Archive the rounds and estimates in this SQLite history database.")
+    parser.add_argument("--export", help="Stream the results of every feature to this file (see exporter.py).")
+    parser.add_argument("--export-format", choices=FORMATS,
+                        help="Format of --export; guessed from its extension by default.")
+    parser.add_argument("--metrics", help="Write the timing histograms to this file, in the Prometheus text format.")
+    args = parser.parse_args(argv)
+
+    session = PlanningPokerSession()
+    history = None
+    try:
+        if args.load:
+            session.load(args.load)
+        else:
+            if not (args.players and args.features and args.rule):
+                parser.error("--players, --features and --rule are required unless --load is given")
+            session.set_players(read_players(args.players))
+            session.load_features(import_backlog(args.features))
+            session.set_rule(args.rule)
+        if args.history:
+            history = EstimationHistory(args.history)
+            history.attach(session)
+        if not args.load:
+            session.start()
+
+        rounds = run_session(session, read_votes(args.votes))
+    except (OSError, ValueError, KeyError, sqlite3.Error) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 2
+    finally:
+        if history is not None:
+            history.close()
+
+    if args.save:
+        session.save(args.save)
+    if args.estimations and session.finished:
+        session.save_difficulty_estimations(args.estimations)
+    if args.export:
+        try:
+            export_session(session, args.export, args.export_format)
+        except (OSError, ValueError) as error:
+            print(f"Error: {error}", file=sys.stderr)
+            return 2
+    if args.metrics:
+        METRICS.write_prometheus(args.metrics)
+
+    summary = {
+        "rule": session.rule_name,
+        "rounds": len(rounds),
+        "finished": session.finished,
+        "revotes": rounds,
+        "pending_features": session.round_features,
+    }
+    json.dump(summary, sys.stdout, indent=2)
+    print()
+    return 0 if session.finished else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
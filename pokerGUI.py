@@ -19,9 +19,11 @@ maintainable codebase.
 The GUI leverages the Observer pattern to efficiently handle updates in the voting process. The Model notifies the
 View of any changes in the data (e.g., votes), ensuring real-time updates in the user interface.
 
-The Strategy pattern is employed in the implementation of voting rules. The ability to switch between Strict and
-Average rules is achieved by encapsulating each rule in a separate class (StrictRule and AverageRule). This allows
-for interchangeable rule implementations without modifying the core application logic.
+The Strategy pattern is employed in the implementation of voting rules. The ability to switch between Strict,
+Average, Median, Absolute Majority and Mode rules is achieved by encapsulating each rule in a separate class
+(StrictRule, AverageRule, MedianRule, MajorityRule and ModeRule). This allows for interchangeable rule implementations
+without modifying the core application logic. All rules read the same one-pass per-feature statistics
+(stats_kernel.py), and the rule registry (rule_registry.py) only imports a rule when it is selected.
 
 @section diagrams_explanation Diagrams Explanation
 
@@ -56,14 +58,44 @@ For detailed documentation on each class and their methods, refer to the respect
 
 
 
+import time
+
+# Start of the imports, reported by --profile-startup
+IMPORT_START = time.perf_counter()
+
+import os
+import sys
 import tkinter as tk
-from tkinter import simpledialog, filedialog, messagebox
+from tkinter import messagebox
 from tkinter import ttk
-import json
-from PIL import Image, ImageTk
 import tkinter.font as tkFont
-from strict_rule import StrictRule
-from average_rule import AverageRule
+from asset_cache import image_cache
+from session import PlanningPokerSession, RULES
+from backlog_import import BacklogImporter
+from virtual_list import VirtualList
+from journal import SessionJournal
+from persistence import PersistenceWorker, write_json_atomic, write_text_atomic
+from metrics import METRICS, SessionProfiler
+from event_bus import TkBatcher, VoteCast, FeatureConverged, FeatureDiverged, SessionStarted, RoundClosed
+
+IMPORT_END = time.perf_counter()
+
+CARD_IMAGE_SIZE = (100, 100)
+LOGO_PATH = "1.png"
+LOGO_SIZE = (100, 100)
+JOURNAL_PATH = "planning_poker_session.journal"
+AUTOSAVE_PATH = "planning_poker_autosave.json"
+AUTOSAVE_INTERVAL_MS = 60000
+AUTOSAVE_EVERY_VOTES = 25
+PERSISTENCE_POLL_MS = 100
+HISTORY_DAYS = 365
+HISTORY_ROWS = 500
+SUGGESTIONS = 3
+# Delay after the last resize of the voting screen before its layout is recomputed
+VOTING_LAYOUT_DELAY_MS = 100
+# Modules the first window does not need; --profile-startup reports the ones imported before the first paint
+DEFERRED_MODULES = ("PIL", "sqlite3", "strict_rule", "average_rule", "median_rule", "mode_rule", "majority_rule",
+                    "tkinter.filedialog", "tkinter.simpledialog")
 
 class PlanningPokerGUI:
     """
@@ -71,7 +103,8 @@ class PlanningPokerGUI:
 
     @details
     This class represents the graphical user interface (GUI) for a Planning Poker application.
-    It includes attributes to manage the main window, players, features, votes, rules, and the voting process.
+    It includes attributes to manage the main window and the voting screen, and drives a headless
+    PlanningPokerSession that holds the players, features, votes, rules and the voting cursor.
 
     @note
     To use this class, create an instance and call the `run` method to start the Tkinter main loop.
@@ -89,17 +122,37 @@ class PlanningPokerGUI:
 
     @par Attributes:
     - root: The main Tkinter window.
-    - players: List of player names.
-    - features: List of features (backlog).
-    - votes: Dictionary to store votes.
-    - rules: Rules object for voting validation.
-    - voting_window: Tkinter window for the voting process.
-    - current_player_index: Index to keep track of the current player.
-    - current_feature_index: Index to keep track of the current feature.
+    - session: PlanningPokerSession holding players, features, votes, rules and the voting cursor.
+    - voting_window: Tkinter window for the voting process, built once and hidden between sessions.
+    - vote_text: Tkinter Text of the voting screen holding the vote being entered.
+    - suggestion_label: Tkinter Label of the voting screen listing the estimates of similar past features.
+    - voting_layout_job: Pending `after` job recomputing the layout of the voting screen, or None.
+    - feature_status_text: Tkinter StringVar showing the live status of the last voted feature.
+    - vote_label_text: Tkinter StringVar announcing the current turn on the voting screen.
     - left_frame: Tkinter Frame for the left side of the main window.
     - main_frame: Tkinter Frame for the main content.
     - selected_rule_label: Tkinter Label to display the selected rules.
     - top_labels: List to store top labels for display.
+    - persistence: PersistenceWorker writing and reading files off the main thread.
+    - votes_since_autosave: Number of votes recorded since the last autosave.
+    - status_text: Tkinter StringVar of the status bar reporting saves and loads.
+    - players_list: Virtualized list of the players.
+    - features_list: Virtualized list of the features and their status.
+    - ballot_launcher: Tkinter window listing the players in batch voting.
+    - ballot_buttons: Mapping of player to the launcher button opening their ballot.
+    - ballot_windows: Mapping of player to their open ballot window.
+    - history: EstimationHistory archiving every closed round, opened after the window is shown; None until then
+      or if the database cannot be opened.
+    - history_recorder: SessionRecorder following the current session.
+    - feature_index: FeatureIndex of past features, built from the history by the persistence worker after the
+      window is shown; None until then.
+    - suggestion_text: Tkinter StringVar listing the estimates of past features similar to the current one.
+    - logo_label: Tkinter Label of the menu logo, filled once the window is shown.
+    - startup_marks: List of `(step, time.perf_counter())` pairs recorded while the application starts.
+    - modules_at_first_paint: Names of the modules imported when the main window was first drawn.
+    - on_startup_complete: Optional function called once the deferred startup work is done.
+    - profiler: SessionProfiler toggled from the menu.
+    - menu_buttons: Mapping of the initial text of each menu button to the button.
     """
     def __init__(self):
         """
@@ -107,19 +160,27 @@ class PlanningPokerGUI:
 
         Initializes the main Tkinter window and sets up the GUI elements.
         """
+        self.startup_marks = [("imports", IMPORT_END)]
+        self.modules_at_first_paint = None
+        self.on_startup_complete = None
         self.root = tk.Tk()
         self.root.title("Planning Poker")
+        # Images and the history are loaded once the window is shown
+        self.root.bind("<Expose>", self.on_first_paint, add="+")
 
         self.root.minsize(800, 500)
         self.root.after(100, self.set_initial_size)
 
-        self.players = []
-        self.features = []
-        self.votes = {}
-        self.rules = None
+        self.session = PlanningPokerSession()
         self.voting_window = None
-        self.current_player_index = 0
-        self.current_feature_index = 0
+        self.vote_text = None
+        self.suggestion_label = None
+        self.voting_layout_job = None
+        self.feature_status_text = None
+        self.vote_label_text = None
+        self.ballot_launcher = None
+        self.ballot_buttons = {}
+        self.ballot_windows = {}
 
         self.left_frame = tk.Frame(self.root, width=250, bg='teal')
         self.left_frame.pack_propagate(False)
@@ -128,6 +189,24 @@ class PlanningPokerGUI:
         self.main_frame = tk.Frame(self.root)
         self.main_frame.pack(side='left', fill='both', expand=True)
 
+        # Status bar reporting background saves and loads
+        self.status_text = tk.StringVar()
+        status_label = tk.Label(self.main_frame, textvariable=self.status_text, anchor='w')
+        status_label.pack(side='bottom', fill='x')
+
+        # Background persistence with periodic autosave
+        self.persistence = PersistenceWorker()
+        self.votes_since_autosave = 0
+        self.root.after(PERSISTENCE_POLL_MS, self.poll_persistence)
+        self.root.after(AUTOSAVE_INTERVAL_MS, self.autosave_tick)
+
+        # Every closed round is archived in the estimation history, opened by load_deferred
+        self.history = None
+        self.history_recorder = None
+        self.profiler = SessionProfiler()
+        self.feature_index = None
+        self.suggestion_text = None
+
         self.selected_rule_label = tk.Label(self.main_frame, text="Selected Rules: None")
 
         # Divide the right side into two parts (40%, 60%)
@@ -157,9 +236,14 @@ class PlanningPokerGUI:
         # Append labels to the list
         self.top_labels.extend([label1, label2,label3])
 
-        # Create a label to display players
-        self.players_label = tk.Label(right_frame)
+        # Create scrollable lists that only render their visible rows
+        self.players_list = VirtualList(frame1, self.player_row_text, width=160)
+        self.players_list.pack(fill='both', expand=True)
+        self.features_list = VirtualList(frame3, self.feature_row_text, width=260)
+        self.features_list.pack(fill='both', expand=True)
         self.create_menu()
+        self.subscribe_session()
+        self.startup_marks.append(("window built", time.perf_counter()))
 
 
     def create_menu(self):
@@ -174,32 +258,138 @@ class PlanningPokerGUI:
         font_style = tkFont.Font(family="Comic Sans MS", size=16, weight="bold", slant="italic")
         tk.Label(menu_frame, text="Planning Poker", font=font_style, bg='teal', fg='white').grid(row=0, column=0, pady=10)
 
-        img = Image.open("1.png")
-        img = img.resize((100, 100))
-        img = ImageTk.PhotoImage(img)
-        image_label = tk.Label(menu_frame, image=img, bg='teal')
-        image_label.image = img
-        image_label.grid(row=1, column=0, pady=5)
+        # Blank placeholder of the logo size, replaced by the logo once the window is shown
+        placeholder = tk.PhotoImage(width=LOGO_SIZE[0], height=LOGO_SIZE[1])
+        self.logo_label = tk.Label(menu_frame, image=placeholder, bg='teal')
+        self.logo_label.image = placeholder
+        self.logo_label.grid(row=1, column=0, pady=5)
 
         buttons = [
             ("Enter Players", lambda: self.enter_players_count(self.root)),
             ("Choose Rules", self.choose_rules),
             ("Enter Features", self.enter_features),
             ("Start Voting", self.start_voting),
+            ("Batch Voting", self.start_batch_voting),
             ("Save Progress", self.save_progress),
             ("Load Progress", self.load_progress),
-            ("Exit", self.root.destroy)
+            ("Resume Session", self.resume_session),
+            ("Estimation History", self.show_history),
+            ("Export Results", self.export_results),
+            ("Export Metrics", self.export_metrics),
+            ("Start Profiling", self.toggle_profiling),
+            ("Exit", self.exit)
         ]
 
+        # One style shared by every menu button
+        style = ttk.Style(self.root)
+        style.configure("Menu.TButton", font=("Helvetica", 12), foreground='black', background='#008080')
+        style.map("Menu.TButton",
+                  foreground=[('pressed', 'black'), ('active', 'black')],
+                  background=[('pressed', '#008080'), ('active', '#008080')])
+
+        self.menu_buttons = {}
         for i, (text, command) in enumerate(buttons, start=2):
-            style = ttk.Style()
-            style.configure(f"TButton{i}.TButton", font=("Helvetica", 12), foreground='black', background='#008080')
-            hover_style = ttk.Style()
-            hover_style.map(f"TButton{i}.TButton",
-                            foreground=[('pressed', 'black'), ('active', 'black')],
-                            background=[('pressed', '#008080'), ('active', '#008080')])
+            button = ttk.Button(menu_frame, text=text, command=command, style="Menu.TButton")
+            button.grid(row=i, column=0, pady=5)
+            self.menu_buttons[text] = button
+
+
+    def on_first_paint(self, event):
+        """
+        @brief Schedule the deferred startup work once the main window is first drawn.
+
+        @param event The Tkinter Expose event.
+
+        @return void
+        """
+        self.root.unbind("<Expose>")
+        self.startup_marks.append(("first paint", time.perf_counter()))
+        self.modules_at_first_paint = set(sys.modules)
+        self.root.after_idle(self.load_deferred)
+
+
+    def load_deferred(self):
+        """
+        @brief Load what the first window does not need: the estimation history, the logo and the card images.
+
+        Images are decoded one per idle callback, so the window stays responsive while they load, and the first
+        voting screen finds them in the image cache. The index of past features is built in the background.
+
+        @return void
+        """
+        import sqlite3
+        from history import EstimationHistory, HISTORY_PATH
+
+        try:
+            self.history = EstimationHistory(HISTORY_PATH)
+        except sqlite3.Error as error:
+            self.show_status(f"Estimation history disabled: {error}")
+        else:
+            self.history_recorder = self.history.attach(self.session)
+            self.build_feature_index()
+
+        logo = image_cache.get(LOGO_PATH, LOGO_SIZE)
+        self.logo_label.config(image=logo)
+        self.logo_label.image = logo
+        image_cache.preload(self.root, [card.image for card in self.session.deck.cards], CARD_IMAGE_SIZE,
+                            self.finish_startup)
+
+
+    def build_feature_index(self):
+        """
+        @brief Build the index of past features from the estimation history on the background persistence worker.
 
-            ttk.Button(menu_frame, text=text, command=command, style=f"TButton{i}.TButton").grid(row=i, column=0, pady=5)
+        The worker reads the history through its own connection, since a SQLite connection belongs to the thread
+        that opened it.
+
+        @return void
+        """
+        def read(path):
+            import sqlite3
+            from history import EstimationHistory
+            from similarity import FeatureIndex
+
+            try:
+                history = EstimationHistory(path)
+                try:
+                    return FeatureIndex.from_history(history)
+                finally:
+                    history.close()
+            except sqlite3.Error as error:
+                raise OSError(f"Could not read the estimation history: {error}") from None
+
+        if not self.persistence.submit_read(self.history.path, read, self.apply_feature_index):
+            self.show_status("Suggestions disabled: the background saves are busy.")
+
+
+    def apply_feature_index(self, feature_index, error):
+        """
+        @brief Start suggesting past estimates once the index built by the persistence worker is ready.
+
+        @param feature_index The FeatureIndex, or None on failure.
+        @param error Error message, or None on success.
+
+        @return void
+        """
+        if error is not None:
+            self.show_status(error)
+            return
+        self.feature_index = feature_index
+        self.feature_index.attach(self.session)
+        turn = self.session.current_turn()
+        if self.suggestion_text is not None and turn is not None:
+            self.suggestion_text.set(self.suggestions_text(turn[1]))
+
+
+    def finish_startup(self):
+        """
+        @brief Record the end of the deferred startup work.
+
+        @return void
+        """
+        self.startup_marks.append(("deferred assets", time.perf_counter()))
+        if self.on_startup_complete is not None:
+            self.on_startup_complete()
 
 
     def set_initial_size(self):
@@ -256,10 +446,10 @@ class PlanningPokerGUI:
         try:
             num_players = int(num_players)
             if num_players <= 0:
-                tk.messagebox.showwarning("Warning", "Number of players must be a positive integer.")
+                messagebox.showwarning("Warning", "Number of players must be a positive integer.")
                 return
         except ValueError:
-            tk.messagebox.showwarning("Warning", "Invalid input. Please enter a valid number.")
+            messagebox.showwarning("Warning", "Invalid input. Please enter a valid number.")
             return
 
         player_names_label = tk.Label(window, text=f"Enter {num_players} player names separated by commas:", bg='teal', fg='white')
@@ -290,31 +480,45 @@ class PlanningPokerGUI:
         window.destroy()
 
         if players_input is None:
-            tk.messagebox.showwarning("Warning", "No players entered.")
+            messagebox.showwarning("Warning", "No players entered.")
             return
 
         player_names = [name.strip() for name in players_input.split(',')]
 
         if len(player_names) != num_players:
-            tk.messagebox.showwarning("Warning", f"Entered {len(player_names)} players, but expected {num_players}. Please try again.")
+            messagebox.showwarning("Warning", f"Entered {len(player_names)} players, but expected {num_players}. Please try again.")
             return
 
-        self.players = player_names
+        try:
+            self.session.set_players(player_names)
+        except ValueError as error:
+            messagebox.showwarning("Warning", str(error))
+            return
         self.update_players_label()
 
 
     def update_players_label(self):
         """
-        @brief Update the label displaying the list of players.
+        @brief Update the list displaying the players.
 
-        This method updates the label that displays the list of players.
-        It generates a formatted text containing the player names and their corresponding indices, and updates the GUI accordingly.
+        This method updates the heading with the number of players and resizes the virtualized players list,
+        which only asks for the text of its visible rows.
 
         @return void
         """
-        players_text = "Players:\n" + "\n".join([f"Player {i}: {player_name}" for i, player_name in enumerate(self.players, start=1)])
-        self.players_label.config(text=players_text)
-        self.top_labels[0].config(text=f" {players_text}")
+        self.top_labels[0].config(text=f"Players ({len(self.session.players)})")
+        self.players_list.set_row_count(len(self.session.players))
+
+
+    def player_row_text(self, index):
+        """
+        @brief Return the text of a row of the players list.
+
+        @param index The index of the player.
+
+        @return str: The row text.
+        """
+        return f"Player {index + 1}: {self.session.players[index]}"
 
 
     def choose_rules(self):
@@ -336,7 +540,7 @@ class PlanningPokerGUI:
         instruction_label = tk.Label(rule_selection_window, text="Select planning poker rules:", bg='teal', fg='white')
         instruction_label.pack(pady=10)
 
-        rules_list = ["Strict (Unanimity)", "Average"]
+        rules_list = list(RULES)
         selected_rule_var = tk.StringVar(value=rules_list[0])
         rules_combobox = ttk.Combobox(rule_selection_window, values=rules_list, textvariable=selected_rule_var)
         rules_combobox.pack(pady=10)
@@ -360,10 +564,11 @@ class PlanningPokerGUI:
         """
         window.destroy()
 
-        if selected_rule == "Strict (Unanimity)":
-            self.rules = StrictRule()
-        elif selected_rule == "Average":
-            self.rules = AverageRule()
+        try:
+            self.session.set_rule(selected_rule)
+        except ValueError as error:
+            messagebox.showwarning("Warning", str(error))
+            return
 
         self.selected_rule_label.config(text=f"Selected Rule: {selected_rule}")
         self.top_labels[1].config(text=f"Selected Rule: {selected_rule}")
@@ -374,7 +579,7 @@ class PlanningPokerGUI:
         @brief Create a window for entering features in JSON format.
 
         This method creates a window for entering features (backlog) in JSON format. The window includes a label with instructions,
-        a text entry field for typing the features, and a confirmation button.
+        a text entry field for typing the features, a confirmation button and a button to import a backlog file.
         The entered features are then processed using the 'process_features_input' method.
 
         @return void
@@ -393,7 +598,81 @@ class PlanningPokerGUI:
 
         confirm_button = tk.Button(features_entry_window, text="Confirm", command=lambda: self.process_features_input(features_entry.get("1.0", tk.END), features_entry_window))
         confirm_button.pack(pady=10)
-        
+
+        import_button = tk.Button(features_entry_window, text="Import from file...", command=lambda: self.import_features_file(features_entry_window))
+        import_button.pack(pady=10)
+
+
+    def import_features_file(self, window):
+        """
+        @brief Import the backlog from a JSON, JSON Lines or CSV file.
+
+        This method prompts the user for a backlog file and imports it on a background thread.
+        A progress window shows how much of the file was read and how many features were found,
+        and is refreshed from the Tkinter main loop by 'poll_features_import'.
+
+        @param window Tkinter window for feature entry, closed once a file is chosen.
+
+        @return void
+        """
+        from tkinter import filedialog
+
+        file_path = filedialog.askopenfilename(filetypes=[("Backlog files", "*.json *.jsonl *.ndjson *.csv"), ("All files", "*.*")])
+        if not file_path:
+            return
+        window.destroy()
+
+        progress_window = tk.Toplevel(self.root)
+        progress_window.title("Importing Features")
+        progress_window.configure(bg='teal')
+        progress_window.resizable(width=False, height=False)
+
+        status_text = tk.StringVar(value="Reading backlog...")
+        tk.Label(progress_window, textvariable=status_text, bg='teal', fg='white').pack(padx=20, pady=10)
+        progress_bar = ttk.Progressbar(progress_window, length=300, maximum=1.0)
+        progress_bar.pack(padx=20, pady=10)
+
+        importer = BacklogImporter(file_path)
+        tk.Button(progress_window, text="Cancel", command=lambda: (importer.cancel(), progress_window.destroy())).pack(pady=10)
+        importer.start()
+        self.poll_features_import(importer, progress_window, progress_bar, status_text)
+
+
+    def poll_features_import(self, importer, progress_window, progress_bar, status_text):
+        """
+        @brief Move the features parsed by a background import into the GUI.
+
+        This method drains the importer for at most a few milliseconds, updates the progress window and
+        reschedules itself with 'after' until the import is done, so the main loop stays responsive.
+
+        @param importer The running BacklogImporter.
+        @param progress_window Tkinter window showing the progress.
+        @param progress_bar Progress bar of the window.
+        @param status_text Tkinter StringVar of the status label.
+
+        @return void
+        """
+        if not progress_window.winfo_exists():
+            return
+
+        importer.poll()
+        progress_bar["value"] = importer.progress
+        status_text.set(f"{len(importer.features)} features read, {importer.duplicates} duplicates skipped")
+
+        if not importer.done:
+            self.root.after(16, self.poll_features_import, importer, progress_window, progress_bar, status_text)
+            return
+
+        progress_window.destroy()
+        if importer.error:
+            messagebox.showerror("Error", f"Could not import features: {importer.error}")
+            return
+        try:
+            self.session.load_features(importer.features)
+        except ValueError as error:
+            messagebox.showwarning("Warning", str(error))
+            return
+        self.update_features_label()
 
 
     def process_features_input(self, features_input, window):
@@ -412,205 +691,559 @@ class PlanningPokerGUI:
         window.destroy()
 
         if not features_input.strip():
-            tk.messagebox.showwarning("Warning", "No features entered.")
+            messagebox.showwarning("Warning", "No features entered.")
             return
 
         try:
-            self.features = json.loads(features_input)
+            self.session.load_features_json(features_input)
             self.update_features_label()
-        except json.decoder.JSONDecodeError:
-            tk.messagebox.showerror("Error", "Invalid JSON format. Please enter features in correct JSON format.")
+        except ValueError as error:
+            messagebox.showerror("Error", str(error))
             return
 
 
-    def set_vote_result(self, player, result_entry, feature, label_text):
+    def start_voting(self):
         """
-        @brief Set the vote result for a player on a specific feature.
-    
-        This method takes the player, result entry, feature, and label text as input.
-        It collects and stores the vote result for the given player and feature.
-        After each vote, it checks if all votes are collected before evaluating.
-        It then updates the indices for the next set of widgets and clears the content of the text box.
-        If all features or votes are collected, it resets the corresponding indices and updates the label text accordingly.
-        If all votes are collected, it automatically submits the votes.
-    
-        @param player The player casting the vote.
-        @param result_entry The text entry field where the vote result is entered.
-        @param feature The feature for which the vote is being cast.
-        @param label_text The label text to be updated for the next set of widgets.
-    
+        @brief Start the voting process by creating a window for voting.
+
+        This method initiates the voting process, ensuring that players, features, and rules are entered.
+        It resets the vote store and the rule state, starts a first round over every feature and a new session journal,
+        then opens the voting screen.
+
         @return void
         """
-        result = result_entry.get("1.0", tk.END).strip()
-        self.votes[(player, feature)] = result
-    
-        # Check if all votes are collected before evaluating
-        if len(self.votes) == len(self.players) * len(self.features):
-            self.evaluate_votes()
-        else:
-            # Update indices for the next set of widgets
-            self.current_player_index += 1
-            if self.current_player_index == len(self.players):
-                self.current_player_index = 0
-                self.current_feature_index += 1
-    
-            # If all features have been voted on, reset indices
-            if self.current_feature_index == len(self.features):
-                self.current_feature_index = 0
-    
-            # Clear the content of the text box
-            result_entry.delete("1.0", tk.END)
-    
-            # Update the label for the next set of widgets
-            label_text.set(f"{self.players[self.current_player_index]}'s Vote for {self.features[self.current_feature_index]}: ")
-    
-            # If all votes are collected, automatically submit the votes
-            if len(self.votes) == len(self.players) * len(self.features):
-                self.submit_votes()
+        # Reset the vote store and the running rule state, and start the first round
+        with METRICS.time("planning_poker_gui_seconds", handler="start_voting"):
+            try:
+                self.session.start()
+            except ValueError as error:
+                error_message = str(error)
+            else:
+                error_message = None
+                self.start_journal()
+                self.open_voting_screen()
+        if error_message is not None:
+            messagebox.showwarning("Warning", error_message)
 
 
-    
-    
-    def start_voting(self):
+    @METRICS.timed("planning_poker_gui_seconds", handler="open_voting_screen")
+    def open_voting_screen(self):
         """
-        @brief Start the voting process by creating a window for voting.
+        @brief Show the voting screen on the current turn of the session.
 
-        This method initiates the voting process, ensuring that players, features, and rules are entered.
-        It resets the votes dictionary and indices, creates a new Toplevel window for voting, or updates the existing one.
-        The window includes labels for current voting information, text widget for voting, and buttons for submitting votes.
-        PNG images are used on buttons for different vote values.
+        The voting screen is built the first time it is opened (see `build_voting_screen`). Later rounds and sessions
+        reuse its widgets: only the vote text, the status line and the turn labels are updated.
 
         @return void
         """
-        if not self.players or not self.features or not self.rules:
-            tk.messagebox.showwarning("Warning", "Please enter players, features, and choose rules before starting voting.")
-            return
+        if self.voting_window is None or not self.voting_window.winfo_exists():
+            self.build_voting_screen()
 
-        # Reset the votes dictionary and indices
-        self.votes = {}
-        self.current_player_index = 0
-        self.current_feature_index = 0
+        self.vote_text.delete("1.0", tk.END)
+        self.feature_status_text.set("")
+        self.voting_window.deiconify()
+        self.voting_window.lift()
+        self.show_current_turn()
 
-        # Create a new Toplevel window for voting or update the existing one
-        if self.voting_window is None:
-            self.voting_window = tk.Toplevel(self.root)
-            self.voting_window.title("Voting Screen")
-        else:
-            # Clear previous content if updating
-            for widget in self.voting_window.winfo_children():
-                widget.destroy()
+
+    def build_voting_screen(self):
+        """
+        @brief Create the window for voting, with its widgets.
+
+        The window includes labels for current voting information, text widget for voting, and buttons for submitting votes.
+        PNG images are used on buttons for different vote values; they come from the shared image cache,
+        so they are decoded and resized once. Closing the window hides it, so the next round or session reuses it.
+
+        @return void
+        """
+        self.voting_window = tk.Toplevel(self.root)
+        self.voting_window.title("Voting Screen")
+        self.voting_window.protocol("WM_DELETE_WINDOW", self.close_voting_screen)
+        self.voting_window.bind("<Configure>", self.schedule_voting_layout)
 
         # Label for displaying the current voting information
-        label_text = tk.StringVar()
-        label_text.set(f"{self.players[self.current_player_index]}'s Vote for {self.features[self.current_feature_index]}: ")
-        current_vote_label = tk.Label(self.voting_window, textvariable=label_text)
+        self.vote_label_text = tk.StringVar()
+        current_vote_label = tk.Label(self.voting_window, textvariable=self.vote_label_text)
         current_vote_label.pack(pady=5)
 
+        # Label for the estimates of similar past features
+        self.suggestion_text = tk.StringVar()
+        self.suggestion_label = tk.Label(self.voting_window, textvariable=self.suggestion_text, wraplength=600,
+                                         justify='left')
+        self.suggestion_label.pack(pady=5)
+
+        # Label for the live converged / diverged indicator
+        self.feature_status_text = tk.StringVar()
+        feature_status_label = tk.Label(self.voting_window, textvariable=self.feature_status_text)
+        feature_status_label.pack(pady=5)
+
         # Text widget for voting
-        vote_text = tk.Text(self.voting_window, wrap="word", height=5, width=40)
-        vote_text.pack(pady=10)
+        self.vote_text = tk.Text(self.voting_window, wrap="word", height=5, width=40)
+        self.vote_text.pack(pady=10)
 
         # Button to submit the vote
-        submit_button = tk.Button(self.voting_window, text="Submit", command=lambda: self.submit_vote(vote_text, label_text))
+        submit_button = tk.Button(self.voting_window, text="Submit",
+                                  command=lambda: self.submit_vote(self.vote_text, self.vote_label_text))
         submit_button.pack(pady=10)
 
-        # Store the vote_text in a list for later access
-        self.vote_texts = [vote_text] * len(self.players)
+        # Create buttons with corresponding PNG images, decoded once and shared across rounds
+        for card in self.session.deck.cards:
+            img = image_cache.get(card.image, CARD_IMAGE_SIZE)
+
+            button = tk.Button(self.voting_window, image=img, command=lambda v=card.label: self.update_vote_text(v))
+            button.image = img
+            button.pack(side="left", padx=5)
+
+
+    def schedule_voting_layout(self, event):
+        """
+        @brief Recompute the layout of the voting screen once it stopped being resized.
+
+        Tk reports every step of a resize; each one postpones the layout by VOTING_LAYOUT_DELAY_MS, so it runs once.
+
+        @param event The Configure event; those of the child widgets are ignored.
+
+        @return void
+        """
+        if event.widget is not self.voting_window:
+            return
+        if self.voting_layout_job is not None:
+            self.voting_window.after_cancel(self.voting_layout_job)
+        self.voting_layout_job = self.voting_window.after(VOTING_LAYOUT_DELAY_MS, self.layout_voting_screen)
+
+
+    def layout_voting_screen(self):
+        """
+        @brief Wrap the suggestions of the voting screen to its current width.
+
+        @return void
+        """
+        self.voting_layout_job = None
+        if self.voting_window is not None and self.voting_window.winfo_exists():
+            self.suggestion_label.config(wraplength=max(200, self.voting_window.winfo_width() - 40))
+
+
+    def voting_screen_shown(self):
+        """
+        @brief Tell whether the voting screen is open.
+
+        @return bool: True if the voting screen exists and is not hidden.
+        """
+        return (self.voting_window is not None and self.voting_window.winfo_exists()
+                and self.voting_window.state() != "withdrawn")
+
+
+    def start_batch_voting(self):
+        """
+        @brief Let every player vote on all the features of the round at once, in any order.
+
+        This method starts a new session unless a round is already in progress, then opens a window with one button
+        per player. Each button opens the ballot of that player, and several ballots can be open at the same time.
+        A feature is complete as soon as every player voted on it, and the round is evaluated once the last ballot
+        fills its last feature, so the round takes as long as its slowest player instead of the sum of every turn.
+
+        @return void
+        """
+        if self.session.finished or not self.session.round_features:
+            try:
+                self.session.start()
+            except ValueError as error:
+                messagebox.showwarning("Warning", str(error))
+                return
+            self.start_journal()
+        self.open_ballot_launcher()
+
+
+    def open_ballot_launcher(self):
+        """
+        @brief Create the window listing the players and how many features each one still has to vote on.
+
+        @return void
+        """
+        if self.ballot_launcher is None or not self.ballot_launcher.winfo_exists():
+            self.ballot_launcher = tk.Toplevel(self.root)
+            self.ballot_launcher.title("Batch Voting")
+        else:
+            for widget in self.ballot_launcher.winfo_children():
+                widget.destroy()
+
+        tk.Label(self.ballot_launcher, text="Open the ballot of each player:").pack(pady=5)
+        self.ballot_buttons = {}
+        for player in self.session.players:
+            button = tk.Button(self.ballot_launcher, command=lambda p=player: self.open_ballot(p))
+            button.pack(fill='x', padx=10, pady=2)
+            self.ballot_buttons[player] = button
+        self.refresh_ballot_launcher()
+
+
+    def refresh_ballot_launcher(self):
+        """
+        @brief Update the number of features left to each player on the batch voting window.
+
+        @return void
+        """
+        for player, button in self.ballot_buttons.items():
+            left = len(self.session.pending_features(player))
+            button.config(text=f"{player} ({left} to vote)" if left else f"{player} (done)")
+
+
+    def open_ballot(self, player):
+        """
+        @brief Create the ballot of a player, with a vote field for every feature of the current round.
 
-        # Create buttons with corresponding PNG images
-        image_paths = ["cartes_0.png", "cartes_1.png", "cartes_2.png", "cartes_3.png", "cartes_5.png", "cartes_8.png", "cartes_13.png", "cartes_20.png", "cartes_40.png", "cartes_100.png", "cartes_cafe.png", "cartes_interro.png"]
+        Clicking a card fills the selected field and moves to the next one. Fields of features the player already
+        voted on show that vote and can be changed.
 
-        for i, image_path in enumerate(image_paths):
-            img = Image.open(image_path)
-            img = img.resize((100, 100))
-            img = ImageTk.PhotoImage(img)
+        @param player The player casting the ballot.
 
-            button = tk.Button(self.voting_window, image=img, command=lambda v=i: self.update_vote_text(v))
+        @return void
+        """
+        window = self.ballot_windows.get(player)
+        if window is not None and window.winfo_exists():
+            window.lift()
+            return
+        window = tk.Toplevel(self.root)
+        window.title(f"{player}'s Ballot")
+        self.ballot_windows[player] = window
+
+        tk.Label(window, text=f"{player}, vote on the features of this round:").pack(pady=5)
+
+        # Scrollable grid of feature names and vote fields
+        container = tk.Frame(window)
+        container.pack(fill='both', expand=True, padx=10)
+        canvas = tk.Canvas(container, width=420, height=300, highlightthickness=0)
+        scrollbar = tk.Scrollbar(container, orient="vertical", command=canvas.yview)
+        canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+        canvas.pack(side='left', fill='both', expand=True)
+        rows = tk.Frame(canvas)
+        canvas.create_window((0, 0), window=rows, anchor='nw')
+        rows.bind("<Configure>", lambda event: canvas.configure(scrollregion=canvas.bbox("all")))
+
+        entries = {}
+        for row, feature in enumerate(self.session.round_features):
+            tk.Label(rows, text=str(feature), anchor='w').grid(row=row, column=0, sticky='w', padx=5, pady=2)
+            entry = tk.Entry(rows, width=10)
+            entry.insert(0, self.session.vote_label(player, feature) or "")
+            entry.grid(row=row, column=1, padx=5, pady=2)
+            entries[feature] = entry
+        order = list(entries.values())
+        if order:
+            order[0].focus_set()
+
+        def fill_selected(value):
+            # Fill the field that has the focus, then move to the next one
+            entry = window.focus_get()
+            if entry not in order:
+                return
+            entry.delete(0, tk.END)
+            entry.insert(0, value)
+            position = order.index(entry)
+            if position + 1 < len(order):
+                order[position + 1].focus_set()
+
+        tk.Button(window, text="Submit Ballot", command=lambda: self.submit_ballot(player, entries)).pack(pady=10)
+
+        cards = tk.Frame(window)
+        cards.pack(pady=5)
+        for card in self.session.deck.cards:
+            img = image_cache.get(card.image, CARD_IMAGE_SIZE)
+            button = tk.Button(cards, image=img, takefocus=False, command=lambda v=card.label: fill_selected(v))
             button.image = img
             button.pack(side="left", padx=5)
 
 
-    
-    
-    
-    
+    def submit_ballot(self, player, entries):
+        """
+        @brief Record the votes of a ballot, and evaluate the round once every vote is in.
+
+        Only fields that were filled or changed are recorded. Nothing is recorded if one of the votes is invalid.
+
+        @param player The player casting the ballot.
+        @param entries Mapping of feature to the Entry holding its vote.
+
+        @return void
+        """
+        votes = {}
+        for feature, entry in entries.items():
+            vote = entry.get().strip()
+            if vote and vote != self.session.vote_label(player, feature):
+                votes[feature] = vote
+        try:
+            self.session.cast_votes(player, votes)
+        except ValueError as error:
+            messagebox.showerror("Error", str(error))
+            return
+
+        self.ballot_windows.pop(player).destroy()
+        self.refresh_ballot_launcher()
+        if self.session.is_round_complete():
+            self.evaluate_votes()
+            return
+
+        # Keep a turn-by-turn voting screen on a turn that still has no vote
+        self.session.resume_cursor()
+        if self.voting_screen_shown():
+            self.show_current_turn()
+
+
+    def close_ballots(self):
+        """
+        @brief Close every open ballot, and the batch voting window once the session is finished.
+
+        @return void
+        """
+        for window in self.ballot_windows.values():
+            if window.winfo_exists():
+                window.destroy()
+        self.ballot_windows = {}
+        if self.session.finished and self.ballot_launcher is not None:
+            if self.ballot_launcher.winfo_exists():
+                self.ballot_launcher.destroy()
+            self.ballot_launcher = None
+            self.ballot_buttons = {}
+
+
+    def start_journal(self):
+        """
+        @brief Record the session in a new journal, so every later change is written to disk as it happens.
+
+        @return void
+        """
+        if self.session.journal is not None:
+            self.session.journal.close()
+        try:
+            SessionJournal.create(JOURNAL_PATH, self.session)
+        except OSError as error:
+            self.session.journal = None
+            messagebox.showwarning("Warning", f"Could not create the session journal: {error}")
+
+
+    def resume_session(self):
+        """
+        @brief Resume the session recorded in the journal, after a crash or a restart.
+
+        This method rebuilds the session from the last journal snapshot and the votes written after it,
+        updates the main window and reopens the voting screen on the turn where voting stopped.
+
+        @return void
+        """
+        if not SessionJournal.exists(JOURNAL_PATH):
+            messagebox.showwarning("Warning", "No session to resume.")
+            return
+        try:
+            session, _ = SessionJournal.resume(JOURNAL_PATH)
+        except (OSError, ValueError, KeyError) as error:
+            messagebox.showerror("Error", f"Could not resume the session: {error}")
+            return
+
+        if self.session.journal is not None:
+            self.session.journal.close()
+        self.session = session
+        self.subscribe_session()
+        self.update_players_label()
+        self.update_features_label()
+        self.update_rules_label()
+        self.top_labels[1].config(text=f"Selected Rule: {self.session.rule_name}")
+
+        if self.session.current_turn() is not None:
+            self.open_voting_screen()
+
+
+    def current_turn_text(self):
+        """
+        @brief Return the label text announcing whose turn it is and on which feature.
+
+        @return str: The label text for the current turn.
+        """
+        player, feature = self.session.current_turn()
+        return f"{player}'s Vote for {feature}: "
+
+
+    @METRICS.timed("planning_poker_gui_seconds", handler="show_current_turn")
+    def show_current_turn(self):
+        """
+        @brief Announce the current turn on the voting screen, with the estimates of similar past features.
+
+        @return void
+        """
+        self.vote_label_text.set(self.current_turn_text())
+        _, feature = self.session.current_turn()
+        self.suggestion_text.set(self.suggestions_text(feature))
+
+
+    def suggestions_text(self, feature):
+        """
+        @brief Return the line listing the final estimates of the past features most similar to a feature.
+
+        The index of past features is built in the background from the estimation history (see
+        build_feature_index), then follows the sessions as they finish.
+
+        @param feature The feature being voted on.
+
+        @return str: The line, a notice while the index is being built, or an empty string without similar past
+        features.
+        """
+        if self.history is None:
+            return ""
+        if self.feature_index is None:
+            return "No suggestions yet."
+
+        suggestions = self.feature_index.similar(str(feature), k=SUGGESTIONS)
+        if not suggestions:
+            return ""
+        return "Similar past features: " + "; ".join(
+            f"{suggestion.feature} ({suggestion.estimate:g})" for suggestion in suggestions)
+
 
     def submit_vote(self, vote_text, label_text):
         """
         @brief Submit a vote and handle the voting process.
 
         This method takes a text entry field for voting (`vote_text`) and the label text for updating the next set of widgets.
-        It inserts the selected vote into the corresponding player's text box and checks if all votes are collected before evaluating.
-        If all votes are collected, it triggers the evaluation process. Otherwise, it moves to the next player and updates the label.
-        If all features have been voted on, it shows the result; otherwise, it updates the label for the next set of widgets.
+        It records the entered vote for the current player and feature, then moves to the next turn.
+        Once every vote of the round is collected, the votes are evaluated. A vote that is not a card of the deck is
+        reported and the turn stays on the same player.
 
         @param vote_text The text entry field containing the selected vote.
         @param label_text The label text for updating the next set of widgets.
 
         @return void
         """
-        # Get the currently selected vote_text
-        current_vote_text = self.vote_texts[self.current_player_index]
+        # Record the vote of the current player for the current feature
+        player, feature = self.session.current_turn()
+        try:
+            with METRICS.time("planning_poker_gui_seconds", handler="submit_vote"):
+                self.record_vote(player, feature, vote_text.get("1.0", tk.END).strip())
+                self.session.advance_turn()
+        except ValueError as error:
+            messagebox.showerror("Error", str(error))
+            return
+        self.advance_turn(vote_text, label_text)
+
+
+    def advance_turn(self, vote_text, label_text):
+        """
+        @brief Show the next turn of the round, or evaluate the round once it is complete.
 
-        # Insert the selected value into the text box
-        current_vote_text.insert(tk.END, vote_text.get("1.0", tk.END).strip())
+        @param vote_text The text entry field to clear for the next player.
+        @param label_text The label text for updating the next set of widgets.
 
-        # Check if all votes are collected before evaluating
-        if len(self.votes) == len(self.players) * len(self.features):
+        @return void
+        """
+        # Clear the content of the text box for the next player, or the next round
+        vote_text.delete("1.0", tk.END)
+
+        # Check if all votes of the round are collected before evaluating
+        if self.session.is_round_complete():
             self.evaluate_votes()
-        else:
-            # Move to the next player and update the label for the next set of widgets
-            self.current_player_index += 1
-            if self.current_player_index == len(self.players):
-                self.current_player_index = 0
-                self.current_feature_index += 1
-
-            # If all features have been voted on, show the result
-            if self.current_feature_index == len(self.features):
-                self.evaluate_votes()
-            else:
-                # Update the label for the next set of widgets
-                label_text.set(f"{self.players[self.current_player_index]}'s Vote for {self.features[self.current_feature_index]}: ")
+            return
 
-            # Clear the content of the text box
-            vote_text.delete("1.0", tk.END)
+        # Update the label for the next set of widgets
+        self.show_current_turn()
+
+
+    def record_vote(self, player, feature, vote):
+        """
+        @brief Store a vote and feed it to the selected rule.
+
+        This method hands the vote to the session, which stores it and passes it to the rule so the rule keeps
+        its per-feature running state up to date. The feature row, the live status indicator of the voting screen
+        and the autosave counter follow through the events the session publishes (see `subscribe_session`).
+
+        @param player The player casting the vote.
+        @param feature The feature being voted on.
+        @param vote The vote value.
+
+        @return str: The status of the feature after the vote ("pending", "converged" or "diverged").
+        """
+        return self.session.record_vote(player, feature, vote)
+
+
+    def subscribe_session(self):
+        """
+        @brief Subscribe the main window to the events of the current session.
+
+        Row redraws and the live status label are batched by TkBatcher: the events of a burst of votes are coalesced
+        per feature and drawn once, when Tk is idle, instead of once per vote.
+
+        @return void
+        """
+        bus = self.session.bus
+        feature_updates = TkBatcher(self.root, self.apply_feature_updates, key=lambda event: event.feature)
+        for event_type in (VoteCast, FeatureConverged, FeatureDiverged):
+            bus.subscribe(event_type, feature_updates)
+        session_updates = TkBatcher(self.root, lambda events: self.features_list.refresh(), key=type)
+        for event_type in (SessionStarted, RoundClosed):
+            bus.subscribe(event_type, session_updates)
+        bus.subscribe(VoteCast, self.count_autosave_vote)
+        if self.history is not None:
+            if self.history_recorder is not None:
+                self.history_recorder.detach()
+            self.history_recorder = self.history.attach(self.session)
+        if self.feature_index is not None:
+            self.feature_index.detach()
+            self.feature_index.attach(self.session)
+
+
+    def apply_feature_updates(self, events):
+        """
+        @brief Redraw the features whose status changed, and show the status of the last voted feature.
+
+        @param events Events of the batch, at most one per feature.
+
+        @return void
+        """
+        for event in events:
+            self.refresh_feature_row(event.feature)
+        if self.feature_status_text is not None and self.session.rules is not None:
+            feature = events[-1].feature
+            self.feature_status_text.set(f"{feature}: {self.session.rules.feature_status(feature)}")
+
+
+    def count_autosave_vote(self, event):
+        """
+        @brief Autosave once enough votes were recorded since the last save.
+
+        @param event The VoteCast event.
+
+        @return void
+        """
+        self.votes_since_autosave += 1
+        if self.votes_since_autosave >= AUTOSAVE_EVERY_VOTES:
+            self.autosave()
 
 
-    
     def evaluate_votes(self):
         """
         @brief Evaluate and process the collected votes.
     
-        This method prints the collected votes to the console and uses the specified rules to validate the votes.
-        If the votes are approved, it displays a message with the voting result, and you can customize the logic for further actions.
-        If the votes are not approved, it shows a warning message, clears the votes, and restarts the voting process.
+        This method prints the collected votes to the console and reads the verdict the rules kept up to date while votes arrived.
+        If the votes are approved, it displays a message with the voting result and closes the voting screen.
+        If the votes are not approved, it shows a warning message listing the features that did not converge,
+        clears only their votes and starts a new round over them. Features that converged keep their votes.
     
         @return void
         """
-        print("Collected Votes:")
-        for (player, feature), vote in self.votes.items():
-            print(f"{player}'s Vote for {feature}: {vote}")
-    
-        # Use rules to validate the votes
-        if self.rules:
-            approval_status = self.rules.validate_votes(self.votes)
-            if approval_status:
-                # Check if the voting process is unanimous for all features
-                if self._is_unanimous_for_all_features():
-                    tk.messagebox.showinfo("Voting Result", "Voting process is complete. Display the result here.")
-                    self.voting_window.destroy()
-                else:
-                    tk.messagebox.showwarning("Warning", "Not all features received unanimous votes. Repeating the voting process.")
-                    # Clear votes and restart the voting process
-                    self.votes = {}
-            else:
-                tk.messagebox.showwarning("Warning", "Feature not approved. Repeating the voting process.")
-                # Clear votes and restart the voting process
-                self.votes = {}
-                self.start_voting()
-            # Destroy the voting window
-            if self.voting_window:
-                self.voting_window.destroy()
+        # Timed up to the result dialog, which waits for the user
+        with METRICS.time("planning_poker_gui_seconds", handler="evaluate_votes"):
+            print("Collected Votes:")
+            for (player, feature), code in self.session.votes.items():
+                print(f"{player}'s Vote for {feature}: {self.session.deck.label(code)}")
+
+            # Use rules to validate the votes; failing features are cleared and voted on again
+            revote_features = self.session.evaluate()
+            # Open ballots list the features of the round that just ended
+            self.close_ballots()
+        if not revote_features:
+            messagebox.showinfo("Voting Result", "Voting process is complete. Display the result here.")
+            self.close_voting_screen()
+            return
+
+        messagebox.showwarning("Warning", f"Features not approved: {', '.join(map(str, revote_features))}. Repeating the vote for these features only.")
+        if self.voting_screen_shown():
+            self.show_current_turn()
+        self.refresh_ballot_launcher()
     
     def _is_unanimous_for_all_features(self):
         """
@@ -620,12 +1253,7 @@ class PlanningPokerGUI:
     
         @return bool: True if unanimous for all features, False otherwise.
         """
-        for feature in self.features:
-            feature_votes = {player: self.votes.get((player, feature), '') for player in self.players}
-            print(feature_votes)
-            if not self.rules._check_unanimous(feature_votes):
-                return False
-        return True
+        return self.session.is_unanimous_for_all_features()
     
     
                     
@@ -634,22 +1262,21 @@ class PlanningPokerGUI:
         @brief Save the difficulty estimations based on the collected votes to a JSON file.
 
         This method prompts the user to choose a file path for saving the difficulty estimations in JSON format.
-        It calculates the average vote for each feature and saves the difficulty estimations to the specified file.
-        After saving, it displays an information message indicating the successful save.
+        It calculates the average vote for each feature and hands the estimations to the background persistence worker;
+        the status bar reports when the file is written. If the worker is busy, the file is written right away.
 
         @return void
         """
+        from tkinter import filedialog
+
         file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")])
         if file_path:
-            difficulty_estimations = {}
-            for feature in self.features:
-                total_votes = sum(int(self.votes.get((player, feature), 0)) for player in self.players)
-                average_vote = total_votes / len(self.players)
-                difficulty_estimations[feature] = average_vote
-
-            with open(file_path, "w") as file:
-                json.dump(difficulty_estimations, file)
-            tk.messagebox.showinfo("Save Difficulty Estimations", "Difficulty estimations saved successfully.")
+            estimations = self.session.difficulty_estimations()
+            report = lambda result, error: self.report_save("Difficulty estimations", file_path, error)
+            if self.persistence.submit_save(file_path, estimations, report):
+                self.show_status("Saving difficulty estimations...")
+            else:
+                self.write_now(file_path, lambda path: write_json_atomic(path, estimations), report)
 
 
 
@@ -658,17 +1285,16 @@ class PlanningPokerGUI:
         """
         @brief Update the vote text with the selected value.
 
-        This method takes a value and updates the text entry field for the current player's vote.
-        The value is inserted at the end of the current text.
+        This method takes the label of the clicked card and replaces the text of the entry field for the current
+        player's vote with it.
 
-        @param value The selected value to be added to the vote text.
+        @param value The label of the selected card.
 
         @return void
         """
-        # Get the currently selected vote_text
-        current_vote_text = self.vote_texts[self.current_player_index]
-        # Insert the selected value into the text box
-        current_vote_text.insert(tk.END, str(value))
+        # Replace the text with the card label
+        self.vote_text.delete("1.0", tk.END)
+        self.vote_text.insert("1.0", str(value))
 
 
     def set_button_value(self, button_value, vote_text):
@@ -692,16 +1318,17 @@ class PlanningPokerGUI:
 
     def close_voting_screen(self):
         """
-        @brief Close the voting screen window.
+        @brief Hide the voting screen window.
 
-        This method checks if the voting window is open and closes it if it exists.
-        It sets the voting window attribute to None after closing.
+        The window and its widgets are kept, so the next session shows them again instead of building them anew.
 
         @return void
         """
-        if self.voting_window:
-            self.voting_window.destroy()
-            self.voting_window = None
+        if self.voting_window is not None and self.voting_window.winfo_exists():
+            if self.voting_layout_job is not None:
+                self.voting_window.after_cancel(self.voting_layout_job)
+                self.voting_layout_job = None
+            self.voting_window.withdraw()
 
             
             
@@ -711,25 +1338,25 @@ class PlanningPokerGUI:
 
         This method prompts the user to choose a file path for saving the progress in JSON format.
         It includes information about players, features, rules, and collected votes in the saved data.
+        The file is serialized and written by the background persistence worker; the status bar reports the outcome.
+        If the worker is busy, the file is written right away.
 
         @return void
         """
-        if not self.players or not self.features or not self.rules:
-            tk.messagebox.showwarning("Warning", "Nothing to save. Please enter players, features, and choose rules before saving.")
+        if not self.session.is_ready():
+            messagebox.showwarning("Warning", "Nothing to save. Please enter players, features, and choose rules before saving.")
             return
 
+        from tkinter import filedialog
+
         file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")])
         if file_path:
-            progress_data = {
-                "players": self.players,
-                "features": self.features,
-                "rules": "StrictRule" if isinstance(self.rules, StrictRule) else "AverageRule",
-                "votes": self.votes  # Include collected votes in the progress data
-            }
-
-            with open(file_path, "w") as file:
-                json.dump(progress_data, file)
-            tk.messagebox.showinfo("Save Progress", "Progress saved successfully.")
+            progress_data = self.session.to_dict()
+            report = lambda result, error: self.report_save("Progress", file_path, error)
+            if self.persistence.submit_save(file_path, progress_data, report):
+                self.show_status("Saving progress...")
+            else:
+                self.write_now(file_path, lambda path: write_json_atomic(path, progress_data), report)
 
 
     def load_progress(self):
@@ -741,42 +1368,330 @@ class PlanningPokerGUI:
 
         @return void
         """
+        from tkinter import filedialog
+
         file_path = filedialog.askopenfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")])
         if file_path:
-            with open(file_path, "r") as file:
-                progress_data = json.load(file)
+            self.persistence.submit_load(file_path, lambda progress_data, error: self.apply_loaded_progress(file_path, progress_data, error))
+            self.show_status("Loading progress...")
 
-            self.players = progress_data.get("players", [])
-            self.features = progress_data.get("features", [])
-            rules_type = progress_data.get("rules", "")
 
-            if rules_type == "StrictRule":
-                self.rules = StrictRule()
-            elif rules_type == "AverageRule":
-                self.rules = AverageRule()
+    def apply_loaded_progress(self, file_path, progress_data, error):
+        """
+        @brief Apply a progress file decoded by the background persistence worker.
 
-            
-            self.update_players_label()
-            self.update_features_label()
-            self.update_rules_label()
+        This method restores the session from the decoded data, updates the main window and records the session
+        in a new journal. Failures are reported in the status bar.
 
-            # Load collected votes
-            self.votes = progress_data.get("votes", {})
+        @param file_path Path of the loaded file.
+        @param progress_data Decoded JSON data, or None on failure.
+        @param error Error message, or None on success.
 
-            tk.messagebox.showinfo("Load Progress", "Progress loaded successfully.")
+        @return void
+        """
+        if error is None:
+            try:
+                self.session.load_dict(progress_data)
+            except (AttributeError, ValueError, TypeError, KeyError) as exception:
+                error = str(exception)
+        if error is not None:
+            self.show_status(f"Could not load progress from {file_path}: {error}")
+            return
 
+        if self.history_recorder is not None:
+            self.history_recorder.resume()
+        self.update_players_label()
         self.update_features_label()
         self.update_rules_label()
+        if self.session.is_ready():
+            self.start_journal()
+        self.show_status(f"Progress loaded from {file_path}.")
+
+
+    def autosave(self):
+        """
+        @brief Save the progress to the autosave file in the background.
+
+        When the background queue is full, the autosave is skipped and retried on the next tick.
+
+        @return void
+        """
+        if not self.session.is_ready():
+            self.votes_since_autosave = 0
+        elif self.persistence.submit_save(AUTOSAVE_PATH, self.session.to_dict(),
+                                          lambda result, error: self.report_save("Autosave", AUTOSAVE_PATH, error)):
+            self.votes_since_autosave = 0
+        else:
+            self.show_status("Autosave postponed: the background saves are busy.")
+
+
+    def autosave_tick(self):
+        """
+        @brief Autosave if votes were recorded since the last autosave, then schedule the next tick.
+
+        @return void
+        """
+        if self.votes_since_autosave:
+            self.autosave()
+        self.root.after(AUTOSAVE_INTERVAL_MS, self.autosave_tick)
+
+
+    def poll_persistence(self):
+        """
+        @brief Run the completion callbacks of finished background saves and loads, then schedule the next poll.
+
+        @return void
+        """
+        self.persistence.poll_results()
+        self.root.after(PERSISTENCE_POLL_MS, self.poll_persistence)
+
+
+    def write_now(self, file_path, write, callback):
+        """
+        @brief Write a file on the main thread, when the background persistence worker has no room for the job.
+
+        @param file_path Path of the file to write.
+        @param write Function writing the file, called with its path.
+        @param callback Function called with `(None, error)`, as for a background job.
+
+        @return void
+        """
+        error = None
+        try:
+            write(file_path)
+        except (OSError, TypeError, ValueError) as exception:
+            error = str(exception)
+        callback(None, error)
+
+
+    def report_save(self, what, file_path, error):
+        """
+        @brief Report the outcome of a background save in the status bar.
+
+        @param what Description of the saved data.
+        @param file_path Path of the written file.
+        @param error Error message, or None on success.
+
+        @return void
+        """
+        if error is None:
+            self.show_status(f"{what} saved to {file_path}.")
+        else:
+            self.show_status(f"{what} could not be saved to {file_path}: {error}")
+
+
+    def show_history(self):
+        """
+        @brief Show the archived estimates of the features matching a search, and how far each player was from them.
+
+        The estimates and the deviations cover the last HISTORY_DAYS days, newest estimates first.
+
+        @return void
+        """
+        if self.history is None:
+            messagebox.showwarning("Warning", "The estimation history is not available.")
+            return
+        from tkinter import simpledialog
+
+        pattern = simpledialog.askstring("Estimation History", "Feature name contains (leave empty for every feature):",
+                                         parent=self.root)
+        if pattern is None:
+            return
+
+        import sqlite3
+
+        since = time.time() - HISTORY_DAYS * 86400
+        try:
+            estimates = self.history.estimates(pattern.strip(), since=since, limit=HISTORY_ROWS)
+            deviations = self.history.player_deviation(since=since)
+        except sqlite3.Error as error:
+            messagebox.showerror("Error", f"Could not read the estimation history: {error}")
+            return
+
+        lines = [f"Estimates of the last {HISTORY_DAYS} days ({len(estimates)}):"]
+        for row in estimates:
+            estimate = "-" if row["estimate"] is None else f"{row['estimate']:g}"
+            date = time.strftime("%Y-%m-%d", time.localtime(row["decided_at"]))
+            lines.append(f"{date}  {row['feature']}: {estimate} ({row['rule']})")
+        lines.append("")
+        lines.append("Deviation from consensus per player:")
+        for player, stats in sorted(deviations.items()):
+            lines.append(f"{player}: {stats['mean_absolute_deviation']:.2f} on average, "
+                         f"bias {stats['bias']:+.2f} over {stats['votes']} votes")
+
+        window = tk.Toplevel(self.root)
+        window.title("Estimation History")
+        window.geometry("600x400")
+        scrollbar = tk.Scrollbar(window)
+        scrollbar.pack(side='right', fill='y')
+        text = tk.Text(window, wrap='none', yscrollcommand=scrollbar.set)
+        text.insert("1.0", "\n".join(lines))
+        text.config(state='disabled')
+        text.pack(side='left', fill='both', expand=True)
+        scrollbar.config(command=text.yview)
+
+
+    def export_results(self):
+        """
+        @brief Export the estimation results of every feature as CSV, JSON Lines or columnar chunks.
+
+        The format follows the extension of the chosen file (see exporter.py). The export runs on the background
+        persistence worker from a snapshot of the session; the status bar reports the outcome. If the worker is busy, the
+        file is written right away.
+
+        @return void
+        """
+        from tkinter import filedialog
+        from exporter import format_of, export_progress
+
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv",
+                                                 filetypes=[("CSV files", "*.csv"), ("JSON Lines files", "*.jsonl"),
+                                                            ("Columnar chunks", "*.columns.jsonl"),
+                                                            ("Parquet files", "*.parquet")])
+        if not file_path:
+            return
+        if format_of(file_path) is None:
+            messagebox.showerror("Error", "Please export to a .csv, .jsonl, .columns.jsonl or .parquet file.")
+            return
+        progress_data = self.session.to_dict()
+        write = lambda path: export_progress(progress_data, path)
+        report = lambda result, error: self.report_export(file_path, error)
+        if self.persistence.submit_write(file_path, write, report):
+            self.show_status("Exporting results...")
+        else:
+            self.write_now(file_path, write, report)
+
+
+    def report_export(self, file_path, error):
+        """
+        @brief Report the outcome of a background export.
+
+        @param file_path Path of the exported file.
+        @param error Error message, or None on success.
+
+        @return void
+        """
+        if error is None:
+            self.show_status(f"Results exported to {file_path}.")
+        else:
+            messagebox.showerror("Error", f"Could not export the results: {error}")
+
+
+    def export_metrics(self):
+        """
+        @brief Write the timing histograms of the session to a file in the Prometheus text format.
+
+        @return void
+        """
+        from tkinter import filedialog
+
+        file_path = filedialog.asksaveasfilename(defaultextension=".prom",
+                                                 filetypes=[("Prometheus text files", "*.prom"), ("All files", "*.*")])
+        if not file_path:
+            return
+        try:
+            METRICS.write_prometheus(file_path)
+        except OSError as error:
+            messagebox.showerror("Error", f"Could not write the metrics: {error}")
+            return
+        self.show_status(f"Metrics written to {file_path}.")
+
+
+    def toggle_profiling(self):
+        """
+        @brief Start capturing a cProfile of the session, or stop and save it as a pstats dump.
+
+        The most expensive calls are written next to the dump, in a text file with the same name.
+
+        @return void
+        """
+        button = self.menu_buttons["Start Profiling"]
+        if not self.profiler.active:
+            self.profiler.start()
+            button.config(text="Stop Profiling")
+            self.show_status("Profiling the session...")
+            return
+
+        from tkinter import filedialog
+
+        # The dialog is not profiled
+        report = self.profiler.stop()
+        button.config(text="Start Profiling")
+        file_path = filedialog.asksaveasfilename(defaultextension=".pstats",
+                                                 filetypes=[("pstats dumps", "*.pstats"), ("All files", "*.*")])
+        if not file_path:
+            self.show_status("Profiling stopped.")
+            return
+        report_path = os.path.splitext(file_path)[0] + ".txt"
+        try:
+            self.profiler.dump(file_path)
+            write_text_atomic(report_path, report)
+        except OSError as error:
+            messagebox.showerror("Error", f"Could not write the profile: {error}")
+            return
+        self.show_status(f"Profile written to {file_path}, most expensive calls to {report_path}.")
+
+
+    def show_status(self, message):
+        """
+        @brief Show a message in the status bar.
+
+        @param message The message.
+
+        @return void
+        """
+        self.status_text.set(message)
+
+
+    def exit(self):
+        """
+        @brief Finish pending background writes and close the application.
+
+        @return void
+        """
+        self.persistence.stop()
+        if self.history is not None:
+            self.history.close()
+        self.root.destroy()
 
     def update_features_label(self):
-        # Update the label displaying features
-        features_text = ", ".join(self.features)
-        self.top_labels[2].config(text=f"Features: {features_text}")
+        """
+        @brief Update the list displaying the features.
+
+        This method updates the heading with the number of features and resizes the virtualized features list.
+
+        @return void
+        """
+        self.top_labels[2].config(text=f"Features ({len(self.session.features)})")
+        self.features_list.set_row_count(len(self.session.features))
+
+    def feature_row_text(self, index):
+        """
+        @brief Return the text of a row of the features list, with the status of the feature.
+
+        @param index The index of the feature.
+
+        @return str: The row text.
+        """
+        feature = self.session.features[index]
+        return f"{feature}: {self.session.feature_status(feature)}"
+
+    def refresh_feature_row(self, feature):
+        """
+        @brief Redraw the row of a single feature after its status changed.
+
+        @param feature The feature.
+
+        @return void
+        """
+        index = self.session.votes.feature_position(feature)
+        if index is not None:
+            self.features_list.refresh_row(index)
 
     def update_rules_label(self):
         # Update the label displaying selected rules
-        if self.rules:
-            rules_text = f"Selected Rules: {self.rules.__class__.__name__}"
+        if self.session.rules:
+            rules_text = f"Selected Rules: {self.session.rule_name}"
         else:
             rules_text = "Selected Rules: None"
         self.selected_rule_label.config(text=rules_text)
@@ -794,7 +1709,50 @@ class PlanningPokerGUI:
         self.root.mainloop()
 
 
-if __name__ == "__main__":
+def startup_report(marks):
+    """
+    @brief Format the startup timings recorded by a PlanningPokerGUI.
+
+    Each step is reported with the time it took and the time elapsed since the imports started.
+
+    @param marks List of `(step, time.perf_counter())` pairs, in order.
+
+    @return str: The report.
+    """
+    lines = ["Startup profile:"]
+    previous = IMPORT_START
+    for step, moment in marks:
+        lines.append(f"  {step:<16} {(moment - previous) * 1000:8.1f} ms  (total {(moment - IMPORT_START) * 1000:8.1f} ms)")
+        previous = moment
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Planning Poker.")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print import, first paint and deferred loading times once started, then exit.")
+    parser.add_argument("--metrics-port", type=int,
+                        help="Serve the timing histograms at http://127.0.0.1:PORT/metrics.")
+    args = parser.parse_args(argv)
+
+    if args.metrics_port is not None:
+        METRICS.serve_http(port=args.metrics_port)
+
     planning_poker_gui = PlanningPokerGUI()
+    if args.profile_startup:
+        def report():
+            early = [name for name in DEFERRED_MODULES if name in planning_poker_gui.modules_at_first_paint]
+            print(startup_report(planning_poker_gui.startup_marks))
+            print(f"Deferred modules imported before the first paint: {', '.join(early) or 'none'}")
+            planning_poker_gui.exit()
+
+        planning_poker_gui.on_startup_complete = report
     planning_poker_gui.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
 
@@ -0,0 +1,222 @@
+# revalidate.py
+"""
+@file revalidate.py
+@brief Re-check many saved sessions against several voting rules, across a process pool.
+
+@details
+Every progress file (written by the GUI's `save_progress` or `planning_poker_cli.py --save`) is read and
+checked in a worker process: its votes are aggregated once into one FeatureStats per feature, then every requested
+rule classifies the same statistics, so comparing what AverageRule and StrictRule would have said costs one pass
+over the votes, not one per rule.
+
+Files are handed to the workers in chunks, so the cost of passing work between processes is paid once per chunk,
+and workers share nothing: the check scales with the number of cores until the disk is the bottleneck.
+
+The consolidated JSON report lists, per file, the rule it was saved with and, per rule, the verdict (True when no
+feature diverged) and the number of converged, diverged and pending features, followed by the statistics of every
+feature with its status and estimate under each rule. The totals count, per rule, the files whose verdict holds.
+Files that cannot be read are listed under `errors`.
+
+@code
+python revalidate.py sessions/ --rules Average,Strict --workers 8 --output week12.json
+@endcode
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+import time
+
+from session import RULES
+from deck import DEFAULT_DECK
+from stats_kernel import FeatureStats
+from exporter import stats_summary
+
+DEFAULT_RULES = "AverageRule,StrictRule"
+
+
+def session_files(paths):
+    """
+    @brief Expand files, directories and glob patterns into the list of progress files to check.
+
+    Directories contribute their `*.json` files. Every file is listed once, in the given order.
+
+    @param paths Iterable of paths or patterns.
+
+    @return list: The file paths.
+    """
+    files = []
+    seen = set()
+    for path in paths:
+        if os.path.isdir(path):
+            matches = sorted(glob.glob(os.path.join(path, "*.json")))
+        else:
+            matches = sorted(glob.glob(path)) or [path]
+        for match in matches:
+            if match not in seen:
+                seen.add(match)
+                files.append(match)
+    return files
+
+
+def check_file(file_path, rule_names):
+    """
+    @brief Check the votes of one progress file against several rules.
+
+    @param file_path Path of the progress file.
+    @param rule_names Names of the rules, from `RULES`.
+
+    @return dict: The report of the file, or `{"file": ..., "error": ...}` if it cannot be read.
+    """
+    try:
+        with open(file_path, "r") as file:
+            progress_data = json.load(file)
+        features = progress_data.get("features", [])
+        saved_votes = progress_data.get("votes", {})
+
+        # Labels are encoded once per distinct label
+        codes = {}
+        encode = DEFAULT_DECK.encode
+        feature_stats = []
+        for feature in features:
+            stats = FeatureStats(DEFAULT_DECK)
+            for vote in saved_votes.get(str(feature), {}).values():
+                code = codes.get(vote)
+                if code is None:
+                    code = codes[vote] = encode(vote)
+                stats.add(code)
+            feature_stats.append(stats)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as error:
+        return {"file": file_path, "error": str(error)}
+
+    rules = {RULES.class_name(RULES.display_name(name)): RULES.create(name) for name in rule_names}
+    verdicts = {name: {"verdict": True, "converged": 0, "diverged": 0, "pending": 0} for name in rules}
+    feature_reports = []
+    for feature, stats in zip(features, feature_stats):
+        statuses = {}
+        estimates = {}
+        for name, rule in rules.items():
+            if stats.count:
+                status = rule.classify(stats)
+                estimates[name] = rule.estimate_stats(stats)
+            else:
+                status = "pending"
+                estimates[name] = None
+            statuses[name] = status
+            verdicts[name][status] += 1
+            if status == "diverged":
+                verdicts[name]["verdict"] = False
+        report = {"feature": feature, "votes": stats.count, "numeric_votes": stats.numeric_count}
+        report.update(stats_summary(stats))
+        report["statuses"] = statuses
+        report["estimates"] = estimates
+        feature_reports.append(report)
+
+    return {
+        "file": file_path,
+        "saved_rule": progress_data.get("rules") or None,
+        "finished": progress_data.get("finished", False),
+        "players": len(progress_data.get("players", [])),
+        "features": len(features),
+        "rules": verdicts,
+        "feature_stats": feature_reports,
+    }
+
+
+def _check_files(file_paths, rule_names):
+    # Worker entry point: one call per chunk of files
+    return [check_file(file_path, rule_names) for file_path in file_paths]
+
+
+def check_files(file_paths, rule_names, workers=None, chunk_size=None):
+    """
+    @brief Check many progress files, across a pool of processes.
+
+    @param file_paths Paths of the progress files.
+    @param rule_names Names of the rules, from `RULES`.
+    @param workers Number of processes; the number of CPUs by default. With 1, files are checked in this process.
+    @param chunk_size Files per task handed to a worker; by default, enough for about four tasks per worker.
+
+    @return list: The report of every file, in the order of `file_paths`.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(file_paths) <= 1:
+        return _check_files(file_paths, rule_names)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunk_size = chunk_size or max(1, -(-len(file_paths) // (workers * 4)))
+    chunks = [file_paths[first:first + chunk_size] for first in range(0, len(file_paths), chunk_size)]
+    with ProcessPoolExecutor(min(workers, len(chunks))) as executor:
+        return [report for reports in executor.map(_check_files, chunks, [rule_names] * len(chunks))
+                for report in reports]
+
+
+def consolidate(reports, rule_names):
+    """
+    @brief Build the consolidated report of checked files.
+
+    @param reports The reports returned by `check_files`.
+    @param rule_names Names of the checked rules.
+
+    @return dict: `rules`, `totals` (per rule: files checked, files whose verdict holds, diverged features),
+    `files` and `errors`.
+    """
+    names = [RULES.class_name(RULES.display_name(name)) for name in rule_names]
+    totals = {name: {"files": 0, "verdicts": 0, "diverged_features": 0} for name in names}
+    files = []
+    errors = []
+    for report in reports:
+        if "error" in report:
+            errors.append(report)
+            continue
+        files.append(report)
+        for name, verdict in report["rules"].items():
+            totals[name]["files"] += 1
+            totals[name]["verdicts"] += verdict["verdict"]
+            totals[name]["diverged_features"] += verdict["diverged"]
+    return {"rules": names, "totals": totals, "files": files, "errors": errors}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-check saved Planning Poker sessions against several rules.")
+    parser.add_argument("paths", nargs="+", help="Progress files, directories of progress files or glob patterns.")
+    parser.add_argument("--rules", default=DEFAULT_RULES, help="Comma-separated rule names.")
+    parser.add_argument("--workers", type=int, help="Number of processes; the number of CPUs by default.")
+    parser.add_argument("--chunk-size", type=int, help="Files per task handed to a worker.")
+    parser.add_argument("--output", help="Write the report to this JSON file.")
+    args = parser.parse_args(argv)
+
+    rule_names = args.rules.split(',')
+    for name in rule_names:
+        if name not in RULES:
+            parser.error(f"Unknown rule: {name}")
+    file_paths = session_files(args.paths)
+
+    start = time.perf_counter()
+    reports = check_files(file_paths, rule_names, args.workers, args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    report = consolidate(reports, rule_names)
+    report["python"] = platform.python_version()
+    report["seconds"] = elapsed
+    for name, total in report["totals"].items():
+        print(f"{name:<14} {total['verdicts']}/{total['files']} files pass"
+              f"  {total['diverged_features']} diverged features", file=sys.stderr)
+    for error in report["errors"]:
+        print(f"Error: {error['file']}: {error['error']}", file=sys.stderr)
+    print(f"{len(file_paths)} files in {elapsed:.2f} s", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 2 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
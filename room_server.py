@@ -0,0 +1,734 @@
+# room_server.py
+"""
+@file room_server.py
+@brief Server hosting many independent Planning Poker rooms, sharded across worker processes.
+
+@details
+Each room has its own PlanningPokerSession, with its own players, features, rule instance and votes, and runs the
+VotingRoom protocol of net_server.py. The rooms live in a pool of worker processes (one per CPU core by default),
+so the rule work of a busy room only competes with the rooms of its own worker, never with the whole server.
+A new room goes to the live worker hosting the fewest active rooms, and a worker that exits is replaced.
+
+The main process is an asyncio gateway: it accepts the client connections, routes every message to the worker of
+its room over the worker's standard input, and writes the messages the worker answers back to the clients.
+Workers exchange newline-delimited JSON with the gateway and batch their answers per read.
+
+The protocol is the one of net_server.py, except that the join message names the room, and may carry the
+configuration of the room to create it if it does not exist yet:
+
+@code
+{"type": "join", "player": "Alice", "room": "team-a",
+ "create": {"features": ["Login page"], "rule": "Average", "expect": 5}}
+@endcode
+
+`create` holds either `expect` (players registering on join) or `players` (fixed player names). Rooms can also be
+declared up front with `--rooms`, a JSON file mapping room names to the same configuration, where `features` may
+also be a backlog file path read by the server; a room created by a join only accepts a list of titles. A room is closed once its final estimations are sent, or once every client of a room
+created by a join left, and its name can then be reused.
+
+The gateway measures, per room, the number of votes and errors, the vote throughput, the duration of each round and
+the latency between receiving a client message and sending its answer. A summary line per active room is logged
+every `--metrics-interval` seconds and when a room finishes, and `--metrics` keeps a JSON file of every room.
+
+@code
+python room_server.py --port 8765 --workers 4 --metrics rooms_metrics.json
+python net_client.py --simulate 10 --rooms 40 --features backlog.json --rule Average
+@endcode
+"""
+import argparse
+import asyncio
+import collections
+import json
+import os
+import signal
+import sys
+import time
+
+from session import PlanningPokerSession
+from backlog_import import import_backlog
+from voting_room import VotingRoom
+from net_server import encode, STREAM_LIMIT
+from net_client import percentile
+from persistence import write_json_atomic
+
+LATENCY_SAMPLES = 10000
+
+
+def make_room(name, config, on_round_closed=None):
+    """
+    @brief Create a room from its configuration.
+
+    @param name Name of the room.
+    @param config Dictionary with "features" (list of titles), "rule", and "expect" or "players".
+    @param on_round_closed Callback run when a round of the room is evaluated.
+
+    @return VotingRoom: The new room.
+    """
+    if not isinstance(config, dict):
+        raise ValueError(f"Invalid configuration for room {name}.")
+    session = PlanningPokerSession()
+    session.load_features(config.get("features"))
+    session.set_rule(config.get("rule", ""))
+
+    expected_players = config.get("expect")
+    if expected_players is None:
+        session.set_players(config.get("players") or [])
+        session.start()
+    elif not isinstance(expected_players, int) or expected_players < 1:
+        raise ValueError(f"Invalid number of players for room {name}.")
+    return VotingRoom(session, expected_players, name, on_round_closed)
+
+
+class RoomShard:
+    """
+    @brief Rooms hosted by one worker process.
+
+    @details
+    `handle` takes one gateway request and returns the entries to send back:
+    - `{"to": [connections], "message": message, "reply": bool}`: a message for clients; `reply` marks the answer
+      to the request itself.
+    - `{"close": [connections]}`: connections to close.
+    - `{"event": "opened", "room": name}`: a room was created.
+    - `{"event": "joined", "room": name, "conn": connection}` or `{"event": "rejected", ...}`: the result of a join.
+    - `{"event": "round", "room": name, "round": number, "seconds": seconds, "revote": count}`
+    - `{"event": "finished", "room": name}`
+    - `{"event": "closed", "room": name}`: a room created by a join was dropped because all its clients left.
+
+    A request failing with an unexpected exception is answered with an error, so that it cannot take down the other
+    rooms of the worker.
+
+    @par Attributes:
+    - rooms: Mapping of room name to VotingRoom.
+    - connections: Mapping of connection number to `(room name, player)`.
+    - declared: Names of the rooms created up front, kept while they have no client.
+    """
+    def __init__(self):
+        self.rooms = {}
+        self.connections = {}
+        self.declared = set()
+        self._output = []
+
+    def handle(self, request):
+        """
+        @brief Handle one request of the gateway.
+
+        @param request The decoded request, with an "op" key: "create", "join", "message" or "leave".
+
+        @return list: The entries to send back to the gateway.
+        """
+        self._output = []
+        op = request["op"]
+        try:
+            if op == "create":
+                self.create(request["room"], request["config"])
+                self.declared.add(request["room"])
+            elif op == "join":
+                self.join(request["conn"], request["room"], request["player"], request.get("create"))
+            elif op == "message":
+                self.message(request["conn"], request["message"])
+            elif op == "leave":
+                self.leave(request["conn"])
+        except (OSError, ValueError) as error:
+            print(f"Room {request.get('room')}: {error}", file=sys.stderr)
+        except Exception as error:
+            print(f"Request {op} failed: {error!r}", file=sys.stderr)
+            connection = request.get("conn")
+            if op == "join":
+                self._reject(connection, request["room"], "The room could not be joined.")
+            elif op == "message":
+                self._reply(connection, {"type": "error", "message": "The message could not be handled."})
+        return self._output
+
+    def create(self, name, config):
+        """
+        @brief Create a room unless it already exists.
+
+        @return VotingRoom: The room.
+        """
+        room = self.rooms.get(name)
+        if room is None:
+            room = make_room(name, config, lambda number, seconds, revote: self._output.append(
+                {"event": "round", "room": name, "round": number, "seconds": seconds, "revote": len(revote)}))
+            self.rooms[name] = room
+            self._output.append({"event": "opened", "room": name})
+        return room
+
+    def join(self, connection, name, player, config):
+        """
+        @brief Add a connection to a room, creating the room from `config` if needed.
+
+        @return void
+        """
+        try:
+            if name in self.rooms:
+                room = self.rooms[name]
+            elif config is not None:
+                room = self.create(name, config)
+            else:
+                raise ValueError(f"Unknown room: {name}")
+            outbox = room.join(connection, player)
+        except (OSError, ValueError) as error:
+            self._reject(connection, name, str(error))
+            return
+        self.connections[connection] = (name, str(player).strip())
+        self._output.append({"event": "joined", "room": name, "conn": connection})
+        self._send(outbox)
+
+    def leave(self, connection):
+        """
+        @brief Forget a disconnected client, and drop its room if it was created by a join and is now empty.
+
+        @return void
+        """
+        entry = self.connections.pop(connection, None)
+        if entry is not None and entry[0] in self.rooms:
+            self.rooms[entry[0]].leave(entry[1], connection)
+            self._drop_if_empty(entry[0])
+
+    def message(self, connection, message):
+        """
+        @brief Pass a client message to its room.
+
+        @return void
+        """
+        entry = self.connections.get(connection)
+        room = self.rooms.get(entry[0]) if entry is not None else None
+        if room is None:
+            self._reply(connection, {"type": "error", "message": "Not in a room."})
+            return
+        try:
+            outbox = room.handle(entry[1], message)
+        except ValueError as error:
+            self._reply(connection, {"type": "error", "message": str(error)})
+            return
+        # The first message of the outbox is the acknowledgement of the vote
+        self._send(outbox[:1], reply=True)
+        self._send(outbox[1:])
+        if room.finished:
+            self._output.append({"event": "finished", "room": room.name})
+            self._output.append({"close": list(room.clients.values())})
+            for connection in room.clients.values():
+                self.connections.pop(connection, None)
+            del self.rooms[room.name]
+            self.declared.discard(room.name)
+
+    def _reject(self, connection, name, error):
+        self._reply(connection, {"type": "error", "message": error})
+        self._output.append({"close": [connection]})
+        self._output.append({"event": "rejected", "room": name, "conn": connection})
+        self._drop_if_empty(name)
+
+    def _drop_if_empty(self, name):
+        room = self.rooms.get(name)
+        if room is not None and not room.clients and name not in self.declared:
+            del self.rooms[name]
+            self._output.append({"event": "closed", "room": name})
+
+    def _reply(self, connection, message):
+        self._output.append({"to": [connection], "message": message, "reply": True})
+
+    def _send(self, outbox, reply=False):
+        for connections, message in outbox:
+            self._output.append({"to": connections, "message": message, "reply": reply})
+
+
+def worker_main():
+    """
+    @brief Entry point of a worker process: serve the gateway requests read from standard input.
+
+    @return void
+    """
+    shard = RoomShard()
+    stdin = sys.stdin.fileno()
+    stdout = sys.stdout.buffer
+    pending = b""
+    while True:
+        chunk = os.read(stdin, 1 << 16)
+        if not chunk:
+            return
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        # One write for every request of the chunk
+        output = []
+        for line in lines:
+            for entry in shard.handle(json.loads(line)):
+                output.append(json.dumps(entry) + "\n")
+        if output:
+            stdout.write("".join(output).encode("utf-8"))
+            stdout.flush()
+
+
+class RoomMetrics:
+    """
+    @brief Latency and throughput of one room, measured by the gateway.
+
+    @par Attributes:
+    - room: The room name.
+    - shard: Index of the worker hosting the room.
+    - connections: Number of connected clients.
+    - votes: Number of acknowledged votes.
+    - errors: Number of messages answered with an error.
+    - round_seconds: Duration of every evaluated round.
+    - latencies: Most recent message latencies, in seconds.
+    - finished: True once the room sent its final estimations.
+    """
+    def __init__(self, room, shard):
+        self.room = room
+        self.shard = shard
+        self.connections = 0
+        self.votes = 0
+        self.errors = 0
+        self.round_seconds = []
+        self.latencies = collections.deque(maxlen=LATENCY_SAMPLES)
+        self.finished = False
+        self.first_message = None
+        self.last_answer = None
+        self._reported_votes = 0
+
+    def record_answer(self, message, latency):
+        """
+        @brief Account for the answer to a client message.
+
+        @param message The answer sent to the client.
+        @param latency Seconds between receiving the client message and sending the answer.
+
+        @return void
+        """
+        self.last_answer = time.perf_counter()
+        self.latencies.append(latency)
+        if message.get("type") == "ack":
+            self.votes += len(message["statuses"]) if "statuses" in message else 1
+        else:
+            self.errors += 1
+
+    def summary(self):
+        """
+        @brief Return the metrics as JSON-compatible data.
+
+        @return dict: The room summary.
+        """
+        elapsed = None
+        if self.first_message is not None and self.last_answer is not None:
+            elapsed = self.last_answer - self.first_message
+        latencies = list(self.latencies)
+        return {
+            "room": self.room,
+            "shard": self.shard,
+            "connections": self.connections,
+            "finished": self.finished,
+            "votes": self.votes,
+            "errors": self.errors,
+            "rounds": len(self.round_seconds),
+            "round_seconds": self.round_seconds,
+            "votes_per_second": self.votes / elapsed if elapsed else None,
+            "latency_p50": percentile(latencies, 0.50),
+            "latency_p95": percentile(latencies, 0.95),
+            "latency_p99": percentile(latencies, 0.99),
+        }
+
+    def report_line(self):
+        """
+        @brief Return a one-line summary for the log.
+        """
+        summary = self.summary()
+        rate = summary["votes_per_second"]
+        p95 = summary["latency_p95"]
+        return (f"[{self.room}] shard {self.shard}, {self.connections} clients, {self.votes} votes, "
+                f"{len(self.round_seconds)} rounds, {rate or 0:.0f} votes/s, "
+                f"p95 latency {(p95 or 0) * 1000:.2f} ms")
+
+
+class RoomGateway:
+    """
+    @brief Asyncio front end accepting clients and routing them to the worker processes of their rooms.
+
+    @par Attributes:
+    - worker_count: Number of worker processes.
+    - metrics: Mapping of room name to RoomMetrics, for active and finished rooms.
+    - metrics_path: JSON file receiving the metrics of every room, or None.
+    """
+    def __init__(self, worker_count, metrics_path=None):
+        """
+        @brief Constructor for the RoomGateway class.
+
+        @param worker_count Number of worker processes.
+        @param metrics_path JSON file receiving the metrics of every room, or None.
+        """
+        self.worker_count = worker_count
+        self.metrics = {}
+        self.metrics_path = metrics_path
+        self._workers = []
+        self._room_shards = {}
+        self._shard_rooms = [0] * worker_count
+        self._open_rooms = set()
+        self._joining = collections.Counter()
+        self._writers = {}
+        self._connection_rooms = {}
+        self._joins = set()
+        self._joined = {}
+        self._pending = {}
+        self._next_connection = 0
+        self._tasks = []
+        self._handlers = set()
+        self._stopping = False
+
+    async def start(self):
+        """
+        @brief Start the worker processes.
+
+        @return void
+        """
+        for shard in range(self.worker_count):
+            self._workers.append(None)
+            await self.spawn(shard)
+
+    async def spawn(self, shard):
+        """
+        @brief Start the worker process of a shard.
+
+        @return void
+        """
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, os.path.abspath(__file__), "--worker",
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, limit=STREAM_LIMIT)
+        self._workers[shard] = process
+        self._tasks.append(asyncio.ensure_future(self.read_worker(shard, process)))
+
+    async def stop(self):
+        """
+        @brief Disconnect every client, stop the workers and write the final metrics.
+
+        @return void
+        """
+        self._stopping = True
+        for writer in list(self._writers.values()):
+            writer.close()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        for process in self._workers:
+            process.stdin.close()
+        await asyncio.gather(*(process.wait() for process in self._workers), return_exceptions=True)
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self.write_metrics()
+
+    def shard_for(self, room):
+        """
+        @brief Return the worker hosting a room, assigning new rooms to the least loaded live worker.
+
+        @details
+        A room counts towards the load of its worker from its assignment until it is released, so that a burst of
+        new rooms is spread over the workers before any of them reports its rooms opened.
+
+        @param room The room name.
+
+        @return int: The worker index.
+        """
+        shard = self._room_shards.get(room)
+        if shard is None:
+            live = [shard for shard, process in enumerate(self._workers) if process.returncode is None]
+            shard = min(live or range(self.worker_count), key=self._shard_rooms.__getitem__)
+            self._room_shards[room] = shard
+            self._shard_rooms[shard] += 1
+        return shard
+
+    async def request(self, shard, request):
+        """
+        @brief Send a request to a worker.
+
+        @return void
+        """
+        stdin = self._workers[shard].stdin
+        stdin.write(encode(request))
+        await stdin.drain()
+
+    async def create_room(self, room, config):
+        """
+        @brief Create a room up front from its configuration.
+
+        @return void
+        """
+        await self.request(self.shard_for(room), {"op": "create", "room": room, "config": config})
+
+    async def handle_client(self, reader, writer):
+        """
+        @brief Serve one client connection until it disconnects.
+
+        @param reader The stream reader of the connection.
+        @param writer The stream writer of the connection.
+
+        @return void
+        """
+        try:
+            message = json.loads(await reader.readline())
+            if message.get("type") != "join":
+                raise ValueError
+            room, player = str(message["room"]), str(message["player"])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            writer.write(encode({"type": "error", "message": "Expected a join message with a room."}))
+            writer.close()
+            return
+
+        connection = self._next_connection
+        self._next_connection += 1
+        self._handlers.add(asyncio.current_task())
+        shard = self.shard_for(room)
+        self._joining[room] += 1
+        self._joins.add(connection)
+        self._writers[connection] = writer
+        self._connection_rooms[connection] = room
+        self._pending[connection] = collections.deque()
+        try:
+            await self.request(shard, {"op": "join", "conn": connection, "room": room, "player": player,
+                                       "create": message.get("create")})
+            while not reader.at_eof():
+                line = await reader.readline()
+                if not line:
+                    break
+                received = time.perf_counter()
+                metrics = self.metrics.get(room)
+                if metrics is not None and metrics.first_message is None:
+                    metrics.first_message = received
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    writer.write(encode({"type": "error", "message": "Invalid JSON message."}))
+                    continue
+                self._pending[connection].append(received)
+                await self.request(shard, {"op": "message", "conn": connection, "message": message})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError:
+            # readline raises ValueError for a line longer than STREAM_LIMIT
+            writer.write(encode({"type": "error", "message": "Message too long."}))
+        finally:
+            self._writers.pop(connection, None)
+            self._connection_rooms.pop(connection, None)
+            self._pending.pop(connection, None)
+            self.end_join(connection, room)
+            metrics = self._joined.pop(connection, None)
+            if metrics is not None:
+                metrics.connections -= 1
+            writer.close()
+            if not self._stopping and self._workers[shard].returncode is None:
+                try:
+                    await self.request(shard, {"op": "leave", "conn": connection})
+                except ConnectionError:
+                    pass
+            self._handlers.discard(asyncio.current_task())
+
+    async def read_worker(self, shard, process):
+        """
+        @brief Deliver the messages answered by a worker until it exits.
+
+        @return void
+        """
+        while True:
+            line = await process.stdout.readline()
+            if not line:
+                break
+            entry = json.loads(line)
+            if "to" in entry:
+                self.deliver(entry)
+            elif "close" in entry:
+                for connection in entry["close"]:
+                    writer = self._writers.get(connection)
+                    if writer is not None:
+                        writer.close()
+            elif entry.get("event") == "round":
+                self.metrics[entry["room"]].round_seconds.append(entry["seconds"])
+            else:
+                self.room_event(shard, entry)
+
+        await process.wait()
+        if self._stopping:
+            return
+        print(f"Worker {shard} exited with code {process.returncode}, restarting it", file=sys.stderr)
+        for connection, room in list(self._connection_rooms.items()):
+            writer = self._writers.get(connection)
+            if writer is not None and self._room_shards.get(room) == shard:
+                self._joins.discard(connection)
+                writer.close()
+        for room, room_shard in list(self._room_shards.items()):
+            if room_shard == shard:
+                del self._room_shards[room]
+                del self._joining[room]
+                self._open_rooms.discard(room)
+        self._shard_rooms[shard] = 0
+        await self.spawn(shard)
+
+    def room_event(self, shard, entry):
+        """
+        @brief Track the rooms opened, joined and dropped by a worker.
+
+        @return void
+        """
+        event, room = entry["event"], entry["room"]
+        if event == "opened":
+            self._open_rooms.add(room)
+            self.metrics[room] = RoomMetrics(room, shard)
+        elif event == "joined":
+            if self.end_join(entry["conn"], room) and entry["conn"] in self._writers:
+                metrics = self._joined[entry["conn"]] = self.metrics[room]
+                metrics.connections += 1
+        elif event == "rejected":
+            self.end_join(entry["conn"], room)
+            if room not in self._open_rooms:
+                # The room was never created, so no "closed" event will release it
+                self.release_room(room)
+        elif event == "finished":
+            self.finish_room(room)
+        elif event == "closed":
+            print(self.metrics[room].report_line() + ", closed", file=sys.stderr)
+            self.release_room(room)
+
+    def deliver(self, entry):
+        """
+        @brief Write a worker message to its clients, and measure the latency of answers.
+
+        @return void
+        """
+        data = encode(entry["message"])
+        for connection in entry["to"]:
+            writer = self._writers.get(connection)
+            if writer is None:
+                continue
+            writer.write(data)
+            if entry["reply"]:
+                pending = self._pending.get(connection)
+                metrics = self._joined.get(connection)
+                if pending:
+                    latency = time.perf_counter() - pending.popleft()
+                    if metrics is not None:
+                        metrics.record_answer(entry["message"], latency)
+
+    def end_join(self, connection, room):
+        """
+        @brief Stop counting the pending join of a connection, once answered or disconnected.
+
+        @return bool: True if the join was still pending.
+        """
+        if connection not in self._joins:
+            return False
+        self._joins.discard(connection)
+        self._joining[room] -= 1
+        return True
+
+    def finish_room(self, room):
+        """
+        @brief Release a finished room, log its summary and update the metrics file.
+
+        @return void
+        """
+        metrics = self.metrics[room]
+        metrics.finished = True
+        self.release_room(room)
+        print(metrics.report_line() + ", finished", file=sys.stderr)
+        self.write_metrics()
+
+    def release_room(self, room):
+        """
+        @brief Forget a room that is no longer hosted, and release its worker once no join is pending.
+
+        @return void
+        """
+        self._open_rooms.discard(room)
+        if not self._joining[room]:
+            shard = self._room_shards.pop(room, None)
+            if shard is not None:
+                self._shard_rooms[shard] -= 1
+            del self._joining[room]
+
+    def report(self):
+        """
+        @brief Log a summary line for every active room that received votes since the last report.
+
+        @return void
+        """
+        for metrics in self.metrics.values():
+            if not metrics.finished and metrics.votes != metrics._reported_votes:
+                metrics._reported_votes = metrics.votes
+                print(metrics.report_line(), file=sys.stderr)
+        self.write_metrics()
+
+    def write_metrics(self):
+        """
+        @brief Write the metrics of every room to the metrics file, if one is set.
+
+        @return void
+        """
+        if self.metrics_path:
+            write_json_atomic(self.metrics_path, {room: metrics.summary() for room, metrics in self.metrics.items()})
+
+
+async def serve(gateway, host, port, rooms=None, metrics_interval=10.0):
+    """
+    @brief Run the gateway until the process is interrupted.
+
+    @param gateway The RoomGateway.
+    @param host Address to listen on.
+    @param port Port to listen on.
+    @param rooms Mapping of room name to configuration, for rooms created up front.
+    @param metrics_interval Seconds between two metrics reports.
+
+    @return void
+    """
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signal_number, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    await gateway.start()
+    for room, config in (rooms or {}).items():
+        await gateway.create_room(room, config)
+
+    listener = await asyncio.start_server(gateway.handle_client, host, port, limit=STREAM_LIMIT)
+    print(f"Listening on {host}:{port} with {gateway.worker_count} workers", file=sys.stderr)
+    async with listener:
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), metrics_interval)
+            except asyncio.TimeoutError:
+                gateway.report()
+    await gateway.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve many Planning Poker rooms from a pool of worker processes.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes.")
+    parser.add_argument("--rooms", help="JSON file mapping room names to their configuration.")
+    parser.add_argument("--metrics", help="Keep the metrics of every room in this JSON file.")
+    parser.add_argument("--metrics-interval", type=float, default=10.0, help="Seconds between two metrics reports.")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        worker_main()
+        return 0
+
+    rooms = None
+    try:
+        if args.workers < 1:
+            raise ValueError("At least one worker is needed.")
+        if args.rooms:
+            with open(args.rooms, "r", encoding="utf-8") as file:
+                rooms = json.load(file)
+            if not isinstance(rooms, dict):
+                raise ValueError("The rooms file must map room names to their configuration.")
+            # Backlog paths are only read for the rooms of the server, never for a room created by a client
+            for config in rooms.values():
+                if isinstance(config, dict) and isinstance(config.get("features"), str):
+                    config["features"] = import_backlog(config["features"])
+    except (OSError, ValueError) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 2
+
+    asyncio.run(serve(RoomGateway(args.workers, args.metrics), args.host, args.port, rooms, args.metrics_interval))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+# rule_registry.py
+import importlib
+
+
+class RuleRegistry:
+    """
+    @file rule_registry.py
+    @brief Registry of the voting rules, imported only when first used.
+
+    @details
+    The RuleRegistry class maps the display name of each rule to the import path of its class, written
+    "module:ClassName". Listing the rules, or checking a name, only reads these paths; a rule module is imported
+    the first time a rule of that class is created, so startup does not pay for the rules nobody picks.
+    Rules are looked up by display name, or by class name as written in progress files.
+
+    Adding a rule is one `register` call with the path of a StatsRule subclass.
+
+    @code
+    RULES.register("Mode (3/4)", "my_rules:ThreeQuartersModeRule")
+    rule = RULES.create("Median", bus)
+    @endcode
+    """
+    def __init__(self):
+        """
+        @brief Constructor for the RuleRegistry class.
+        """
+        self._paths = {}
+        self._classes = {}
+
+    def register(self, name, path):
+        """
+        @brief Register a rule.
+
+        @param name Display name of the rule.
+        @param path Import path of the rule class, "module:ClassName", or the class itself.
+
+        @return void
+        """
+        if isinstance(path, type):
+            self._classes[name] = path
+            path = f"{path.__module__}:{path.__name__}"
+        if ":" not in path:
+            raise ValueError(f"Invalid rule path: {path}")
+        self._paths[name] = path
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __contains__(self, name):
+        return self.display_name(name) is not None
+
+    def class_name(self, name):
+        """
+        @brief Return the class name of a registered rule, without importing it.
+        """
+        return self._paths[name].split(":", 1)[1]
+
+    def display_name(self, name):
+        """
+        @brief Return the display name of a rule given by display name or class name, or None if unknown.
+        """
+        if name in self._paths:
+            return name
+        for display_name in self._paths:
+            if self.class_name(display_name) == name:
+                return display_name
+        return None
+
+    def choices(self):
+        """
+        @brief Return every accepted rule name: display names, then class names.
+
+        @return list: The names.
+        """
+        return list(self._paths) + [self.class_name(name) for name in self._paths]
+
+    def load(self, name):
+        """
+        @brief Return the class of a rule, importing its module on first use.
+
+        @param name Display name or class name of the rule.
+
+        @return type: The rule class.
+        """
+        display_name = self.display_name(name)
+        if display_name is None:
+            raise ValueError(f"Unknown rule: {name}")
+        rule_class = self._classes.get(display_name)
+        if rule_class is None:
+            module_name, class_name = self._paths[display_name].split(":", 1)
+            rule_class = getattr(importlib.import_module(module_name), class_name)
+            self._classes[display_name] = rule_class
+        return rule_class
+
+    def create(self, name, bus=None):
+        """
+        @brief Create a rule.
+
+        @param name Display name or class name of the rule.
+        @param bus Optional EventBus the rule publishes to.
+
+        @return A new rule instance.
+        """
+        return self.load(name)(bus)
+
+
+RULES = RuleRegistry()
+RULES.register("Strict (Unanimity)", "strict_rule:StrictRule")
+RULES.register("Average", "average_rule:AverageRule")
+RULES.register("Median", "median_rule:MedianRule")
+RULES.register("Absolute Majority", "majority_rule:MajorityRule")
+RULES.register("Mode (2/3)", "mode_rule:ModeRule")
@@ -0,0 +1,558 @@
+# session.py
+import json
+
+from vote_store import VoteStore
+from persistence import write_json_atomic
+from event_bus import EventBus, VoteCast, SessionStarted, RoundClosed
+from rule_registry import RULES
+from deck import DEFAULT_DECK
+from metrics import METRICS
+
+
+def make_rule(rule_name, bus=None):
+    """
+    @brief Create a rule from its name.
+
+    @param rule_name A name from `RULES`, or the rule class name as written in progress files.
+    @param bus Optional EventBus the rule publishes to.
+
+    @return A new rule instance.
+    """
+    return RULES.create(rule_name, bus)
+
+
+def check_unique_features(features):
+    """
+    @brief Reject a backlog listing the same feature title twice.
+
+    @param features List of features.
+
+    @return void
+    """
+    seen = set()
+    for feature in features:
+        if feature in seen:
+            raise ValueError(f"Duplicate feature: {feature}. Feature titles must be unique.")
+        seen.add(feature)
+
+
+class PlanningPokerSession:
+    """
+    @file session.py
+    @brief Headless Planning Poker session engine.
+
+    @details
+    The PlanningPokerSession class holds the whole state of an estimation session without any dependency on Tkinter:
+    players, features, the selected rule, the vote store and the player/feature cursor of the current round.
+    It implements the session lifecycle (add players, load features, pick a rule, cast votes, evaluate, save and load),
+    so the same sessions can be driven by the GUI, by scripts or by the command-line entry point.
+
+    @note
+    Invalid operations raise ValueError with a message meant to be shown to the user.
+    The session publishes VoteCast, SessionStarted and RoundClosed events to its `bus`, and its rule publishes
+    feature status changes to the same bus.
+    Votes are validated and encoded as card codes of the session's deck once, when they are recorded; the vote store,
+    the rules and the events hold codes, and card labels are only used in files and on screen.
+
+    @code
+    session = PlanningPokerSession()
+    session.set_players(["Alice", "Bob"])
+    session.load_features(["Login page"])
+    session.set_rule("Average")
+    session.start()
+    session.cast_vote("3")
+    session.cast_vote("5")
+    session.evaluate()
+    @endcode
+
+    @see
+    For additional information on how to use this class, refer to the documentation of its methods.
+    """
+    def __init__(self, bus=None, deck=DEFAULT_DECK):
+        """
+        @brief Constructor for the PlanningPokerSession class.
+
+        @param bus The EventBus to publish to; a new one is created by default.
+        @param deck The Deck of cards players vote with.
+        """
+        self.bus = bus if bus is not None else EventBus()
+        self.deck = deck
+        self.players = []
+        self.features = []
+        self.rules = None
+        self.votes = VoteStore()
+        self.round_features = []
+        self._round_feature_set = set()
+        self.feature_rounds = {}
+        self.round_votes_left = 0
+        self.current_player_index = 0
+        self.current_feature_index = 0
+        self.finished = False
+        self.journal = None
+
+    def _log(self, event):
+        # Append the event to the session journal, if one is attached
+        if self.journal is not None:
+            self.journal.record(self, event)
+
+    def set_players(self, players):
+        """
+        @brief Replace the list of players.
+
+        @param players Iterable of player names. Names are stripped and must be unique and non-empty.
+
+        @return void
+        """
+        names = [str(name).strip() for name in players]
+        if not names or not all(names):
+            raise ValueError("No players entered.")
+        if len(set(names)) != len(names):
+            raise ValueError("Player names must be unique.")
+        self.players = names
+        self._log({"type": "players", "players": names})
+
+    def add_player(self, player):
+        """
+        @brief Add a single player to the session.
+
+        @param player The player name.
+
+        @return void
+        """
+        self.set_players(self.players + [player])
+
+    def load_features(self, features):
+        """
+        @brief Replace the list of features (backlog).
+
+        Votes are keyed by feature title, so titles must be unique.
+
+        @param features List of features.
+
+        @return void
+        """
+        if not isinstance(features, list):
+            raise ValueError("Features must be a JSON list.")
+        if not features:
+            raise ValueError("No features entered.")
+        for feature in features:
+            if not isinstance(feature, str) or not feature.strip():
+                raise ValueError(f"Invalid feature: {json.dumps(feature)}. Features must be non-empty titles.")
+        check_unique_features(features)
+        self.features = features
+        self._log({"type": "features", "features": features})
+
+    def load_features_json(self, features_input):
+        """
+        @brief Replace the list of features from a JSON document.
+
+        @param features_input Features in JSON format.
+
+        @return void
+        """
+        if not features_input.strip():
+            raise ValueError("No features entered.")
+        try:
+            features = json.loads(features_input)
+        except json.decoder.JSONDecodeError:
+            raise ValueError("Invalid JSON format. Please enter features in correct JSON format.")
+        self.load_features(features)
+
+    def set_rule(self, rule_name):
+        """
+        @brief Select the voting rule, feeding it the votes already collected.
+
+        @param rule_name A name from `RULES`, or the rule class name as written in progress files.
+
+        @return void
+        """
+        self.rules = make_rule(rule_name, self.bus)
+        self.rules.reset()
+        for (_, feature), vote in self.votes.items():
+            self.rules.add_vote(feature, vote)
+        self._log({"type": "rule", "rules": self.rule_name})
+
+    @property
+    def rule_name(self):
+        """
+        @brief Class name of the selected rule, or None.
+        """
+        return self.rules.__class__.__name__ if self.rules else None
+
+    def is_ready(self):
+        """
+        @brief Check if players, features and a rule are set.
+
+        @return bool: True if voting can start.
+        """
+        return bool(self.players and self.features and self.rules)
+
+    def start(self):
+        """
+        @brief Start the voting process over every feature.
+
+        The vote store and the running rule state are reset before the first round starts.
+
+        @return void
+        """
+        if not self.is_ready():
+            raise ValueError("Please enter players, features, and choose rules before starting voting.")
+        self.votes = VoteStore(self.players, self.features)
+        self.rules.reset()
+        self.finished = False
+        self.feature_rounds = {}
+        self.start_round(self.features)
+        self._log({"type": "start"})
+        self.bus.publish(SessionStarted(self.players, self.features))
+
+    def start_round(self, features):
+        """
+        @brief Start a voting round over the given features.
+
+        Votes and rule state of features outside the round are left untouched, and votes already cast
+        for features of the round count towards its completion. Each feature of the round counts one more round
+        in `feature_rounds`.
+
+        @param features The features to vote on in this round, in voting order.
+
+        @return void
+        """
+        self.round_features = list(features)
+        self._round_feature_set = set(self.round_features)
+        feature_rounds = self.feature_rounds
+        for feature in self.round_features:
+            feature_rounds[feature] = feature_rounds.get(feature, 0) + 1
+        self.round_votes_left = sum(len(self.players) - self.votes.vote_count(feature) for feature in self.round_features)
+        self.current_player_index = 0
+        self.current_feature_index = 0
+
+    def resume_cursor(self):
+        """
+        @brief Move the cursor to the first turn of the current round that has no vote yet.
+
+        Votes are cast player by player and feature by feature, so this is the turn the round stopped at.
+
+        @return void
+        """
+        self.current_player_index = 0
+        self.current_feature_index = 0
+        for feature_index, feature in enumerate(self.round_features):
+            if self.votes.is_feature_complete(feature):
+                continue
+            for player_index, player in enumerate(self.players):
+                if self.votes.get_vote(player, feature) is None:
+                    self.current_player_index = player_index
+                    self.current_feature_index = feature_index
+                    return
+
+    def current_turn(self):
+        """
+        @brief Return the player and feature whose turn it is.
+
+        @return tuple: `(player, feature)`, or None when no round is in progress.
+        """
+        if self.finished or not self.round_features:
+            return None
+        return self.players[self.current_player_index], self.round_features[self.current_feature_index]
+
+    def is_round_complete(self):
+        """
+        @brief Check if every vote of the current round is collected.
+
+        @return bool: True if the round can be evaluated.
+        """
+        return self.round_votes_left <= 0
+
+    @METRICS.timed("planning_poker_session_seconds", operation="record_vote")
+    def record_vote(self, player, feature, vote):
+        """
+        @brief Store a vote and feed it to the selected rule.
+
+        @param player The player casting the vote.
+        @param feature The feature being voted on; it must belong to the current round.
+        @param vote The card played: a card label as typed or clicked, or a card code.
+
+        @return str: The status of the feature after the vote ("pending", "converged" or "diverged").
+        """
+        if self.rules is None:
+            raise ValueError("Please choose rules before voting.")
+        if not self.votes.has_player(player):
+            raise ValueError(f"Unknown player: {player}")
+        if feature not in self._round_feature_set:
+            raise ValueError(f"Feature is not part of the current round: {feature}")
+        code = self.deck.encode(vote)
+        previous = self.votes.set_vote(player, feature, code)
+        if previous is None:
+            self.round_votes_left -= 1
+        status = self.rules.add_vote(feature, code, previous)
+        self._log({"type": "vote", "player": player, "feature": feature, "vote": self.deck.label(code)})
+        self.bus.publish(VoteCast(player, feature, code, previous, status))
+        return status
+
+    def vote_label(self, player, feature):
+        """
+        @brief Return the label of the card a player played on a feature, or None.
+        """
+        code = self.votes.get_vote(player, feature)
+        return None if code is None else self.deck.label(code)
+
+    def cast_vote(self, vote):
+        """
+        @brief Record the vote of the current turn and move the cursor to the next turn.
+
+        @param vote The vote value.
+
+        @return str: The status of the voted feature after the vote.
+        """
+        turn = self.current_turn()
+        if turn is None:
+            raise ValueError("No voting round in progress.")
+        player, feature = turn
+        status = self.record_vote(player, feature, vote)
+        self.advance_turn()
+        return status
+
+    def pending_features(self, player):
+        """
+        @brief Return the features of the current round a player has not voted on yet.
+
+        @param player The player.
+
+        @return list: The features, in round order.
+        """
+        return [feature for feature in self.round_features if self.votes.get_vote(player, feature) is None]
+
+    @METRICS.timed("planning_poker_session_seconds", operation="cast_votes")
+    def cast_votes(self, player, votes):
+        """
+        @brief Record the votes of one player on a batch of features of the current round, in any order.
+
+        Unlike `cast_vote`, the batch does not follow the player/feature cursor: every player can vote on every
+        feature of the round independently, and each feature is complete as soon as its own votes are all in.
+        The batch is checked before any vote is stored, so an invalid batch records nothing.
+        Empty votes are skipped. The cursor is left untouched; `resume_cursor` puts it back on the first missing turn.
+
+        @param player The player casting the votes.
+        @param votes Mapping of feature to vote value.
+
+        @return dict: Mapping of each voted feature to its status after the vote.
+        """
+        if self.finished or not self.round_features:
+            raise ValueError("No voting round in progress.")
+        if not self.votes.has_player(player):
+            raise ValueError(f"Unknown player: {player}")
+        ballot = {}
+        for feature, vote in votes.items():
+            if not str(vote).strip():
+                continue
+            if feature not in self._round_feature_set:
+                raise ValueError(f"Feature is not part of the current round: {feature}")
+            ballot[feature] = self.deck.encode(vote)
+        return {feature: self.record_vote(player, feature, code) for feature, code in ballot.items()}
+
+    def advance_turn(self):
+        """
+        @brief Move the cursor to the next player, then to the next feature of the round.
+
+        @return void
+        """
+        self.current_player_index += 1
+        if self.current_player_index == len(self.players):
+            self.current_player_index = 0
+            self.current_feature_index += 1
+        if self.current_feature_index == len(self.round_features):
+            self.current_feature_index = 0
+
+    @METRICS.timed("planning_poker_session_seconds", operation="evaluate")
+    def evaluate(self):
+        """
+        @brief Evaluate the votes and start a re-vote round over the features that did not converge.
+
+        @return list: The features sent back to the players, in backlog order. Empty when the session is finished.
+        """
+        if self.rules.verdict():
+            self.finished = True
+            self.start_round([])
+            self._log({"type": "evaluate", "revote": []})
+            self.bus.publish(RoundClosed([], True))
+            return []
+
+        failing_features = self.rules.failing_features()
+        revote_features = [feature for feature in self.features if feature in failing_features]
+        for feature in revote_features:
+            self.votes.clear_feature(feature)
+            self.rules.reset_feature(feature)
+        self.start_round(revote_features)
+        self._log({"type": "evaluate", "revote": revote_features})
+        self.bus.publish(RoundClosed(revote_features, False))
+        return revote_features
+
+    def feature_estimate(self, feature):
+        """
+        @brief Return the estimate of a feature according to the selected rule.
+
+        The rule reads it from its running statistics (the average, the median or the agreed card). Without a rule,
+        the estimate is the average of the numeric votes.
+
+        @param feature The feature.
+
+        @return float: The estimate, or None if the feature has no numeric vote.
+        """
+        if self.rules is not None:
+            return self.rules.estimate(feature)
+        return self.average_vote(feature)
+
+    def average_vote(self, feature):
+        """
+        @brief Return the average of the numeric votes of a feature, leaving out coffee and "?" cards.
+
+        @param feature The feature.
+
+        @return float: The average, or None if the feature has no numeric vote.
+        """
+        values = [self.deck.value(code) for code in self.votes.iter_feature_votes(feature)]
+        values = [value for value in values if value is not None]
+        return sum(values) / len(values) if values else None
+
+    def feature_status(self, feature):
+        """
+        @brief Describe the progress of a feature for display.
+
+        @param feature The feature.
+
+        @return str: "pending" before any vote, "voted n/m" while votes are missing, then the rule status
+        ("converged" or "diverged"), and the estimate once the session is finished.
+        """
+        count = self.votes.vote_count(feature)
+        if not count:
+            return "pending"
+        if count < len(self.players):
+            return f"voted {count}/{len(self.players)}"
+        status = self.rules.feature_status(feature) if self.rules else "voted"
+        if status == "converged" and self.finished:
+            estimate = self.feature_estimate(feature)
+            if estimate is not None:
+                return f"estimate {estimate:g}"
+        return status
+
+    def is_unanimous_for_all_features(self):
+        """
+        @brief Check if all features have received unanimous votes from all players.
+
+        Missing votes count as an empty vote, so a feature is only unanimous once every player voted the same.
+
+        @return bool: True if unanimous for all features, False otherwise.
+        """
+        from strict_rule import StrictRule
+
+        for feature in self.features:
+            feature_votes = {player: self.votes.get_vote(player, feature, '') for player in self.players}
+            if not StrictRule._check_unanimous(feature_votes):
+                return False
+        return True
+
+    def difficulty_estimations(self):
+        """
+        @brief Compute the average vote of each feature.
+
+        Only numeric votes are averaged: missing votes, coffee and "?" cards are left out.
+
+        @return dict: Mapping of feature to average vote, or None for a feature without numeric vote.
+        """
+        return {feature: self.average_vote(feature) for feature in self.features}
+
+    @METRICS.timed("planning_poker_session_seconds", operation="to_dict")
+    def to_dict(self):
+        """
+        @brief Export the players, features, rule and collected votes as JSON-compatible data.
+
+        The lists and mappings are copies, so the data can be written from another thread while the session goes on.
+
+        @return dict: The progress data.
+        """
+        return {
+            "players": list(self.players),
+            "features": list(self.features),
+            "rules": self.rule_name,
+            "votes": {feature: {player: self.deck.label(code) for player, code in feature_votes.items()}
+                      for feature, feature_votes in self.votes.to_dict().items()},
+            "round_features": list(self.round_features),
+            "feature_rounds": dict(self.feature_rounds),
+            "finished": self.finished
+        }
+
+    @METRICS.timed("planning_poker_session_seconds", operation="load_dict")
+    def load_dict(self, progress_data):
+        """
+        @brief Restore players, features, rule, collected votes and the current round from progress data.
+
+        The cursor is put back on the first turn of the round that has no vote yet. Files written before rounds
+        were saved resume with a round over every feature that is missing votes.
+
+        @param progress_data Data produced by `to_dict`.
+
+        @return void
+        """
+        self.players = progress_data.get("players", [])
+        self.features = progress_data.get("features", [])
+        check_unique_features(self.features)
+        rules_type = progress_data.get("rules", "")
+        self.rules = make_rule(rules_type, self.bus) if rules_type else None
+
+        votes = {feature: {player: self.deck.encode(vote) for player, vote in feature_votes.items()}
+                 for feature, feature_votes in progress_data.get("votes", {}).items()}
+        self.votes = VoteStore.from_dict(votes, self.players, self.features)
+        if self.rules:
+            self.rules.reset()
+            for (_, feature), vote in self.votes.items():
+                self.rules.add_vote(feature, vote)
+        self.finished = progress_data.get("finished", False)
+        round_features = progress_data.get("round_features")
+        if round_features is None:
+            round_features = [feature for feature in self.features if not self.votes.is_feature_complete(feature)]
+        self.feature_rounds = {}
+        self.start_round(round_features)
+        feature_rounds = progress_data.get("feature_rounds")
+        if feature_rounds is not None:
+            self.feature_rounds = dict(feature_rounds)
+        else:
+            # Older files do not count rounds: a voted feature was voted on at least once
+            for feature in self.features:
+                if self.votes.vote_count(feature):
+                    self.feature_rounds.setdefault(feature, 1)
+        self.resume_cursor()
+
+    @METRICS.timed("planning_poker_session_seconds", operation="save")
+    def save(self, file_path):
+        """
+        @brief Save the progress to a JSON file.
+
+        @param file_path Path of the file to write.
+
+        @return void
+        """
+        if not self.is_ready():
+            raise ValueError("Nothing to save. Please enter players, features, and choose rules before saving.")
+        write_json_atomic(file_path, self.to_dict())
+
+    @METRICS.timed("planning_poker_session_seconds", operation="load")
+    def load(self, file_path):
+        """
+        @brief Load the progress from a JSON file written by `save`.
+
+        @param file_path Path of the file to read.
+
+        @return void
+        """
+        with open(file_path, "r") as file:
+            self.load_dict(json.load(file))
+
+    def save_difficulty_estimations(self, file_path):
+        """
+        @brief Save the difficulty estimations to a JSON file.
+
+        @param file_path Path of the file to write.
+
+        @return void
+        """
+        write_json_atomic(file_path, self.difficulty_estimations())
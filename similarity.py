@@ -0,0 +1,262 @@
+# similarity.py
+"""
+@file similarity.py
+@brief Suggest the estimates of similar past features from an inverted TF-IDF index.
+
+@details
+FeatureIndex indexes feature titles by their words and by the character trigrams of their words, so "log in page"
+still finds "Login page" and typos cost little. Every term has a posting list mapping each document that contains
+it to the term frequency. A query runs in two steps, so its cost is bounded whatever the size of the index:
+- candidates: the posting lists of the query terms are walked from the rarest term up, accumulating TF-IDF dot
+  products, until a budget of postings is spent. Common terms, like trigrams shared by half the titles, weigh
+  little and would cost the most, so they are the ones left out;
+- ranking: the best candidates get their exact cosine similarity from their own term counts, and the best k are
+  returned.
+
+Documents are added incrementally: past estimates are loaded from the estimation history (history.py), and
+`attach(session)` adds the features of a session when it finishes. A title added again only updates its estimate.
+
+@note
+Document norms depend on the inverse document frequencies, which move as documents are added. A new document
+gets its norm with the current frequencies, and every norm is recomputed once the index grew by a tenth since the
+last recomputation, so adding stays amortized O(terms of the title) and queries never recompute norms.
+
+@code
+index = FeatureIndex.from_history(history)
+index.attach(session)
+index.similar("Login page with SSO", k=5)
+@endcode
+"""
+import argparse
+import collections
+import heapq
+import json
+import math
+import operator
+import re
+import sys
+
+from event_bus import RoundClosed
+from history import EstimationHistory, HISTORY_PATH
+
+Suggestion = collections.namedtuple("Suggestion", "feature estimate score")
+
+_WORD = re.compile(r"\w+")
+
+
+def title_terms(title):
+    """
+    @brief Return the terms of a title and their frequencies.
+
+    Terms are the lowercase words, prefixed with "w:", and the trigrams of each word padded with spaces.
+
+    @param title The feature title.
+
+    @return collections.Counter: Mapping of term to frequency.
+    """
+    words = _WORD.findall(title.lower())
+    terms = ["w:" + word for word in words]
+    for word in words:
+        padded = f" {word} "
+        terms.extend(padded[start:start + 3] for start in range(len(padded) - 2))
+    return collections.Counter(terms)
+
+
+class FeatureIndex:
+    """
+    @brief Inverted TF-IDF index of past feature titles and their estimates.
+
+    @par Attributes:
+    - candidate_postings: Number of postings a query may walk to find candidates.
+    - candidates: Number of candidates ranked by exact similarity.
+    """
+    def __init__(self, candidate_postings=5000, candidates=200):
+        """
+        @brief Constructor for the FeatureIndex class.
+
+        @param candidate_postings Number of postings a query may walk to find candidates.
+        @param candidates Number of candidates ranked by exact similarity.
+        """
+        self.candidate_postings = candidate_postings
+        self.candidates = candidates
+        self._postings = {}
+        self._titles = []
+        self._estimates = []
+        self._terms = []
+        self._norms = []
+        self._documents = {}
+        self._normalized_count = 0
+        self._subscriptions = []
+
+    def __len__(self):
+        return len(self._titles)
+
+    def _idf(self, document_frequency):
+        return math.log((len(self._titles) + 1) / (document_frequency + 1)) + 1
+
+    def _norm(self, terms):
+        postings = self._postings
+        return math.sqrt(sum((frequency * self._idf(len(postings[term]))) ** 2 for term, frequency in terms.items()))
+
+    def add(self, title, estimate):
+        """
+        @brief Index a feature and its final estimate, or update the estimate of a title already indexed.
+
+        @param title The feature title.
+        @param estimate The final estimate, or None.
+
+        @return void
+        """
+        self.add_many([(title, estimate)])
+
+    def add_many(self, features):
+        """
+        @brief Index several features, recomputing the norms at most once.
+
+        @param features Iterable of `(title, estimate)` pairs; a later pair for the same title wins.
+
+        @return void
+        """
+        added = []
+        for title, estimate in features:
+            key = " ".join(_WORD.findall(title.lower()))
+            document = self._documents.get(key)
+            if document is not None:
+                self._titles[document] = title
+                self._estimates[document] = estimate
+                continue
+            terms = title_terms(title)
+            if not terms:
+                continue
+
+            document = len(self._titles)
+            self._documents[key] = document
+            self._titles.append(title)
+            self._estimates.append(estimate)
+            self._terms.append(terms)
+            self._norms.append(0.0)
+            added.append(document)
+            for term, frequency in terms.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                postings[document] = frequency
+
+        if len(self._titles) > self._normalized_count * 1.1:
+            count = len(self._titles)
+            idf = {term: math.log((count + 1) / (len(postings) + 1)) + 1 for term, postings in self._postings.items()}
+            self._norms = [math.sqrt(sum((frequency * idf[term]) ** 2 for term, frequency in terms.items()))
+                           for terms in self._terms]
+            self._normalized_count = count
+        else:
+            for document in added:
+                self._norms[document] = self._norm(self._terms[document])
+
+    def similar(self, title, k=5, min_score=0.1):
+        """
+        @brief Return the indexed features most similar to a title.
+
+        @param title The title to look up.
+        @param k Maximum number of suggestions.
+        @param min_score Minimum cosine similarity, between 0 and 1.
+
+        @return list: Suggestion tuples `(feature, estimate, score)`, most similar first.
+        """
+        # Query weights already multiplied by the idf of the document side
+        weights = {}
+        query_norm = 0.0
+        for term, frequency in title_terms(title).items():
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            idf = self._idf(len(postings))
+            query_norm += (frequency * idf) ** 2
+            weights[term] = frequency * idf * idf
+        if not weights:
+            return []
+        query_norm = math.sqrt(query_norm)
+
+        scores = collections.defaultdict(float)
+        walked = 0
+        complete = True
+        for term in sorted(weights, key=lambda term: len(self._postings[term])):
+            postings = self._postings[term]
+            if walked and walked + len(postings) > self.candidate_postings:
+                complete = False
+                break
+            walked += len(postings)
+            weight = weights[term]
+            for document, frequency in postings.items():
+                scores[document] += weight * frequency
+
+        if not complete:
+            # Rank the best candidates on every query term
+            candidates = heapq.nlargest(self.candidates, scores.items(), key=operator.itemgetter(1))
+            document_terms = self._terms
+            scores = {document: sum(weight * document_terms[document].get(term, 0) for term, weight in weights.items())
+                      for document, _ in candidates}
+
+        norms = self._norms
+        best = heapq.nlargest(k, ((score / (query_norm * norms[document]), document)
+                                  for document, score in scores.items()))
+        return [Suggestion(self._titles[document], self._estimates[document], score)
+                for score, document in best if score >= min_score]
+
+    @classmethod
+    def from_history(cls, history, **kwargs):
+        """
+        @brief Build an index from the latest numeric estimate of every feature of an EstimationHistory.
+
+        @param history The EstimationHistory to read.
+
+        @return FeatureIndex: The index.
+        """
+        index = cls(**kwargs)
+        # Oldest first, so a title estimated several times keeps its latest estimate
+        index.add_many((row["feature"], row["estimate"]) for row in reversed(history.estimates())
+                       if row["estimate"] is not None)
+        return index
+
+    def attach(self, session):
+        """
+        @brief Index the features of a session with their numeric estimates when the session finishes.
+
+        @param session The PlanningPokerSession to follow.
+
+        @return void
+        """
+        def index_session(event):
+            if event.finished:
+                estimates = ((feature, session.feature_estimate(feature)) for feature in session.features)
+                self.add_many((feature, estimate) for feature, estimate in estimates if estimate is not None)
+
+        self._subscriptions.append((session.bus, session.bus.subscribe(RoundClosed, index_session)))
+
+    def detach(self):
+        """
+        @brief Stop following the attached sessions.
+
+        @return void
+        """
+        for bus, subscription in self._subscriptions:
+            bus.unsubscribe(subscription)
+        self._subscriptions = []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suggest estimates from the most similar past features.")
+    parser.add_argument("title", help="Title of the feature to estimate.")
+    parser.add_argument("--db", default=HISTORY_PATH, help="History database.")
+    parser.add_argument("-k", type=int, default=5, help="Number of suggestions.")
+    args = parser.parse_args(argv)
+
+    history = EstimationHistory(args.db)
+    index = FeatureIndex.from_history(history)
+    history.close()
+    json.dump([suggestion._asdict() for suggestion in index.similar(args.title, args.k)], sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,339 @@
+# simulator.py
+"""
+@file simulator.py
+@brief Seeded load simulator driving synthetic Planning Poker sessions through the voting rules.
+
+@details
+Every simulated session gets random players and a random backlog, then goes through the same path as a real one:
+`PlanningPokerSession.record_vote` for every vote, then `PlanningPokerSession.evaluate` (the logic behind the GUI's
+`evaluate_votes`) after each round, until the rule reaches its verdict or `--max-rounds` rounds were played.
+
+Each feature has a hidden true card, and the votes of a round follow a profile:
+- consensus: most players play the true card, the others a neighbouring card;
+- bimodal: the team splits into two camps a few cards apart;
+- outliers: like consensus, with some votes on the extreme cards;
+- coffee: like consensus, with some coffee and "?" cards.
+
+Teams agree more after each discussion: in round r, a player plays the true card with probability 1 - 1/2^(r-1)
+instead of drawing from the profile, so every profile converges in a few rounds under every rule.
+
+Every session has its own random generator seeded from `--seed` and its index, so a replay with the same seed plays
+the same votes and reaches the same estimates, whatever the number of `--workers` processes sharing the sessions;
+the report carries a digest of the outcomes, in session order, to check it.
+
+The report gives, per rule and profile, the throughput, the rounds to consensus, the percentiles of the time spent
+per session and the peak memory allocated by a session. Timing and memory are measured in separate runs, as in
+bench_rules.py, because tracemalloc slows allocations down.
+
+@code
+python simulator.py --sessions 5000 --seed 42 --output simulation.json
+python simulator.py --rules Average --profiles bimodal,coffee --players 10-30 --features 50-200
+@endcode
+"""
+import argparse
+import gc
+import hashlib
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from session import PlanningPokerSession, RULES
+from deck import DEFAULT_DECK, COFFEE, UNKNOWN
+from metrics import METRICS
+
+# Card codes of the numeric cards, in increasing value
+NUMERIC_CODES = [code for code, value in enumerate(DEFAULT_DECK.values) if value is not None]
+# True cards of the features: 1 to 20, the range a team actually estimates in
+TRUE_CODES = [code for code in NUMERIC_CODES if 1 <= DEFAULT_DECK.values[code] <= 20]
+DEFAULT_RULES = "AverageRule,StrictRule"
+# Number of sessions replayed under tracemalloc per rule and profile
+MEMORY_SAMPLE = 50
+
+
+def neighbour(rng, code):
+    # A numeric card next to the given one
+    index = NUMERIC_CODES.index(code) + rng.choice((-1, 1))
+    return NUMERIC_CODES[min(max(index, 0), len(NUMERIC_CODES) - 1)]
+
+
+def consensus_vote(rng, true_code, player_index):
+    return true_code if rng.random() < 0.8 else neighbour(rng, true_code)
+
+
+def bimodal_vote(rng, true_code, player_index):
+    if player_index % 2 == 0:
+        return true_code
+    index = NUMERIC_CODES.index(true_code) + 3
+    return NUMERIC_CODES[min(index, len(NUMERIC_CODES) - 1)]
+
+
+def outlier_vote(rng, true_code, player_index):
+    if rng.random() < 0.1:
+        return rng.choice((NUMERIC_CODES[0], NUMERIC_CODES[-1]))
+    return consensus_vote(rng, true_code, player_index)
+
+
+def coffee_vote(rng, true_code, player_index):
+    if rng.random() < 0.15:
+        return rng.choice((COFFEE, UNKNOWN))
+    return consensus_vote(rng, true_code, player_index)
+
+
+# Vote generators: function(rng, true_code, player_index) returning a card code
+PROFILES = {
+    "consensus": consensus_vote,
+    "bimodal": bimodal_vote,
+    "outliers": outlier_vote,
+    "coffee": coffee_vote,
+}
+
+
+def parse_range(range_arg):
+    """
+    @brief Parse a `MIN-MAX` range, or a single number.
+
+    @param range_arg The argument.
+
+    @return tuple: `(minimum, maximum)`.
+    """
+    low, _, high = range_arg.partition('-')
+    low = int(low)
+    high = int(high) if high else low
+    if not 1 <= low <= high:
+        raise ValueError(f"Invalid range: {range_arg}")
+    return low, high
+
+
+def simulate_session(rule, profile, seed, players_range, features_range, max_rounds):
+    """
+    @brief Play one synthetic session to its end.
+
+    @param rule Name of the rule, from `RULES`.
+    @param profile Name of the vote profile, from `PROFILES`.
+    @param seed Seed of the random generator of this session.
+    @param players_range `(minimum, maximum)` number of players.
+    @param features_range `(minimum, maximum)` number of features.
+    @param max_rounds Rounds played before the session is given up.
+
+    @return tuple: `(rounds, finished, votes, estimates)`, where `estimates` lists the final estimate of every
+    feature in backlog order.
+    """
+    rng = random.Random(seed)
+    vote = PROFILES[profile]
+    players = [f"player{index}" for index in range(rng.randint(*players_range))]
+    features = [f"feature{index}" for index in range(rng.randint(*features_range))]
+    true_codes = {feature: rng.choice(TRUE_CODES) for feature in features}
+
+    session = PlanningPokerSession()
+    session.set_players(players)
+    session.load_features(features)
+    session.set_rule(rule)
+    session.start()
+
+    rounds = 0
+    votes = 0
+    while not session.finished and rounds < max_rounds:
+        rounds += 1
+        agreement = 1 - 0.5 ** (rounds - 1)
+        for feature in session.round_features:
+            true_code = true_codes[feature]
+            for player_index, player in enumerate(players):
+                code = true_code if rng.random() < agreement else vote(rng, true_code, player_index)
+                session.record_vote(player, feature, code)
+        votes += len(session.round_features) * len(players)
+        session.evaluate()
+    return rounds, session.finished, votes, [session.feature_estimate(feature) for feature in features]
+
+
+def percentile(sorted_values, fraction):
+    """
+    @brief Return the nearest-rank percentile of sorted values.
+    """
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def session_seed(seed, index):
+    """
+    @brief Return the seed of the session at an index of a simulation.
+    """
+    return seed * 1_000_003 + index
+
+
+def simulate_sessions(rule, profile, seed, first, last, players_range, features_range, max_rounds):
+    """
+    @brief Play the sessions of a range of indexes, and time each one.
+
+    @param first Index of the first session.
+    @param last Index after the last session.
+
+    The other parameters are those of `run_simulation`.
+
+    @return list: One `(seconds, rounds, finished, votes, outcome)` tuple per session, in index order, where
+    `outcome` is the JSON text of the rounds, the verdict and the estimates.
+    """
+    results = []
+    for index in range(first, last):
+        start = time.perf_counter()
+        rounds, finished, votes, estimates = simulate_session(rule, profile, session_seed(seed, index),
+                                                              players_range, features_range, max_rounds)
+        seconds = time.perf_counter() - start
+        results.append((seconds, rounds, finished, votes, json.dumps([rounds, finished, estimates])))
+    return results
+
+
+def run_simulation(rule, profile, sessions, seed, players_range, features_range, max_rounds, executor=None,
+                   workers=1):
+    """
+    @brief Simulate sessions of one rule and profile, and summarize them.
+
+    @param rule Name of the rule.
+    @param profile Name of the vote profile.
+    @param sessions Number of sessions.
+    @param seed Seed of the simulation; session i is seeded from it and i.
+    @param players_range `(minimum, maximum)` number of players.
+    @param features_range `(minimum, maximum)` number of features.
+    @param max_rounds Rounds played before a session is given up.
+    @param executor Optional ProcessPoolExecutor sharing the sessions between its processes.
+    @param workers Number of processes of the executor.
+
+    @return dict: The summary of the simulation. The outcomes do not depend on the number of processes.
+    """
+    arguments = (players_range, features_range, max_rounds)
+    gc.collect()
+    start = time.perf_counter()
+    if executor is None:
+        outcomes = simulate_sessions(rule, profile, seed, 0, sessions, *arguments)
+    else:
+        # A few chunks per process, so a process done early takes another one
+        chunk = max(1, -(-sessions // (workers * 4)))
+        futures = [executor.submit(simulate_sessions, rule, profile, seed, first, min(first + chunk, sessions),
+                                   *arguments)
+                   for first in range(0, sessions, chunk)]
+        outcomes = [outcome for future in futures for outcome in future.result()]
+    elapsed = time.perf_counter() - start
+
+    digest = hashlib.sha256()
+    durations = []
+    rounds_to_consensus = []
+    given_up = 0
+    total_votes = 0
+    for seconds, rounds, finished, votes, outcome in outcomes:
+        durations.append(seconds)
+        total_votes += votes
+        if finished:
+            rounds_to_consensus.append(rounds)
+        else:
+            given_up += 1
+        digest.update(outcome.encode("utf-8"))
+
+    gc.collect()
+    tracemalloc.start()
+    for index in range(min(sessions, MEMORY_SAMPLE)):
+        simulate_session(rule, profile, session_seed(seed, index), *arguments)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    durations.sort()
+    rounds_to_consensus.sort()
+    return {
+        "rule": RULES.class_name(RULES.display_name(rule)),
+        "profile": profile,
+        "sessions": sessions,
+        "seconds": elapsed,
+        "sessions_per_second": sessions / elapsed if elapsed else None,
+        "votes_per_second": total_votes / elapsed if elapsed else None,
+        "rounds_to_consensus": {
+            "mean": sum(rounds_to_consensus) / len(rounds_to_consensus) if rounds_to_consensus else None,
+            "p50": percentile(rounds_to_consensus, 0.5),
+            "p95": percentile(rounds_to_consensus, 0.95),
+            "max": rounds_to_consensus[-1] if rounds_to_consensus else None,
+        },
+        "given_up": given_up,
+        "session_seconds": {
+            "p50": percentile(durations, 0.5),
+            "p95": percentile(durations, 0.95),
+            "p99": percentile(durations, 0.99),
+            "max": durations[-1] if durations else None,
+        },
+        "peak_memory_bytes": peak,
+        "digest": digest.hexdigest(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate Planning Poker sessions to load-test the voting rules.")
+    parser.add_argument("--sessions", type=int, default=1000, help="Sessions per rule and profile.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the simulation.")
+    parser.add_argument("--rules", default=DEFAULT_RULES, help="Comma-separated rule names.")
+    parser.add_argument("--profiles", default=",".join(PROFILES),
+                        help=f"Comma-separated vote profiles among {', '.join(PROFILES)}.")
+    parser.add_argument("--players", default="3-8", help="Number of players per session, MIN-MAX.")
+    parser.add_argument("--features", default="5-15", help="Number of features per session, MIN-MAX.")
+    parser.add_argument("--max-rounds", type=int, default=20, help="Rounds played before a session is given up.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of processes playing the sessions.")
+    parser.add_argument("--output", help="Write the report to this JSON file.")
+    parser.add_argument("--metrics", help="Write the timing histograms to this file, in the Prometheus text format;"
+                                          " with --workers, only the memory runs of the main process are timed.")
+    args = parser.parse_args(argv)
+
+    rules = args.rules.split(',')
+    profiles = args.profiles.split(',')
+    try:
+        players_range = parse_range(args.players)
+        features_range = parse_range(args.features)
+        for rule in rules:
+            if rule not in RULES:
+                raise ValueError(f"Unknown rule: {rule}")
+        for profile in profiles:
+            if profile not in PROFILES:
+                raise ValueError(f"Unknown profile: {profile}")
+    except ValueError as error:
+        parser.error(str(error))
+
+    executor = None
+    if args.workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(args.workers)
+    results = []
+    for rule in rules:
+        for profile in profiles:
+            result = run_simulation(rule, profile, args.sessions, args.seed, players_range, features_range,
+                                    args.max_rounds, executor, args.workers)
+            results.append(result)
+            print(f"{result['rule']:<14} {profile:<10} {result['sessions_per_second']:10.0f} sessions/s"
+                  f"  {result['rounds_to_consensus']['mean'] or 0:5.2f} rounds"
+                  f"  p99 {result['session_seconds']['p99'] * 1000:8.3f} ms"
+                  f"  {result['peak_memory_bytes'] / 1024:8.1f} KiB", file=sys.stderr)
+    if executor is not None:
+        executor.shutdown()
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "players": args.players,
+        "features": args.features,
+        "max_rounds": args.max_rounds,
+        "workers": args.workers,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.metrics:
+        METRICS.write_prometheus(args.metrics)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
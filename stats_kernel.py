@@ -0,0 +1,309 @@
+# stats_kernel.py
+"""
+@file stats_kernel.py
+@brief One-pass per-feature vote statistics shared by every voting rule.
+
+@details
+A FeatureStats object aggregates the votes of one feature as they arrive, as card codes of a Deck: number of votes,
+number of numeric votes, sum of the numeric votes, and a histogram with one counter per card of the deck.
+Minimum, maximum, mean, median and mode are read from the histogram, so they never scan the votes again. The median
+is found by a weighted selection over the histogram, whose numeric cards are already sorted by value.
+
+StatsRule keeps one FeatureStats per feature and implements the whole rule interface (add_vote, feature_status,
+failing_features, verdict, validate_votes, reset...). A concrete rule only decides how statistics map to a status
+(`classify`) and to an estimate (`estimate_stats`), so every rule is a cheap view over the same aggregation and
+adding a rule never adds a pass over the votes.
+"""
+from vote_store import VoteStore
+from event_bus import Publisher
+from deck import DEFAULT_DECK
+from metrics import METRICS
+
+
+class FeatureStats:
+    """
+    @brief Running statistics of the votes of one feature, over card codes.
+
+    @par Attributes:
+    - deck: The Deck the card codes belong to.
+    - count: Number of votes.
+    - numeric_count: Number of numeric votes.
+    - total: Sum of the numeric votes.
+    - histogram: List indexed by card code of the number of votes for that card.
+    - distinct: Number of distinct cards played.
+    """
+    __slots__ = ("deck", "count", "numeric_count", "total", "histogram", "distinct")
+
+    def __init__(self, deck=DEFAULT_DECK):
+        self.deck = deck
+        self.count = 0
+        self.numeric_count = 0
+        self.total = 0.0
+        self.histogram = [0] * len(deck)
+        self.distinct = 0
+
+    def add(self, code):
+        """
+        @brief Account for one vote, given as a card code.
+
+        @return void
+        """
+        histogram = self.histogram
+        if not histogram[code]:
+            self.distinct += 1
+        histogram[code] += 1
+        self.count += 1
+        value = self.deck.values[code]
+        if value is not None:
+            self.numeric_count += 1
+            self.total += value
+
+    def remove(self, code):
+        """
+        @brief Forget one vote previously added.
+
+        @return void
+        """
+        histogram = self.histogram
+        histogram[code] -= 1
+        if not histogram[code]:
+            self.distinct -= 1
+        self.count -= 1
+        value = self.deck.values[code]
+        if value is not None:
+            self.numeric_count -= 1
+            self.total -= value
+
+    def _numeric_codes(self):
+        # Numeric cards come in increasing value, so this walks the played values in order
+        values = self.deck.values
+        return [code for code, votes in enumerate(self.histogram) if votes and values[code] is not None]
+
+    @property
+    def mean(self):
+        """
+        @brief Mean of the numeric votes, or None.
+        """
+        return self.total / self.numeric_count if self.numeric_count else None
+
+    @property
+    def minimum(self):
+        """
+        @brief Smallest numeric vote, or None.
+        """
+        codes = self._numeric_codes()
+        return self.deck.values[codes[0]] if codes else None
+
+    @property
+    def maximum(self):
+        """
+        @brief Largest numeric vote, or None.
+        """
+        codes = self._numeric_codes()
+        return self.deck.values[codes[-1]] if codes else None
+
+    @property
+    def median(self):
+        """
+        @brief Median of the numeric votes, or None; the mean of the two middle votes for an even count.
+        """
+        if not self.numeric_count:
+            return None
+        lower_rank = (self.numeric_count - 1) // 2
+        upper_rank = self.numeric_count // 2
+        lower = None
+        seen = 0
+        for code in self._numeric_codes():
+            seen += self.histogram[code]
+            value = self.deck.values[code]
+            if lower is None and seen > lower_rank:
+                lower = value
+            if seen > upper_rank:
+                return (lower + value) / 2
+        return None
+
+    def mode(self):
+        """
+        @brief Return the most played card and its number of votes.
+
+        @return tuple: `(code, votes)`, or `(None, 0)` without votes. Ties go to the lowest code.
+        """
+        best, best_count = None, 0
+        for code, count in enumerate(self.histogram):
+            if count > best_count:
+                best, best_count = code, count
+        return best, best_count
+
+
+def collect_stats(votes, deck=DEFAULT_DECK):
+    """
+    @brief Aggregate the votes of every feature in a single scan.
+
+    @param votes A VoteStore or a `(player, feature)` dictionary, holding card codes or card labels.
+    @param deck The Deck used to encode labels.
+
+    @return dict: Mapping of feature to FeatureStats, for the features with at least one vote.
+    """
+    encode = deck.encode
+    stats = {}
+    for (_, feature), vote in VoteStore.coerce(votes).items():
+        feature_stats = stats.get(feature)
+        if feature_stats is None:
+            feature_stats = stats[feature] = FeatureStats(deck)
+        feature_stats.add(encode(vote))
+    return stats
+
+
+class StatsRule(Publisher):
+    """
+    @brief Base class of the voting rules, built on one FeatureStats per feature.
+
+    @details
+    Subclasses implement `classify(stats)`, returning "pending", "converged" or "diverged" for a feature with at
+    least one vote, and may override `estimate_stats(stats)`, which defaults to the mean of the numeric votes.
+
+    Votes are card codes of the rule's deck; card labels are also accepted and encoded on the way in.
+    """
+    def __init__(self, bus=None, deck=DEFAULT_DECK):
+        """
+        @brief Constructor for the StatsRule class.
+
+        @param bus Optional EventBus receiving feature status changes and verdicts.
+        @param deck The Deck of the votes.
+        """
+        super().__init__(bus)
+        self.deck = deck
+        self.reset()
+
+    def classify(self, stats):
+        """
+        @brief Return the status of a feature from its statistics.
+
+        @param stats The FeatureStats of a feature with at least one vote.
+
+        @return str: "pending", "converged" or "diverged".
+        """
+        raise NotImplementedError
+
+    def estimate_stats(self, stats):
+        """
+        @brief Return the estimate of a feature from its statistics, or None.
+        """
+        return stats.mean
+
+    def reset(self):
+        """
+        @brief Forget the running state of every feature.
+
+        @return void
+        """
+        self._stats = {}
+        self._diverged = set()
+
+    def reset_feature(self, feature):
+        """
+        @brief Forget the running state of a single feature.
+
+        @param feature The feature to reset.
+
+        @return void
+        """
+        self._stats.pop(feature, None)
+        self._diverged.discard(feature)
+
+    def stats(self, feature):
+        """
+        @brief Return the FeatureStats of a feature, or None if it has no votes.
+        """
+        return self._stats.get(feature)
+
+    def add_vote(self, feature, vote, previous=None):
+        """
+        @brief Account for one incoming vote in the running statistics of its feature.
+
+        @param feature The feature being voted on.
+        @param vote The new vote, as a card code or label.
+        @param previous The vote this one replaces, or None for a first vote.
+
+        @return str: The status of the feature after the vote.
+        """
+        stats = self._stats.get(feature)
+        if stats is None:
+            stats = self._stats[feature] = FeatureStats(self.deck)
+        if self.bus is not None:
+            before = self.classify(stats) if stats.count else "pending"
+        if previous is not None:
+            stats.remove(self.deck.encode(previous))
+        stats.add(self.deck.encode(vote))
+
+        status = self.classify(stats)
+        if status == "diverged":
+            self._diverged.add(feature)
+        else:
+            self._diverged.discard(feature)
+        if self.bus is not None:
+            self.publish_status_change(feature, before, status)
+        return status
+
+    def feature_status(self, feature):
+        """
+        @brief Return the current status of a feature.
+
+        @param feature The feature.
+
+        @return str: "pending" without votes, otherwise the status given by the rule.
+        """
+        stats = self._stats.get(feature)
+        if stats is None or not stats.count:
+            return "pending"
+        return self.classify(stats)
+
+    def estimate(self, feature):
+        """
+        @brief Return the estimate of a feature according to the rule, or None.
+        """
+        stats = self._stats.get(feature)
+        if stats is None or not stats.count:
+            return None
+        return self.estimate_stats(stats)
+
+    def failing_features(self):
+        """
+        @brief Return the features that did not converge.
+
+        @return set: The features whose status is "diverged".
+        """
+        return set(self._diverged)
+
+    def verdict(self):
+        """
+        @brief Return the verdict for every vote received so far.
+
+        @return bool: True if no feature diverged.
+        """
+        return not self._diverged
+
+    def rebuild(self, votes):
+        """
+        @brief Replace the running state with the statistics of the given votes, in one scan.
+
+        @param votes A VoteStore or a `(player, feature)` dictionary.
+
+        @return bool: The verdict.
+        """
+        self._stats = collect_stats(votes, self.deck)
+        self._diverged = {feature for feature, stats in self._stats.items() if self.classify(stats) == "diverged"}
+        return self.verdict()
+
+    def validate_votes(self, votes):
+        """
+        @brief Validate a whole set of votes and notify the observers of the verdict.
+
+        @param votes A VoteStore or a `(player, feature)` dictionary.
+
+        @return bool: The verdict.
+        """
+        with METRICS.time("planning_poker_rule_validate_seconds", rule=type(self).__name__):
+            result = self.rebuild(votes)
+        self.notify_observers(result)
+        return result
@@ -0,0 +1,68 @@
+# test_journal.py
+import os
+
+from journal import SessionJournal
+from session import PlanningPokerSession
+
+
+def play(session, votes):
+    for player, feature, vote in votes:
+        session.record_vote(player, feature, vote)
+
+
+def new_session():
+    session = PlanningPokerSession()
+    session.set_players(["Alice", "Bob"])
+    session.load_features(["Login", "Search"])
+    session.set_rule("Average")
+    session.start()
+    return session
+
+
+def test_resume_replays_the_journal(tmp_path):
+    path = str(tmp_path / "session.journal")
+    session = new_session()
+    journal = SessionJournal.create(path, session)
+    play(session, [("Alice", "Login", "3"), ("Bob", "Login", "100"), ("Alice", "Search", "5"),
+                   ("Bob", "Search", "8")])
+    session.evaluate()
+    session.record_vote("Alice", "Login", "5")
+    journal.close()
+
+    resumed, resumed_journal = SessionJournal.resume(path)
+    resumed_journal.close()
+    assert resumed.to_dict() == session.to_dict()
+    assert resumed.round_features == ["Login"]
+    # The cursor is back on the first turn of the round without a vote
+    assert resumed.current_turn() == ("Bob", "Login")
+
+
+def test_snapshot_compacts_the_journal(tmp_path):
+    path = str(tmp_path / "session.journal")
+    session = new_session()
+    journal = SessionJournal.create(path, session, snapshot_every=2)
+    play(session, [("Alice", "Login", "3"), ("Bob", "Login", "5"), ("Alice", "Search", "5")])
+    journal.close()
+
+    assert os.path.exists(path + ".snapshot")
+    with open(path, "r", encoding="utf-8") as file:
+        assert len(file.readlines()) < 2
+    resumed, resumed_journal = SessionJournal.resume(path)
+    resumed_journal.close()
+    assert resumed.to_dict() == session.to_dict()
+
+
+def test_resume_drops_a_torn_last_line(tmp_path):
+    path = str(tmp_path / "session.journal")
+    session = new_session()
+    journal = SessionJournal.create(path, session)
+    play(session, [("Alice", "Login", "3")])
+    journal.close()
+    with open(path, "a", encoding="utf-8") as file:
+        file.write('{"type": "vote", "pla')
+    size = os.path.getsize(path)
+
+    resumed, resumed_journal = SessionJournal.resume(path)
+    resumed_journal.close()
+    assert resumed.votes.get_vote("Alice", "Login") == session.votes.get_vote("Alice", "Login")
+    assert os.path.getsize(path) < size
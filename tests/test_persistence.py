@@ -0,0 +1,81 @@
+# test_persistence.py
+import json
+import os
+import stat
+
+import persistence
+
+from persistence import PersistenceWorker, write_json_atomic
+
+
+def test_atomic_write_replaces_the_file(tmp_path):
+    path = str(tmp_path / "data.json")
+    write_json_atomic(path, {"a": 1})
+    write_json_atomic(path, {"a": 2})
+    with open(path, "r", encoding="utf-8") as file:
+        assert json.load(file) == {"a": 2}
+    assert [entry.name for entry in tmp_path.iterdir()] == ["data.json"]
+
+
+def test_worker_saves_and_loads(tmp_path):
+    path = str(tmp_path / "data.json")
+    worker = PersistenceWorker()
+    results = []
+    worker.submit_save(path, {"a": 1}, lambda result, error: results.append(("save", result, error)))
+    worker.submit_load(path, lambda result, error: results.append(("load", result, error)))
+    worker.submit_load(str(tmp_path / "missing.json"), lambda result, error: results.append(("missing", result, error)))
+    worker.stop()
+    worker.poll_results()
+    assert results[:2] == [("save", None, None), ("load", {"a": 1}, None)]
+    assert results[2][0] == "missing" and results[2][2]
+
+
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_atomic_write_keeps_permissions(tmp_path):
+    path = str(tmp_path / "data.json")
+    write_json_atomic(path, {})
+    umask = os.umask(0)
+    os.umask(umask)
+    assert mode(path) == 0o666 & ~umask
+
+    os.chmod(path, 0o640)
+    write_json_atomic(path, {"a": 1})
+    assert mode(path) == 0o640
+
+
+def test_worker_survives_a_failing_job(tmp_path, monkeypatch):
+    write = persistence.write_json_atomic
+
+    def fail_once(path, data):
+        if path.endswith("a.json"):
+            raise ZeroDivisionError
+        write(path, data)
+
+    worker = PersistenceWorker()
+    errors = []
+    monkeypatch.setattr(persistence, "write_json_atomic", fail_once)
+    worker.submit_save(str(tmp_path / "a.json"), {"a": 1}, lambda result, error: errors.append(error))
+    worker.submit_save(str(tmp_path / "b.json"), {"a": 1}, lambda result, error: errors.append(error))
+    worker.stop()
+    worker.poll_results()
+    assert errors[0].startswith("Unexpected error")
+    assert errors[1] is None
+
+
+def test_worker_reads(tmp_path):
+    path = str(tmp_path / "data.txt")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("12345")
+    worker = PersistenceWorker()
+    results = []
+    worker.submit_read(path, os.path.getsize, lambda result, error: results.append((result, error)))
+    worker.submit_read(str(tmp_path / "missing.txt"), os.path.getsize,
+                       lambda result, error: results.append((result, error)))
+    worker.stop()
+    worker.poll_results()
+    assert results[0] == (5, None)
+    assert results[1][0] is None and results[1][1]
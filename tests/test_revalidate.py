@@ -0,0 +1,36 @@
+# test_revalidate.py
+import json
+
+from revalidate import main
+from session import PlanningPokerSession
+
+
+def write_session(path, votes):
+    session = PlanningPokerSession()
+    session.set_players(["Alice", "Bob"])
+    session.load_features(["Login"])
+    session.set_rule("Average")
+    session.start()
+    for player, vote in zip(["Alice", "Bob"], votes):
+        session.record_vote(player, "Login", vote)
+    session.save(str(path))
+
+
+def test_clean_files_exit_with_0(tmp_path):
+    write_session(tmp_path / "a.json", ["3", "5"])
+    write_session(tmp_path / "b.json", ["5", "100"])
+    output = tmp_path / "report.out"
+    assert main([str(tmp_path), "--rules", "Average,Strict (Unanimity)", "--workers", "1",
+                 "--output", str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert report["totals"]["AverageRule"]["verdicts"] == 1
+    assert report["errors"] == []
+
+
+def test_unreadable_file_exits_with_2(tmp_path):
+    write_session(tmp_path / "a.json", ["3", "5"])
+    (tmp_path / "broken.json").write_text("{not json")
+    output = tmp_path / "report.out"
+    assert main([str(tmp_path), "--workers", "1", "--output", str(output)]) == 2
+    report = json.loads(output.read_text())
+    assert [error["file"] for error in report["errors"]] == [str(tmp_path / "broken.json")]
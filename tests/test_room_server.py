@@ -0,0 +1,98 @@
+# test_room_server.py
+import types
+
+from room_server import RoomGateway, RoomShard
+
+
+def join(shard, connection, room, player, create=None):
+    return shard.handle({"op": "join", "conn": connection, "room": room, "player": player, "create": create})
+
+
+def messages(output):
+    return [(entry["to"], entry["message"]["type"]) for entry in output if "to" in entry]
+
+
+def vote(shard, connection, feature, value):
+    return shard.handle({"op": "message", "conn": connection,
+                         "message": {"type": "vote", "feature": feature, "vote": value}})
+
+
+def test_rooms_play_independently():
+    shard = RoomShard()
+    config = {"features": ["Login"], "rule": "Average", "expect": 2}
+    assert messages(join(shard, 1, "a", "Alice", config)) == [([1], "welcome")]
+    join(shard, 2, "b", "Alice", config)
+    assert messages(join(shard, 3, "a", "Bob")) == [([3], "welcome"), ([1, 3], "round")]
+
+    assert messages(vote(shard, 1, "Login", "3")) == [([1], "ack")]
+    output = vote(shard, 3, "Login", "5")
+    assert ([1, 3], "finished") in messages(output)
+    assert {"event": "finished", "room": "a"} in output
+    assert {"close": [1, 3]} in output
+    assert list(shard.rooms) == ["b"]
+
+
+def test_unknown_room_is_rejected():
+    shard = RoomShard()
+    output = join(shard, 1, "nowhere", "Alice")
+    assert output[0]["message"] == {"type": "error", "message": "Unknown room: nowhere"}
+    assert {"close": [1]} in output
+
+
+def test_rooms_declared_up_front_wait_for_players():
+    shard = RoomShard()
+    shard.handle({"op": "create", "room": "a", "config": {"features": ["Login"], "rule": "Average",
+                                                          "players": ["Alice", "Bob"]}})
+    assert messages(join(shard, 1, "a", "Alice")) == [([1], "welcome"), ([1], "round")]
+    assert join(shard, 2, "a", "Mallory")[0]["message"]["type"] == "error"
+
+
+def test_invalid_room_does_not_break_the_shard():
+    shard = RoomShard()
+    join(shard, 1, "good", "Alice", {"features": ["Login"], "rule": "Average", "expect": 2})
+
+    output = join(shard, 2, "bad", "Bob", {"features": [{"t": 1}], "rule": "Average", "expect": 2})
+    assert output[0]["message"]["type"] == "error"
+    assert {"close": [2]} in output
+    assert "bad" not in shard.rooms
+
+    assert messages(join(shard, 3, "good", "Carol")) == [([3], "welcome"), ([1, 3], "round")]
+    assert messages(vote(shard, 1, "Login", "3")) == [([1], "ack")]
+
+
+def test_unexpected_error_is_answered(monkeypatch):
+    shard = RoomShard()
+    join(shard, 1, "room", "Alice", {"features": ["Login"], "rule": "Average", "expect": 1})
+    monkeypatch.setattr(shard.rooms["room"], "handle", lambda player, message: 1 / 0)
+    output = shard.handle({"op": "message", "conn": 1, "message": {"type": "vote"}})
+    assert output == [{"to": [1], "message": {"type": "error", "message": "The message could not be handled."},
+                       "reply": True}]
+
+
+def test_empty_room_is_closed():
+    shard = RoomShard()
+    join(shard, 1, "room", "Alice", {"features": ["Login"], "rule": "Average", "expect": 2})
+    output = shard.handle({"op": "leave", "conn": 1})
+    assert output == [{"event": "closed", "room": "room"}]
+    assert shard.rooms == {}
+
+
+def test_client_rooms_do_not_read_files():
+    shard = RoomShard()
+    output = join(shard, 1, "room", "Alice", {"features": "/etc/passwd", "rule": "Average", "expect": 1})
+    assert output[0]["message"] == {"type": "error", "message": "Features must be a JSON list."}
+    assert shard.rooms == {}
+
+
+def test_new_rooms_are_spread_over_workers():
+    gateway = RoomGateway(4)
+    gateway._workers = [types.SimpleNamespace(returncode=None) for _ in range(4)]
+    shards = [gateway.shard_for(f"room-{number}") for number in range(8)]
+    assert sorted(shards) == [0, 0, 1, 1, 2, 2, 3, 3]
+    assert gateway._shard_rooms == [2, 2, 2, 2]
+
+    gateway.room_event(shards[0], {"event": "rejected", "room": "room-0", "conn": 1})
+    gateway.room_event(shards[1], {"event": "opened", "room": "room-1"})
+    gateway.room_event(shards[1], {"event": "closed", "room": "room-1"})
+    assert sum(gateway._shard_rooms) == 6
+    assert gateway.shard_for("room-8") in (shards[0], shards[1])
@@ -0,0 +1,85 @@
+# test_rules.py
+import random
+
+import pytest
+
+from average_rule import AverageRule
+from rule_registry import RULES
+from strict_rule import StrictRule
+
+
+def test_average_rule_tracks_votes_incrementally():
+    rule = AverageRule()
+    assert rule.add_vote("f", "40") == "diverged"
+    assert rule.add_vote("f", "1") == "diverged"
+    assert rule.add_vote("f", "3", previous="40") == "converged"
+    assert rule.average("f") == 2
+    assert rule.verdict()
+
+
+def test_average_rule_ignores_cards_without_value():
+    rule = AverageRule()
+    assert rule.add_vote("f", "coffee") == "pending"
+    assert rule.add_vote("f", "5") == "converged"
+    assert rule.average("f") == 5
+
+
+def test_strict_rule_tracks_votes_incrementally():
+    rule = StrictRule()
+    rule.reset()
+    assert rule.add_vote("f", "5") == "converged"
+    assert rule.add_vote("f", "8") == "diverged"
+    assert not rule.verdict()
+    assert rule.add_vote("f", "5", previous="8") == "converged"
+    assert rule.verdict()
+
+
+def test_changed_votes_match_a_fresh_count():
+    rng = random.Random(3)
+    cards = ["0", "1", "2", "3", "5", "8", "13", "20", "40", "100", "coffee", "?"]
+    for rule in (AverageRule(), StrictRule()):
+        rule.reset()
+        votes = {}
+        for _ in range(500):
+            key = (rng.choice("abcd"), rng.choice("uvwxyz"))
+            vote = rng.choice(cards)
+            rule.add_vote(key[1], vote, votes.get(key))
+            votes[key] = vote
+        statuses = {feature: rule.feature_status(feature) for _, feature in votes}
+        verdict = rule.verdict()
+
+        rule.reset()
+        for (_, feature), vote in votes.items():
+            rule.add_vote(feature, vote)
+        assert {feature: rule.feature_status(feature) for _, feature in votes} == statuses
+        assert rule.verdict() == verdict
+
+
+@pytest.mark.parametrize("rule_name, votes, status", [
+    ("Average", ["3", "5"], "converged"),
+    ("Average", ["1", "20"], "converged"),
+    ("Average", ["0", "0"], "diverged"),
+    ("Average", ["40", "100"], "diverged"),
+    ("Average", ["5", "coffee"], "converged"),
+    ("Strict (Unanimity)", ["5", "5", "5"], "converged"),
+    ("Strict (Unanimity)", ["5", "8", "5"], "diverged"),
+    ("Strict (Unanimity)", ["?", "?"], "converged"),
+    ("Median", ["1", "3", "100"], "converged"),
+    ("Median", ["40", "100", "3"], "diverged"),
+    ("Absolute Majority", ["5", "5", "8"], "converged"),
+    ("Absolute Majority", ["5", "5", "8", "8"], "diverged"),
+    ("Mode (2/3)", ["5", "5", "8"], "converged"),
+    ("Mode (2/3)", ["5", "3", "8"], "diverged"),
+])
+def test_rule_verdicts(rule_name, votes, status):
+    rule = RULES.create(rule_name)
+    rule.validate_votes({(f"p{index}", "f"): vote for index, vote in enumerate(votes)})
+    assert rule.feature_status("f") == status
+    assert rule.verdict() == (status == "converged")
+
+
+def test_rules_are_found_by_display_or_class_name():
+    assert RULES.class_name("Average") == "AverageRule"
+    assert RULES.display_name("MedianRule") == "Median"
+    assert type(RULES.create("ModeRule")).__name__ == "ModeRule"
+    assert "Unknown" not in RULES
@@ -0,0 +1,54 @@
+# test_session.py
+import pytest
+
+from session import PlanningPokerSession
+
+
+def test_only_diverged_features_are_voted_again():
+    session = PlanningPokerSession()
+    session.set_players(["Alice", "Bob"])
+    session.load_features(["Login", "Search"])
+    session.set_rule("Average")
+    session.start()
+    for player, feature, vote in [("Alice", "Login", "3"), ("Bob", "Login", "5"), ("Alice", "Search", "40"),
+                                  ("Bob", "Search", "100")]:
+        session.record_vote(player, feature, vote)
+
+    assert session.evaluate() == ["Search"]
+    assert session.round_features == ["Search"]
+    assert session.round_votes_left == 2
+    assert session.votes.vote_count("Login") == 2
+
+
+def test_duplicate_features_are_rejected():
+    session = PlanningPokerSession()
+    with pytest.raises(ValueError, match="Duplicate feature"):
+        session.load_features_json('["x", "x"]')
+    with pytest.raises(ValueError, match="Duplicate feature"):
+        session.load_dict({"players": ["Alice"], "features": ["x", "x"]})
+
+
+def test_vote_without_rule_is_rejected():
+    session = PlanningPokerSession()
+    session.load_dict({"players": ["Alice"], "features": ["x"], "votes": {}})
+    with pytest.raises(ValueError, match="rules"):
+        session.record_vote("Alice", "x", "3")
+
+
+@pytest.mark.parametrize("features", [[{"t": 1}], ["Login", 3], ["  "]])
+def test_features_must_be_titles(features):
+    with pytest.raises(ValueError, match="Invalid feature"):
+        PlanningPokerSession().load_features(features)
+
+
+def test_difficulty_estimations_average_numeric_votes():
+    session = PlanningPokerSession()
+    session.set_players(["Alice", "Bob", "Carol"])
+    session.load_features(["Login", "Search"])
+    session.set_rule("Average")
+    session.start()
+    for player, feature, vote in [("Alice", "Login", "3"), ("Bob", "Login", "5"), ("Carol", "Login", "?"),
+                                  ("Alice", "Search", "?")]:
+        session.record_vote(player, feature, vote)
+
+    assert session.difficulty_estimations() == {"Login": 4.0, "Search": None}
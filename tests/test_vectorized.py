@@ -0,0 +1,40 @@
+# test_vectorized.py
+import random
+
+import pytest
+
+from average_rule import AverageRule
+from strict_rule import StrictRule
+from vectorized import HAVE_NUMPY, FeatureMatrix, batch_validate
+from vote_store import VoteStore
+
+CARDS = ["0", "1", "2", "3", "5", "8", "13", "20", "40", "100", "coffee", "?"]
+
+
+def random_store(seed):
+    rng = random.Random(seed)
+    store = VoteStore([f"p{index}" for index in range(9)], [f"f{index}" for index in range(200)])
+    for feature in store.features:
+        # Mostly agreeing votes, so both verdicts occur
+        shared = rng.choice(CARDS)
+        for player in store.players:
+            if rng.random() < 0.9:
+                store.set_vote(player, feature, shared if rng.random() < 0.8 else rng.choice(CARDS))
+    return store
+
+
+def test_batch_validate_reports_failing_features():
+    votes = {("a", "ok"): "3", ("b", "ok"): "5", ("a", "high"): "100", ("b", "high"): "40"}
+    assert batch_validate(AverageRule(), votes) == (False, {"high"})
+    assert batch_validate(StrictRule(), votes) == (False, {"ok", "high"})
+
+
+@pytest.mark.skipif(not HAVE_NUMPY, reason="NumPy is not installed")
+@pytest.mark.parametrize("rule_class", [AverageRule, StrictRule])
+def test_vectorized_matches_python_rules(rule_class):
+    store = random_store(7)
+    rule = rule_class()
+    rule.validate_votes(store)
+    assert rule.failing_features()
+    assert FeatureMatrix(store).failing_features(rule) == rule.failing_features()
+    assert batch_validate(rule, store) == (rule.verdict(), rule.failing_features())
@@ -0,0 +1,129 @@
+# vectorized.py
+"""
+@file vectorized.py
+@brief Optional NumPy-vectorized batch validation of Planning Poker votes.
+
+@details
+The votes of a session are turned into a players x features matrix once, then the per-feature mean, minimum,
+maximum and unanimity are each computed with a single array operation instead of one Python loop per feature.
+Missing votes and cards without a numeric value (coffee and "?") are handled with masks, so the results match
+the pure-Python rules: the average ignores non-numeric votes, while unanimity compares every vote cast.
+
+@note
+NumPy is optional. When it is not installed, `batch_validate` falls back to the rule's own `validate_votes`,
+and `HAVE_NUMPY` is False.
+"""
+from average_rule import AverageRule
+from strict_rule import StrictRule
+from vote_store import VoteStore
+from deck import DEFAULT_DECK
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAVE_NUMPY = np is not None
+
+
+class FeatureMatrix:
+    """
+    @brief Players x features matrices built from a vote store.
+
+    @par Attributes:
+    - features: Features, in column order.
+    - players: Players, in row order.
+    - values: Float matrix of numeric votes, NaN where the vote is missing or not a number.
+    - codes: Integer matrix of card codes, -1 where the vote is missing.
+    """
+    def __init__(self, votes, deck=DEFAULT_DECK):
+        """
+        @brief Build the matrices from a VoteStore or a `(player, feature)` dictionary.
+
+        @param votes The votes to convert, as card codes or card labels.
+        @param deck The Deck of the votes.
+        """
+        votes = VoteStore.coerce(votes)
+        self.features = votes.features
+        self.players = votes.players
+
+        # Every distinct vote is encoded once; symbol MISSING (-1) indexes the -1 stored at the end of the table
+        symbols, rows = votes.symbol_rows()
+        symbol_codes = np.array([deck.encode(symbol) for symbol in symbols] + [-1], dtype=np.int32)
+        symbol_matrix = np.array(rows, dtype=np.int32).reshape(len(self.features), len(self.players))
+        codes = symbol_codes[symbol_matrix].T
+        self.codes = codes
+        # Code -1 (missing) indexes the NaN stored at the end of the lookup table
+        numeric_values = [np.nan if value is None else value for value in deck.values]
+        lookup = np.array(numeric_values + [np.nan], dtype=np.float64)
+        self.values = lookup[codes]
+
+    def statistics(self):
+        """
+        @brief Compute per-feature statistics in one pass over the matrices.
+
+        @return dict: Arrays indexed like `features`: "count" of numeric votes, "mean", "min" and "max"
+        of numeric votes (NaN without numeric votes), "voted" number of votes cast, and "unanimous".
+        """
+        values = self.values
+        numeric = ~np.isnan(values)
+        count = numeric.sum(axis=0)
+        total = np.where(numeric, values, 0.0).sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, total / np.maximum(count, 1), np.nan)
+        minimum = np.where(count > 0, np.where(numeric, values, np.inf).min(axis=0, initial=np.inf), np.nan)
+        maximum = np.where(count > 0, np.where(numeric, values, -np.inf).max(axis=0, initial=-np.inf), np.nan)
+
+        present = self.codes >= 0
+        voted = present.sum(axis=0)
+        lowest_code = np.where(present, self.codes, np.iinfo(np.int32).max).min(axis=0, initial=np.iinfo(np.int32).max)
+        highest_code = np.where(present, self.codes, -1).max(axis=0, initial=-1)
+        unanimous = (voted == 0) | (lowest_code == highest_code)
+
+        return {
+            "count": count,
+            "mean": mean,
+            "min": minimum,
+            "max": maximum,
+            "voted": voted,
+            "unanimous": unanimous,
+        }
+
+    def failing_features(self, rule):
+        """
+        @brief Return the features the rule would reject.
+
+        @param rule An AverageRule or StrictRule instance.
+
+        @return set: The features whose status would be "diverged".
+        """
+        stats = self.statistics()
+        if isinstance(rule, AverageRule):
+            mean = stats["mean"]
+            failing = (stats["count"] > 0) & ((mean < rule.LOW) | (mean > rule.HIGH))
+        elif isinstance(rule, StrictRule):
+            failing = ~stats["unanimous"]
+        else:
+            raise TypeError(f"No vectorized path for {rule.__class__.__name__}")
+        return {self.features[index] for index in np.flatnonzero(failing)}
+
+
+def batch_validate(rule, votes):
+    """
+    @brief Validate a whole session at once.
+
+    The vectorized path is used when NumPy is installed and the rule is an AverageRule or a StrictRule;
+    otherwise the rule's own `validate_votes` runs. The rule's running state is only rebuilt by the fallback.
+
+    @param rule The rule to apply.
+    @param votes A VoteStore or a `(player, feature)` dictionary.
+
+    @return tuple: `(verdict, failing_features)`, where `failing_features` is a set.
+    """
+    if HAVE_NUMPY and isinstance(rule, (AverageRule, StrictRule)):
+        failing_features = FeatureMatrix(votes).failing_features(rule)
+        return not failing_features, failing_features
+
+    rule.validate_votes(votes)
+    return rule.verdict(), rule.failing_features()
+
@@ -0,0 +1,141 @@
+# virtual_list.py
+import tkinter as tk
+
+
+class VirtualList(tk.Frame):
+    """
+    @file virtual_list.py
+    @brief Scrollable list widget that only renders its visible rows.
+
+    @details
+    The VirtualList class draws a fixed-height row for each visible line of a Canvas, and asks a callback for the text
+    of a row only when that row scrolls into view. A list of thousands of features therefore costs as many canvas
+    items as fit in the window, and changing one entry redraws a single row instead of relaying out a whole label.
+
+    @note
+    The list does not store its rows: call `set_row_count` when the number of rows changes, `refresh_row` when one
+    row changes, and `refresh` when many rows may have changed.
+
+    @code
+    features_list = VirtualList(frame, lambda index: features[index])
+    features_list.pack(fill='both', expand=True)
+    features_list.set_row_count(len(features))
+    @endcode
+    """
+    def __init__(self, master, row_text, row_height=20, width=220, height=240, **kwargs):
+        """
+        @brief Constructor for the VirtualList class.
+
+        @param master The parent widget.
+        @param row_text Callback returning the text of the row at a given index.
+        @param row_height Height of a row, in pixels.
+        @param width Initial width of the list, in pixels.
+        @param height Initial height of the list, in pixels.
+        """
+        super().__init__(master, **kwargs)
+        self._row_text = row_text
+        self._row_height = row_height
+        self._count = 0
+        self._first = 0
+        self._items = []
+
+        self.canvas = tk.Canvas(self, width=width, height=height, highlightthickness=0, bg='white')
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side='right', fill='y')
+        self.canvas.pack(side='left', fill='both', expand=True)
+
+        self.canvas.bind("<Configure>", lambda event: self.refresh())
+        for widget in (self.canvas, self.scrollbar):
+            widget.bind("<MouseWheel>", lambda event: self.yview("scroll", -1 if event.delta > 0 else 1, "units"))
+            widget.bind("<Button-4>", lambda event: self.yview("scroll", -1, "units"))
+            widget.bind("<Button-5>", lambda event: self.yview("scroll", 1, "units"))
+
+    def _visible_rows(self):
+        height = self.canvas.winfo_height()
+        if height <= 1:
+            height = int(self.canvas.cget("height"))
+        return height // self._row_height + 1
+
+    def set_row_count(self, count):
+        """
+        @brief Set the number of rows and redraw the visible ones.
+
+        @param count The number of rows.
+
+        @return void
+        """
+        self._count = count
+        self._first = max(0, min(self._first, count - self._visible_rows() + 1))
+        self.refresh()
+
+    def refresh(self):
+        """
+        @brief Redraw every visible row.
+
+        @return void
+        """
+        visible = self._visible_rows()
+        while len(self._items) < visible:
+            y = len(self._items) * self._row_height + 2
+            self._items.append(self.canvas.create_text(4, y, anchor='nw', text=""))
+        while len(self._items) > visible:
+            self.canvas.delete(self._items.pop())
+
+        for slot, item in enumerate(self._items):
+            index = self._first + slot
+            self.canvas.itemconfigure(item, text=self._row_text(index) if index < self._count else "")
+        self._update_scrollbar()
+
+    def refresh_row(self, index):
+        """
+        @brief Redraw a single row if it is visible.
+
+        @param index The index of the row.
+
+        @return void
+        """
+        slot = index - self._first
+        if 0 <= slot < len(self._items) and index < self._count:
+            self.canvas.itemconfigure(self._items[slot], text=self._row_text(index))
+
+    def see(self, index):
+        """
+        @brief Scroll so the row at `index` is visible.
+
+        @param index The index of the row.
+
+        @return void
+        """
+        visible = len(self._items) or self._visible_rows()
+        if index < self._first:
+            self._scroll_to(index)
+        elif index >= self._first + visible - 1:
+            self._scroll_to(index - visible + 2)
+
+    def yview(self, *args):
+        """
+        @brief Scrollbar command: handle "moveto" and "scroll" requests.
+
+        @return void
+        """
+        if not args:
+            return
+        visible = max(1, self._visible_rows() - 1)
+        if args[0] == "moveto":
+            self._scroll_to(int(float(args[1]) * self._count))
+        elif args[0] == "scroll":
+            step = visible if args[2] == "pages" else 1
+            self._scroll_to(self._first + int(args[1]) * step)
+
+    def _scroll_to(self, first):
+        first = max(0, min(first, self._count - self._visible_rows() + 1))
+        if first != self._first:
+            self._first = first
+            self.refresh()
+
+    def _update_scrollbar(self):
+        if self._count <= 0:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        last = self._first + len(self._items) - 1
+        self.scrollbar.set(self._first / self._count, min(1.0, last / self._count))
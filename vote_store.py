@@ -0,0 +1,420 @@
+# vote_store.py
+from array import array
+
+# Symbol number of a missing vote in the rows
+MISSING = -1
+
+
+class VoteStore:
+    """
+    @file vote_store.py
+    @brief Indexed storage for Planning Poker votes.
+
+    @details
+    The VoteStore class keeps the votes of a session indexed both by feature and by player.
+    Players and features are mapped to integer positions once, and the votes of each feature are kept
+    in a compact row with one slot per player, while per-feature vote counts live in an unsigned integer array.
+    Rows are integer arrays of symbol numbers: every distinct vote value is interned once in a symbol table, and -1
+    marks a missing vote, so a row costs 4 bytes per player instead of a pointer per slot.
+    Looking up, replacing or removing a single vote is O(1), and iterating over the votes of one feature
+    only touches that feature's row instead of the whole session.
+
+    @note
+    The store also behaves like the old flat dictionary keyed by `(player, feature)` tuples:
+    `len()`, `in`, `items()` and `get()` are supported so existing callers keep working.
+
+    @see
+    For additional information on how to use this class, refer to the documentation of its methods.
+    """
+    def __init__(self, players=(), features=()):
+        """
+        @brief Constructor for the VoteStore class.
+
+        @param players Iterable of player names to register.
+        @param features Iterable of features to register.
+        """
+        self._players = []
+        self._player_index = {}
+        self._features = []
+        self._feature_index = {}
+        self._rows = []
+        self._counts = array('I')
+        self._symbols = []
+        self._symbol_ids = {}
+        self._total = 0
+
+        for player in players:
+            self.add_player(player)
+        for feature in features:
+            self.add_feature(feature)
+
+    @classmethod
+    def coerce(cls, votes):
+        """
+        @brief Return `votes` as a VoteStore, converting a plain dictionary if needed.
+
+        @param votes A VoteStore or a dictionary keyed by `(player, feature)` tuples.
+
+        @return VoteStore: The given store, or a new store holding the same votes.
+        """
+        if isinstance(votes, cls):
+            return votes
+        return cls.from_dict(votes)
+
+    @classmethod
+    def from_dict(cls, data, players=(), features=()):
+        """
+        @brief Build a store from a dictionary of votes.
+
+        Both the flat `{(player, feature): vote}` layout and the nested `{feature: {player: vote}}`
+        layout written by `to_dict` are accepted.
+
+        @param data Dictionary of votes.
+        @param players Players to register before the votes, preserving their order.
+        @param features Features to register before the votes, preserving their order.
+
+        @return VoteStore: The new store.
+        """
+        store = cls(players, features)
+        for key, value in data.items():
+            if isinstance(key, tuple):
+                player, feature = key
+                store.set_vote(player, feature, value)
+            else:
+                for player, vote in value.items():
+                    store.set_vote(player, key, vote)
+        return store
+
+    def to_dict(self):
+        """
+        @brief Export the votes as a nested `{feature: {player: vote}}` dictionary.
+
+        Unlike tuple keys, this layout can be written with `json.dump`.
+
+        @return dict: The votes grouped by feature.
+        """
+        return {feature: self.feature_votes(feature) for feature in self._features}
+
+    @property
+    def players(self):
+        """
+        @brief Registered players, in registration order.
+        """
+        return tuple(self._players)
+
+    @property
+    def features(self):
+        """
+        @brief Registered features, in registration order.
+        """
+        return tuple(self._features)
+
+    def has_player(self, player):
+        """
+        @brief Check if a player is registered.
+        """
+        return player in self._player_index
+
+    def has_feature(self, feature):
+        """
+        @brief Check if a feature is registered.
+        """
+        return feature in self._feature_index
+
+    def feature_position(self, feature):
+        """
+        @brief Return the registration index of a feature, or None if it is unknown.
+        """
+        return self._feature_index.get(feature)
+
+    def add_player(self, player):
+        """
+        @brief Register a player and return its index.
+
+        Registering a player that is already known is a no-op.
+
+        @param player The player name.
+
+        @return int: The index of the player.
+        """
+        index = self._player_index.get(player)
+        if index is None:
+            index = len(self._players)
+            self._player_index[player] = index
+            self._players.append(player)
+            for row in self._rows:
+                row.append(MISSING)
+        return index
+
+    def add_feature(self, feature):
+        """
+        @brief Register a feature and return its index.
+
+        Registering a feature that is already known is a no-op.
+
+        @param feature The feature.
+
+        @return int: The index of the feature.
+        """
+        index = self._feature_index.get(feature)
+        if index is None:
+            index = len(self._features)
+            self._feature_index[feature] = index
+            self._features.append(feature)
+            self._rows.append(self._empty_row())
+            self._counts.append(0)
+        return index
+
+    def set_vote(self, player, feature, vote):
+        """
+        @brief Store the vote of a player for a feature.
+
+        Unknown players and features are registered on the fly.
+
+        @param player The player casting the vote.
+        @param feature The feature being voted on.
+        @param vote The vote value. None removes the vote.
+
+        @return The previous vote of this player for this feature, or None.
+        """
+        if vote is None:
+            return self.remove_vote(player, feature)
+        player_index = self.add_player(player)
+        feature_index = self.add_feature(feature)
+        row = self._rows[feature_index]
+        previous = row[player_index]
+        if previous == MISSING:
+            self._counts[feature_index] += 1
+            self._total += 1
+        row[player_index] = self._intern(vote)
+        return None if previous == MISSING else self._symbols[previous]
+
+    def get_vote(self, player, feature, default=None):
+        """
+        @brief Return the vote of a player for a feature.
+
+        @param player The player.
+        @param feature The feature.
+        @param default Value returned when there is no such vote.
+
+        @return The vote, or `default`.
+        """
+        player_index = self._player_index.get(player)
+        feature_index = self._feature_index.get(feature)
+        if player_index is None or feature_index is None:
+            return default
+        symbol = self._rows[feature_index][player_index]
+        return default if symbol == MISSING else self._symbols[symbol]
+
+    def remove_vote(self, player, feature):
+        """
+        @brief Remove the vote of a player for a feature.
+
+        @param player The player.
+        @param feature The feature.
+
+        @return The removed vote, or None if there was none.
+        """
+        player_index = self._player_index.get(player)
+        feature_index = self._feature_index.get(feature)
+        if player_index is None or feature_index is None:
+            return None
+        row = self._rows[feature_index]
+        previous = row[player_index]
+        if previous == MISSING:
+            return None
+        row[player_index] = MISSING
+        self._counts[feature_index] -= 1
+        self._total -= 1
+        return self._symbols[previous]
+
+    def clear_feature(self, feature):
+        """
+        @brief Remove every vote cast for a feature.
+
+        @param feature The feature to clear.
+
+        @return void
+        """
+        feature_index = self._feature_index.get(feature)
+        if feature_index is None:
+            return
+        self._total -= self._counts[feature_index]
+        self._counts[feature_index] = 0
+        self._rows[feature_index] = self._empty_row()
+
+    def clear(self):
+        """
+        @brief Remove every vote while keeping the registered players and features.
+
+        @return void
+        """
+        self._rows = [self._empty_row() for _ in self._features]
+        self._counts = array('I', [0]) * len(self._features)
+        self._total = 0
+
+    def feature_votes(self, feature):
+        """
+        @brief Return the votes cast for a feature.
+
+        @param feature The feature.
+
+        @return dict: Mapping of player to vote, for the players who voted.
+        """
+        feature_index = self._feature_index.get(feature)
+        if feature_index is None:
+            return {}
+        symbols = self._symbols
+        row = self._rows[feature_index]
+        return {self._players[i]: symbols[symbol] for i, symbol in enumerate(row) if symbol != MISSING}
+
+    def iter_feature_votes(self, feature):
+        """
+        @brief Iterate over the vote values cast for a feature.
+
+        @param feature The feature.
+
+        @return generator: The vote values, in player order.
+        """
+        feature_index = self._feature_index.get(feature)
+        if feature_index is None:
+            return
+        symbols = self._symbols
+        for symbol in self._rows[feature_index]:
+            if symbol != MISSING:
+                yield symbols[symbol]
+
+    def iter_rows(self):
+        """
+        @brief Iterate over the vote rows of every feature.
+
+        Each row is a list holding one slot per registered player, in player order, with None for a missing vote.
+
+        @return generator: `(feature, row)` pairs, in feature order.
+        """
+        symbols = self._symbols
+        for feature, row in zip(self._features, self._rows):
+            yield feature, [None if symbol == MISSING else symbols[symbol] for symbol in row]
+
+    def symbol_rows(self):
+        """
+        @brief Return the symbol table and the raw rows, for callers converting the whole store at once.
+
+        Each row is an integer array with one symbol number per registered player, in player order, and MISSING
+        for a missing vote. The rows are the store's own storage and must not be modified.
+
+        @return tuple: `(symbols, rows)`, where `symbols[number]` is the vote value of a symbol number and `rows` lists
+        the rows in feature order.
+        """
+        return tuple(self._symbols), self._rows
+
+    def player_votes(self, player):
+        """
+        @brief Return the votes cast by a player.
+
+        @param player The player.
+
+        @return dict: Mapping of feature to vote, for the features the player voted on.
+        """
+        player_index = self._player_index.get(player)
+        if player_index is None:
+            return {}
+        votes = {}
+        for feature, row in zip(self._features, self._rows):
+            symbol = row[player_index]
+            if symbol != MISSING:
+                votes[feature] = self._symbols[symbol]
+        return votes
+
+    def vote_count(self, feature):
+        """
+        @brief Return the number of votes cast for a feature.
+
+        @param feature The feature.
+
+        @return int: The number of votes.
+        """
+        feature_index = self._feature_index.get(feature)
+        return 0 if feature_index is None else self._counts[feature_index]
+
+    def is_feature_complete(self, feature):
+        """
+        @brief Check if every registered player voted on a feature.
+
+        @param feature The feature.
+
+        @return bool: True if the feature received one vote per player.
+        """
+        return bool(self._players) and self.vote_count(feature) == len(self._players)
+
+    def is_complete(self):
+        """
+        @brief Check if every registered player voted on every registered feature.
+
+        @return bool: True if all votes are collected.
+        """
+        return bool(self._players) and self._total == len(self._players) * len(self._features)
+
+    def _empty_row(self):
+        return array('i', [MISSING]) * len(self._players)
+
+    def _intern(self, vote):
+        # Keyed by type too, so that 1, 1.0 and True stay distinct votes
+        key = (type(vote), vote)
+        symbol = self._symbol_ids.get(key)
+        if symbol is None:
+            symbol = self._symbol_ids[key] = len(self._symbols)
+            self._symbols.append(vote)
+        return symbol
+
+    def get(self, key, default=None):
+        """
+        @brief Dictionary-style lookup by `(player, feature)` tuple.
+        """
+        player, feature = key
+        return self.get_vote(player, feature, default)
+
+    def items(self):
+        """
+        @brief Iterate over `((player, feature), vote)` pairs, grouped by feature.
+        """
+        symbols = self._symbols
+        for feature, row in zip(self._features, self._rows):
+            for player, symbol in zip(self._players, row):
+                if symbol != MISSING:
+                    yield (player, feature), symbols[symbol]
+
+    def keys(self):
+        """
+        @brief Iterate over the `(player, feature)` pairs that hold a vote.
+        """
+        for key, _ in self.items():
+            yield key
+
+    def values(self):
+        """
+        @brief Iterate over the vote values, grouped by feature.
+        """
+        for _, vote in self.items():
+            yield vote
+
+    def __getitem__(self, key):
+        player, feature = key
+        vote = self.get_vote(player, feature)
+        if vote is None:
+            raise KeyError(key)
+        return vote
+
+    def __setitem__(self, key, vote):
+        player, feature = key
+        self.set_vote(player, feature, vote)
+
+    def __contains__(self, key):
+        player, feature = key
+        return self.get_vote(player, feature) is not None
+
+    def __len__(self):
+        return self._total
+
+    def __iter__(self):
+        return self.keys()
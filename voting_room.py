@@ -0,0 +1,163 @@
+# voting_room.py
+import time
+
+
+class VotingRoom:
+    """
+    @file voting_room.py
+    @brief Transport-independent state machine of one networked Planning Poker room.
+
+    @details
+    The VotingRoom class implements the voting protocol of net_server.py on top of a headless PlanningPokerSession,
+    without doing any I/O: every method returns an outbox, a list of `(connections, message)` pairs that the caller
+    delivers. Connections are opaque to the room (stream writers for net_server.py, connection numbers for the
+    room_server.py workers), so the same protocol runs in a single-room server and in the sharded multi-room server.
+
+    Players are either fixed up front (the session is already started), or registered as they join until
+    `expected_players` are connected, at which point the session starts.
+
+    @note
+    Rejected joins and invalid messages raise ValueError with the message to send back to the client.
+
+    @par Attributes:
+    - name: Name of the room, or None.
+    - session: The PlanningPokerSession being played.
+    - expected_players: Number of players to wait for when players register on join.
+    - clients: Mapping of player name to connection.
+    - round_number: Number of the current round, starting at 1; 0 before the first round.
+    - round_started: `time.perf_counter()` value when the current round started.
+    - finished: True once the final estimations were sent.
+    - on_round_closed: Optional callback `(round_number, seconds, revote_features)` run when a round is evaluated.
+    """
+    def __init__(self, session, expected_players=None, name=None, on_round_closed=None):
+        """
+        @brief Constructor for the VotingRoom class.
+
+        @param session A PlanningPokerSession with features and a rule. Without `expected_players`, it must also have
+        players and be started.
+        @param expected_players Number of players registering on join, or None to use the session's players.
+        @param name Name of the room.
+        @param on_round_closed Callback run when a round is evaluated.
+        """
+        self.name = name
+        self.session = session
+        self.expected_players = expected_players
+        self.clients = {}
+        self.round_number = 0
+        self.round_started = None
+        self.finished = False
+        self.on_round_closed = on_round_closed
+        self._joined = []
+        if expected_players is None:
+            self.round_number = 1
+            self.round_started = time.perf_counter()
+
+    def join(self, connection, player):
+        """
+        @brief Register a connected player.
+
+        @param connection The connection of the player.
+        @param player The player name.
+
+        @return list: The outbox.
+        """
+        player = str(player).strip()
+        if not player:
+            raise ValueError("Expected a join message.")
+        if player in self.clients:
+            raise ValueError(f"Player already connected: {player}")
+        if self.expected_players is None:
+            if player not in self.session.players:
+                raise ValueError(f"Unknown player: {player}")
+        elif player not in self._joined:
+            if len(self._joined) >= self.expected_players:
+                raise ValueError("The session is full.")
+            self._joined.append(player)
+
+        self.clients[player] = connection
+        outbox = [([connection], {"type": "welcome", "player": player, "rule": self.session.rule_name})]
+        if self.round_number == 0:
+            if self.expected_players is not None and len(self._joined) == self.expected_players:
+                self.session.set_players(self._joined)
+                self.session.start()
+                outbox += self.start_round()
+        else:
+            outbox.append(([connection], self.round_message()))
+        return outbox
+
+    def leave(self, player, connection):
+        """
+        @brief Forget the connection of a player who disconnected.
+
+        @param player The player name.
+        @param connection The connection that was closed.
+
+        @return void
+        """
+        if self.clients.get(player) == connection:
+            del self.clients[player]
+
+    def handle(self, player, message):
+        """
+        @brief Handle one decoded message of a joined player.
+
+        A "vote" message carries one feature and its vote; a "ballot" message carries `votes`, a mapping of feature
+        to vote covering any number of features of the round, recorded with `PlanningPokerSession.cast_votes`.
+
+        @param player The player who sent the message.
+        @param message The decoded message.
+
+        @return list: The outbox.
+        """
+        try:
+            kind = message.get("type")
+            if kind not in ("vote", "ballot"):
+                raise ValueError(f"Unexpected message type: {kind}")
+            if self.round_number == 0 or self.session.finished:
+                raise ValueError("No voting round in progress.")
+            if kind == "vote":
+                feature = message["feature"]
+                status = self.session.record_vote(player, feature, str(message["vote"]))
+                ack = {"type": "ack", "feature": feature, "status": status}
+            else:
+                ack = {"type": "ack", "statuses": self.session.cast_votes(player, dict(message["votes"]))}
+        except (KeyError, TypeError, AttributeError) as error:
+            raise ValueError(f"Invalid vote message: {error}")
+
+        outbox = [([self.clients[player]], ack)]
+        if self.session.is_round_complete():
+            outbox += self.close_round()
+        return outbox
+
+    def close_round(self):
+        """
+        @brief Evaluate the complete round and announce the next round or the final estimations.
+
+        @return list: The outbox.
+        """
+        elapsed = time.perf_counter() - self.round_started
+        revote_features = self.session.evaluate()
+        if self.on_round_closed is not None:
+            self.on_round_closed(self.round_number, elapsed, revote_features)
+        if revote_features:
+            return self.start_round()
+
+        estimations = {str(feature): estimate for feature, estimate in self.session.difficulty_estimations().items()}
+        self.finished = True
+        return [(list(self.clients.values()), {"type": "finished", "estimations": estimations})]
+
+    def start_round(self):
+        """
+        @brief Start the next round and announce its features to every client.
+
+        @return list: The outbox.
+        """
+        self.round_number += 1
+        self.round_started = time.perf_counter()
+        return [(list(self.clients.values()), self.round_message())]
+
+    def round_message(self):
+        """
+        @brief Return the message announcing the current round.
+        """
+        return {"type": "round", "round": self.round_number, "features": self.session.round_features}